@@ -1,13 +1,21 @@
 import sys
 import logging
+import multiprocessing
 from dotenv import load_dotenv
 from src.core.config import AppConfig
 from src.core.logging_config import setup_logging
-from src.presentation.app import Application
 # import pytesseract
 
 def main():
+    # Arayüzsüz toplu işlem: python main.py batch <dosya/klasör/glob> ...
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        load_dotenv()
+        from src.presentation.cli import run_cli
+        sys.exit(run_cli(sys.argv[2:]))
+    
     try:
+        from src.presentation.app import Application
+        
         # Load environment variables
         load_dotenv()
         
@@ -28,4 +36,6 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # PDF çıkarma süreç havuzu paketlenmiş (frozen) Windows sürümünde de çalışsın
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,86 @@
+import asyncio
+import threading
+from typing import Awaitable, Callable, List, Optional, TypeVar
+
+from src.core.exceptions import OperationCancelledError
+
+T = TypeVar("T")
+
+
+class CancellationToken:
+    """Thread-safe cancel flag shared by the UI, extraction loops and AI tasks"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self):
+        """Cancel and notify every registered callback once"""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks = list(self._callbacks)
+            self._callbacks.clear()
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"İptal bildirimi başarısız: {str(e)}")
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise OperationCancelledError()
+
+    def add_callback(self, callback: Callable[[], None]):
+        """Register a callback; it runs immediately if already cancelled"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback: Callable[[], None]):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def cancel_task_on_cancel(self, task: asyncio.Future) -> Callable[[], None]:
+        """Cancel an asyncio task from any thread when the token is cancelled; returns the callback"""
+        loop = asyncio.get_running_loop()
+
+        def callback():
+            loop.call_soon_threadsafe(task.cancel)
+
+        self.add_callback(callback)
+        return callback
+
+
+async def run_cancellable(coro: Awaitable[T], cancel_token: Optional[CancellationToken]) -> T:
+    """Await ``coro`` as a task that is cancelled together with the token"""
+    if cancel_token is None:
+        return await coro
+    if cancel_token.is_cancelled:
+        if asyncio.iscoroutine(coro):
+            coro.close()
+        elif asyncio.isfuture(coro):
+            coro.cancel()
+            # gather gibi birleşik future'lar iptali hata olarak taşır; sonuç okunmuş sayılsın
+            coro.add_done_callback(lambda future: future.cancelled() or future.exception())
+        raise OperationCancelledError()
+
+    task = asyncio.ensure_future(coro)
+    callback = cancel_token.cancel_task_on_cancel(task)
+    try:
+        return await task
+    except asyncio.CancelledError:
+        if cancel_token.is_cancelled:
+            raise OperationCancelledError()
+        raise
+    finally:
+        cancel_token.remove_callback(callback)
@@ -15,7 +15,9 @@ class AppConfig:
         
         self.db_url: str = os.getenv('DATABASE_URL', 'sqlite:///app.db')
         self.temp_dir: str = os.getenv('TEMP_DIR', 'temp')
-        self.max_file_size: int = int(os.getenv('MAX_FILE_SIZE', '10485760'))  # 10MB default
+        # Bayt cinsinden; sadece MAX_FILE_SIZE verilirse uygulanır, büyük PDF/CSV dosyaları varsayılan olarak reddedilmez
+        max_file_size = os.getenv('MAX_FILE_SIZE')
+        self.max_file_size: Optional[int] = int(max_file_size) if max_file_size else None
         
         # Create temp directory if it doesn't exist
         if not os.path.exists(self.temp_dir):
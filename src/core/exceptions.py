@@ -20,4 +20,22 @@ class ConfigurationError(AppException):
 
 class SecurityError(AppException):
     """Error in security operations"""
-    pass
\ No newline at end of file
+    pass
+
+class TransientAIError(AIServiceError):
+    """Temporary AI service failure that can be retried"""
+    pass
+
+class RateLimitError(TransientAIError):
+    """Provider rejected the request because it is rate limited or overloaded"""
+    
+    def __init__(self, message: str, retry_after: float = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class OperationCancelledError(AppException):
+    """Operation was cancelled by the user; completed partial results are kept"""
+    
+    def __init__(self, message: str = "İşlem iptal edildi", partial_results=None):
+        super().__init__(message)
+        self.partial_results = partial_results
@@ -107,6 +107,20 @@ Analiz Kuralları:
 5. Genel bir sonuç yazın
 
 Analiz edilecek metin:
+"""
+
+    # Hiyerarşik birleştirmede bölüm sonuçlarını tek sonuca indirger
+    REDUCE_PROMPT = """Aşağıda aynı belgenin ardışık bölümlerine ait "{analysis_type}" sonuçları var.
+Bunları tek ve tutarlı bir "{analysis_type}" sonucu halinde birleştirin.
+
+Birleştirme Kuralları:
+1. Bölümlerin sırasını koruyun
+2. Tekrarlanan bilgileri tek sefer yazın
+3. Önemli ayrıntıları kaybetmeyin
+4. Bölüm numaralarından veya başlıklarından bahsetmeyin
+5. Sonucu orijinal analiz türünün formatında yazın
+
+Birleştirilecek sonuçlar:
 """
 
     @classmethod
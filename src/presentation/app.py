@@ -9,6 +9,8 @@ from src.models.history import AnalysisHistory
 from src.repositories.custom_analysis_repository import CustomAnalysisRepository  # YENİ!
 from src.models.custom_analysis_type import CustomAnalysisType  # YENİ!
 from src.services.ai_service_manager import AIServiceManager
+from src.services.background_loop import BackgroundLoop
+from src.services.file_processing.extraction_cache import ExtractionCache
 from src.presentation.viewmodels.main_viewmodel import MainViewModel
 from src.presentation.views.main_window import MainWindow
 
@@ -34,10 +36,16 @@ class Application:
         # Setup services
         self.ai_service_manager = AIServiceManager(self.ai_config_repo, self.security)
         
+        # Tüm analiz işlerinin paylaştığı arka plan event loop'u
+        self.background_loop = BackgroundLoop()
+        self.background_loop.start()
+        
         # Setup viewmodels
-        self.main_viewmodel = MainViewModel(self.ai_service_manager)
+        self.main_viewmodel = MainViewModel(self.ai_service_manager, self.background_loop)
         self.main_viewmodel.history_repo = self.history_repo
         self.main_viewmodel.custom_analysis_repo = self.custom_analysis_repo  # YENİ!
+        self.main_viewmodel.max_file_size = config.max_file_size
+        self.main_viewmodel.extraction_cache = ExtractionCache.from_settings(self.ai_service_manager.settings)
         
         # Setup UI
         ctk.set_appearance_mode("dark")
@@ -55,6 +63,11 @@ class Application:
     def run(self):
         """Start the application"""
         self.main_window.mainloop()
+        
+        # Açık bağlantıları ve önbelleği kapat, arka plan loop'unu durdur
+        self.background_loop.stop(self.ai_service_manager.close())
+        if self.main_viewmodel.extraction_cache:
+            self.main_viewmodel.extraction_cache.close()
 
 
     @staticmethod
@@ -0,0 +1,286 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from src.core.config import AppConfig
+from src.core.prompts import AnalysisPrompts
+from src.services.ai_service_manager import AIServiceManager
+from src.services.chunk_analyzer import ChunkAnalyzer
+from src.services.file_processing.extraction_cache import ExtractionCache, extract_file
+from src.services.file_processing.file_processor_factory import FileProcessorFactory
+from src.services.file_processing.result_manager import ProcessingResult, ResultManager
+from src.services.hierarchical_summarizer import HierarchicalSummarizer
+from src.utils.file_utils import check_file_size, collect_files
+
+OUTPUT_FORMATS = ('json', 'txt', 'md', 'docx', 'pdf')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="main.py batch",
+        description="Dosyaları arayüz olmadan toplu olarak analiz eder"
+    )
+    parser.add_argument("inputs", nargs="+", help="Dosya, klasör veya glob deseni (örn. 'arsiv/**/*.pdf')")
+    parser.add_argument("-a", "--analysis-type", default="Özet", help="Analiz türü (varsayılan: Özet)")
+    parser.add_argument("-p", "--provider", default=None, help="AI sağlayıcı (openai, gemini, claude, deepseek, fake)")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="Aynı anda işlenecek dosya sayısı")
+    parser.add_argument("-f", "--format", choices=OUTPUT_FORMATS, default="json", help="Çıktı formatı")
+    parser.add_argument("-o", "--output-dir", default="output", help="Sonuçların yazılacağı klasör")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Klasörleri alt klasörleriyle tara")
+    parser.add_argument("--skip-existing", action="store_true", help="Çıktısı zaten olan dosyaları atla")
+    parser.add_argument("--no-cache", action="store_true", help="Yanıt önbelleğini kullanma")
+    parser.add_argument("--report", default=None, help="Verim raporunu JSON olarak bu dosyaya da yaz")
+    return parser
+
+
+class BatchRunner:
+    """Extract, analyze and save files with a bounded number of workers"""
+
+    def __init__(self, ai_service_manager: AIServiceManager, prompt_template: str, analysis_type: str,
+                 provider: str, output_dir: str, output_format: str, concurrency: int = 4,
+                 use_cache: bool = True, skip_existing: bool = False,
+                 extraction_cache: Optional[ExtractionCache] = None, max_file_size: Optional[int] = None):
+        self.ai_service_manager = ai_service_manager
+        self.file_processor_factory = FileProcessorFactory()
+        self.result_manager = ResultManager()
+        # Bağlama sığmayan metinler arayüzdeki gibi parçalanıp analiz edilir ve birleştirilir
+        self.chunk_analyzer = ChunkAnalyzer(ai_service_manager)
+        self.summarizer = HierarchicalSummarizer(ai_service_manager, self.chunk_analyzer)
+        self.combine_method = ai_service_manager.settings.get("file_processing", {}).get("combine_method", "sequential")
+        self.extraction_cache = extraction_cache
+        self.max_file_size = max_file_size
+        self.prompt_template = prompt_template
+        self.analysis_type = analysis_type
+        self.provider = provider
+        self.output_dir = output_dir
+        self.output_format = output_format
+        self.concurrency = max(1, concurrency)
+        self.use_cache = use_cache
+        self.skip_existing = skip_existing
+
+        self.completed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.input_chars = 0
+        self.input_tokens = 0
+        self.failures: List[Tuple[str, str]] = []
+
+    def get_output_path(self, relative_path: str) -> str:
+        """Output file for an input; the source extension is kept so x.pdf and x.docx do not collide"""
+        return os.path.join(self.output_dir, f"{relative_path}.{self.output_format}")
+
+    def _extract(self, processor, file_path: str) -> Tuple[str, dict]:
+        check_file_size(file_path, self.max_file_size)
+        return extract_file(processor, file_path, self.extraction_cache)
+
+    async def _analyze(self, processor, text: str, metadata: dict) -> str:
+        """Analyze text in one request, or in chunks combined afterwards when it exceeds the context window"""
+        tokenizer = self.ai_service_manager.get_tokenizer(self.provider)
+        if tokenizer.count(text) <= self.ai_service_manager.get_input_token_budget(self.provider, self.prompt_template):
+            return await self.ai_service_manager.analyze_text(
+                text, self.provider, self.prompt_template, use_cache=self.use_cache,
+                analysis_type=self.analysis_type, stage="single"
+            )
+
+        chunk_budget = self.ai_service_manager.get_chunk_token_budget(self.provider, self.prompt_template)
+        processor.set_tokenizer(tokenizer)
+        loop = asyncio.get_running_loop()
+        chunks = await loop.run_in_executor(None, processor.split_text, text, chunk_budget)
+        metadata['chunk_count'] = len(chunks)
+
+        analyzed_texts = await self.chunk_analyzer.analyze_chunks(
+            chunks, self.provider, self.prompt_template, use_cache=self.use_cache,
+            pack=self.ai_service_manager.is_packing_enabled(), analysis_type=self.analysis_type
+        )
+        results = [
+            ProcessingResult(
+                original_text=chunk,
+                analyzed_text=analyzed_text,
+                metadata={},
+                timestamp=datetime.now(),
+                file_name=f"Parça {i + 1}/{len(chunks)}",
+                analysis_type=self.analysis_type
+            )
+            for i, (chunk, analyzed_text) in enumerate(zip(chunks, analyzed_texts))
+        ]
+        if self.combine_method == "hierarchical":
+            combined = await self.result_manager.combine_hierarchical(
+                results, self.summarizer, self.provider, use_cache=self.use_cache
+            )
+        else:
+            combined = self.result_manager.combine_results(results, self.combine_method)
+        return combined.analyzed_text
+
+    async def _process(self, file_path: str, relative_path: str):
+        output_path = self.get_output_path(relative_path)
+        if self.skip_existing and os.path.exists(output_path):
+            self.skipped += 1
+            return
+
+        loop = asyncio.get_running_loop()
+        processor = self.file_processor_factory.get_processor(file_path)
+        # Metin çıkarma senkron ve CPU ağırlıklı; event loop'u bloklamaması için thread'de çalışır
+        text, metadata = await loop.run_in_executor(None, self._extract, processor, file_path)
+        self.input_chars += len(text)
+        self.input_tokens += self.ai_service_manager.get_tokenizer(self.provider).count(text)
+
+        analyzed_text = await self._analyze(processor, text, metadata)
+
+        result = ProcessingResult(
+            original_text=text,
+            analyzed_text=analyzed_text,
+            metadata=metadata,
+            timestamp=datetime.now(),
+            file_name=os.path.basename(file_path),
+            analysis_type=self.analysis_type
+        )
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        await loop.run_in_executor(None, self.result_manager.save_result, result, self.output_format, output_path)
+
+    async def run(self, files: List[Tuple[str, str]]):
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in files:
+            queue.put_nowait(item)
+        total = len(files)
+
+        async def worker():
+            while True:
+                try:
+                    file_path, relative_path = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                started_at = time.monotonic()
+                try:
+                    await self._process(file_path, relative_path)
+                    self.completed += 1
+                    status = "tamam"
+                except Exception as e:
+                    self.failed += 1
+                    self.failures.append((file_path, str(e)))
+                    status = f"HATA: {str(e)}"
+                done = self.completed + self.failed + self.skipped
+                print(f"[{done}/{total}] {relative_path} ({time.monotonic() - started_at:.1f} sn) {status}")
+
+        await asyncio.gather(*(worker() for _ in range(min(self.concurrency, total))))
+
+
+def format_report(runner: BatchRunner, total_files: int, elapsed: float, stats: dict) -> str:
+    rate = runner.completed / elapsed if elapsed > 0 else 0.0
+    lines = [
+        "",
+        "Toplu analiz raporu",
+        "===================",
+        f"Dosya: {total_files} (başarılı {runner.completed}, hatalı {runner.failed}, atlanan {runner.skipped})",
+        f"Süre: {elapsed:.1f} sn",
+        f"Verim: {rate:.2f} dosya/sn, {rate * 60:.1f} dosya/dk",
+        f"Girdi: {runner.input_chars} karakter, {runner.input_tokens} token "
+        f"({runner.input_tokens / elapsed if elapsed > 0 else 0:.0f} token/sn)",
+        f"Önbellek: {stats.get('cache', {})}",
+        f"Çıkarma önbelleği: {stats.get('extraction_cache', {})}",
+        f"Birleştirilen istekler: {stats.get('coalescing', {})}",
+        f"Hız limitleri: {stats.get('rate_limits', {})}",
+        f"Yönlendirme: {stats.get('routing', {})}"
+    ]
+    for file_path, error in runner.failures[:20]:
+        lines.append(f"  HATA {file_path}: {error}")
+    return "\n".join(lines)
+
+
+async def _run_batch(args, files: List[Tuple[str, str]], prompt_template: str, provider: str) -> dict:
+    ai_service_manager = AIServiceManager(None, None)
+    if not ai_service_manager.services:
+        raise ValueError("Yapılandırılmış AI servisi yok (API anahtarlarını kontrol edin)")
+    provider = provider or ai_service_manager.default_provider
+
+    # Arayüzle aynı çıkarma önbelleği ve dosya boyutu sınırı (MAX_FILE_SIZE) kullanılır
+    extraction_cache = ExtractionCache.from_settings(ai_service_manager.settings)
+    runner = BatchRunner(
+        ai_service_manager, prompt_template, args.analysis_type, provider,
+        output_dir=args.output_dir, output_format=args.format, concurrency=args.concurrency,
+        use_cache=not args.no_cache, skip_existing=args.skip_existing,
+        extraction_cache=extraction_cache, max_file_size=AppConfig().max_file_size
+    )
+
+    started_at = time.monotonic()
+    try:
+        await runner.run(files)
+    finally:
+        elapsed = time.monotonic() - started_at
+        stats = {
+            "cache": ai_service_manager.get_cache_stats(),
+            "coalescing": ai_service_manager.get_coalescing_stats(),
+            "rate_limits": ai_service_manager.get_rate_limit_stats(),
+            "routing": ai_service_manager.get_routing_stats(),
+            "extraction_cache": extraction_cache.get_stats() if extraction_cache else {}
+        }
+        await ai_service_manager.close()
+        if extraction_cache:
+            extraction_cache.close()
+
+    print(format_report(runner, len(files), elapsed, stats))
+    return {
+        "provider": provider,
+        "analysis_type": args.analysis_type,
+        "files": len(files),
+        "completed": runner.completed,
+        "failed": runner.failed,
+        "skipped": runner.skipped,
+        "elapsed_seconds": round(elapsed, 3),
+        "files_per_second": round(runner.completed / elapsed, 4) if elapsed > 0 else 0.0,
+        "input_chars": runner.input_chars,
+        "input_tokens": runner.input_tokens,
+        "failures": [{"file": path, "error": error} for path, error in runner.failures],
+        **stats
+    }
+
+
+def _get_prompt(analysis_type: str) -> str:
+    """Standard prompt, or a custom analysis type from the database"""
+    if analysis_type in AnalysisPrompts.ANALYSIS_PROMPTS:
+        return AnalysisPrompts.ANALYSIS_PROMPTS[analysis_type]
+
+    custom_analysis_repo = None
+    try:
+        from src.database.database import Database
+        from src.models.custom_analysis_type import CustomAnalysisType
+        from src.repositories.custom_analysis_repository import CustomAnalysisRepository
+
+        database = Database(AppConfig())
+        custom_analysis_repo = CustomAnalysisRepository(database.get_session(), CustomAnalysisType)
+    except Exception as e:
+        print(f"Özel analiz türleri yüklenemedi: {str(e)}")
+
+    return AnalysisPrompts.get_prompt(analysis_type, custom_analysis_repo=custom_analysis_repo)
+
+
+def run_cli(argv: Optional[List[str]] = None) -> int:
+    """Run batch analysis; returns the process exit code"""
+    args = build_parser().parse_args(argv)
+
+    provider = args.provider.lower() if args.provider else None
+    if provider == "fake":
+        os.environ.setdefault('FAKE_AI_ENABLED', '1')
+
+    files = collect_files(args.inputs, FileProcessorFactory().get_supported_extensions(), args.recursive)
+    if not files:
+        print("İşlenecek desteklenen dosya bulunamadı")
+        return 2
+
+    print(f"{len(files)} dosya bulundu, analiz: {args.analysis_type}, eşzamanlılık: {args.concurrency}")
+    prompt_template = _get_prompt(args.analysis_type)
+
+    try:
+        report = asyncio.run(_run_batch(args, files, prompt_template, provider))
+    except Exception as e:
+        print(f"Toplu analiz başarısız: {str(e)}")
+        return 1
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    return 1 if report["failed"] else 0
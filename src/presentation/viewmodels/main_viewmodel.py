@@ -1,26 +1,47 @@
 import asyncio
-from typing import Optional, Callable
+import concurrent.futures
+from typing import Optional, Callable, List, Tuple, Awaitable
 import customtkinter as ctk
 from datetime import datetime
 import json
 import os
 from src.services.file_processing.file_processor_factory import FileProcessorFactory
+from src.services.file_processing.extraction_cache import ExtractionCache, extract_file, get_extraction_key
 from src.services.file_processing.result_manager import ProcessingResult, ResultManager
 from src.services.ai_service_manager import AIServiceManager
+from src.services.chunk_analyzer import ChunkAnalyzer
+from src.services.background_loop import BackgroundLoop
+from src.services.hierarchical_summarizer import HierarchicalSummarizer
+from src.core.cancellation import CancellationToken, run_cancellable
+from src.core.exceptions import OperationCancelledError
 from src.core.prompts import AnalysisPrompts
+from src.utils.file_utils import check_file_size
 
 class MainViewModel:
-    def __init__(self, ai_service_manager: AIServiceManager):
+    # Bölme penceresinde token bazlı boyutun bir birimi
+    SPLIT_UNIT_TOKENS = 500
+    
+    def __init__(self, ai_service_manager: AIServiceManager, background_loop: Optional[BackgroundLoop] = None):
         self.file_processor_factory = FileProcessorFactory()
         self.result_manager = ResultManager()
         self.ai_service_manager = ai_service_manager
+        self.chunk_analyzer = ChunkAnalyzer(ai_service_manager)
+        self.summarizer = HierarchicalSummarizer(ai_service_manager, self.chunk_analyzer)
         self.history_repo = None  # YENİ! HistoryRepository referansı
+        # Tüm analiz işleri uygulamanın tek event loop'unda çalışır
+        self.background_loop = background_loop or BackgroundLoop()
         
         # State
         self.current_file: Optional[str] = None
         self.current_text: Optional[str] = None
         self.processing_status: str = ""
         self.current_provider: str = "gemini"
+        # Bayt cinsinden dosya boyutu sınırı; None ise sınır yok. app.py AppConfig.max_file_size (MAX_FILE_SIZE) ile set eder
+        self.max_file_size: Optional[int] = None
+        # Çıkarılan metnin disk önbelleği; app.py ayarlardan oluşturur
+        self.extraction_cache: Optional[ExtractionCache] = None
+        # Son process_files çağrısında işlenemeyen dosyalar: (dosya yolu, hata)
+        self.last_failures: List[Tuple[str, str]] = []
 
         # File processing settings
         self.processing_settings = {
@@ -77,8 +98,11 @@ class MainViewModel:
         """Update processing settings"""
         self.processing_settings.update(settings)
     
-    async def process_file(self, file_path: str, analysis_type: str, progress_callback=None):
-        """Process file and perform AI analysis"""
+    async def process_file(self, file_path: str, analysis_type: str, progress_callback=None, skip_result_callback=False,
+                           stream_callback: Optional[Callable[[str], None]] = None,
+                           cancel_token: Optional[CancellationToken] = None):
+        """Process file and perform AI analysis, stream_callback receives text deltas as they arrive;
+        cancelling cancel_token stops extraction and the AI call with OperationCancelledError"""
         try:
             # Progress başlat
             if self._on_progress_start:
@@ -87,125 +111,28 @@ class MainViewModel:
             self._update_status(f"'{os.path.basename(file_path)}' işleniyor...")
             self.current_file = file_path
             
-            # İlerleme bildirimi - başlangıç
-            if progress_callback:
-                progress_callback(0.1, "Dosya işleniyor...")
-            
             # Get appropriate processor
             processor = self.file_processor_factory.get_processor(file_path)
+            processor.set_cancel_token(cancel_token)
             
-            # İlerleme bildirimi - processor bulundu
+            # İlerleme bildirimi
             if progress_callback:
                 progress_callback(0.2, f"Dosya türü belirlendi: {os.path.splitext(file_path)[1]}")
             
-            # Dosya boyutunu kontrol et
-            file_size_mb = os.path.getsize(file_path) / (1024 * 1024)  # MB'a çevir
-            
-            # İlerleme bildirimi - dosya boyutu
-            if progress_callback:
-                progress_callback(0.3, f"Dosya boyutu: {file_size_mb:.2f} MB")
-            
-            # Extract text from file
-            with open(file_path, 'rb') as file:
-                if progress_callback:
-                    progress_callback(0.4, "Metin çıkarılıyor...")
-                    
-                extracted_text = processor.extract_text(file)
-                
-                if progress_callback:
-                    progress_callback(0.5, f"Metin çıkarıldı: {len(extracted_text)} karakter")
-                    
-                file.seek(0)
-                metadata = processor.get_metadata(file)
-            
-            # İlerleme bildirimi - AI analizi
-            if progress_callback:
-                progress_callback(0.7, f"AI analizi başlatılıyor ({self.current_provider})...")
-            
-            # Get prompt template
-            prompt_template = self._get_prompt_for_analysis_type(analysis_type)
-            
-            # AI analizi
-            if progress_callback:
-                progress_callback(0.8, "Metin analiz ediliyor...")
-                
-            analyzed_text = await self.ai_service_manager.analyze_text(
-                extracted_text,
-                self.current_provider,
-                prompt_template
-            )
+            self._check_file_size(file_path)
             
-            # İlerleme bildirimi - tamamlandı
+            # Normal işleme...
             if progress_callback:
-                progress_callback(0.95, "Analiz tamamlandı, sonuçlar hazırlanıyor...")
+                progress_callback(0.4, "Metin çıkarılıyor...")
             
-            result = ProcessingResult(
-                original_text=extracted_text,
-                analyzed_text=analyzed_text,
-                metadata=metadata,
-                timestamp=datetime.now(),
-                file_name=os.path.basename(file_path),
-                analysis_type=analysis_type
+            # Metin çıkarma senkron; paylaşılan event loop'u bloklamaması için thread'de çalışır
+            loop = asyncio.get_running_loop()
+            extracted_text, metadata = await run_cancellable(
+                loop.run_in_executor(None, self._extract_file, processor, file_path), cancel_token
             )
             
-            # Save to history
-            if self.history_repo:
-                try:
-                    self.history_repo.save_analysis(result, self.current_provider)
-                    if progress_callback:
-                        progress_callback(0.98, "Analiz geçmişe kaydedildi")
-                except Exception as e:
-                    print(f"Geçmiş kaydedilirken hata: {str(e)}")
-            
-            # skip_result_callback parametresine göre callback'i atla
-            if not skip_result_callback and self._on_processing_complete:
-                self._on_processing_complete(result)
-            
-            # İlerleme bildirimi - tamamen tamamlandı
             if progress_callback:
-                progress_callback(1.0, "İşlem tamamlandı")
-                
-            return result
-            
-        except Exception as e:
-            self._update_status(f"Hata: {str(e)}")
-            if self._on_error:
-                self._on_error(str(e))
-            return None
-            
-        finally:
-            if self._on_progress_stop:
-                self._on_progress_stop()
-
-    async def process_file(self, file_path: str, analysis_type: str, progress_callback=None, skip_result_callback=False):
-        """Process file and perform AI analysis"""
-        try:
-            # Progress başlat
-            if self._on_progress_start:
-                self._on_progress_start()
-                    
-            self._update_status(f"'{os.path.basename(file_path)}' işleniyor...")
-            self.current_file = file_path
-            
-            # Get appropriate processor
-            processor = self.file_processor_factory.get_processor(file_path)
-            
-            # İlerleme bildirimi
-            if progress_callback:
-                progress_callback(0.2, f"Dosya türü belirlendi: {os.path.splitext(file_path)[1]}")
-            
-            # Normal işleme...
-            with open(file_path, 'rb') as file:
-                if progress_callback:
-                    progress_callback(0.4, "Metin çıkarılıyor...")
-                    
-                extracted_text = processor.extract_text(file)
-                
-                if progress_callback:
-                    progress_callback(0.5, f"Metin çıkarıldı: {len(extracted_text)} karakter")
-                    
-                file.seek(0)
-                metadata = processor.get_metadata(file)
+                progress_callback(0.5, f"Metin çıkarıldı: {len(extracted_text)} karakter")
             
             # İlerleme bildirimi
             if progress_callback:
@@ -213,16 +140,52 @@ class MainViewModel:
             
             # Get prompt template
             prompt_template = self._get_prompt_for_analysis_type(analysis_type)
+            split_size = self.get_split_size(file_path, extracted_text, prompt_template)
             
             # AI analizi
             if progress_callback:
                 progress_callback(0.8, "Metin analiz ediliyor...")
                 
-            analyzed_text = await self.ai_service_manager.analyze_text(
-                extracted_text,
-                self.current_provider,
-                prompt_template
-            )
+            use_cache = self.processing_settings.get('enable_cache', True)
+            if split_size:
+                # Bağlam penceresine sığmayan metin parçalara bölünüp birleştirilir; bu yolda akış yok
+                # ChunkAnalyzer tamamlanan ve toplam parça sayısını bildirir
+                def chunk_progress(completed, total):
+                    if progress_callback:
+                        progress_callback(0.8 + 0.15 * completed / total, f"Parça {completed}/{total} analiz edildi")
+                
+                analyzed_text, metadata['chunk_count'] = await self._analyze_in_chunks(
+                    processor, extracted_text, analysis_type, split_size, chunk_progress, cancel_token
+                )
+            elif stream_callback:
+                # Yanıt üretildikçe parça parça ilet
+                async def stream() -> str:
+                    parts = []
+                    async for delta in self.ai_service_manager.stream_text(
+                        extracted_text,
+                        self.current_provider,
+                        prompt_template,
+                        use_cache=use_cache,
+                        analysis_type=analysis_type,
+                        stage="single"
+                    ):
+                        parts.append(delta)
+                        stream_callback(delta)
+                    return "".join(parts)
+                
+                analyzed_text = await run_cancellable(stream(), cancel_token)
+            else:
+                analyzed_text = await run_cancellable(
+                    self.ai_service_manager.analyze_text(
+                        extracted_text,
+                        self.current_provider,
+                        prompt_template,
+                        use_cache=use_cache,
+                        analysis_type=analysis_type,
+                        stage="single"
+                    ),
+                    cancel_token
+                )
             
             # İlerleme bildirimi
             if progress_callback:
@@ -251,7 +214,11 @@ class MainViewModel:
                 self._on_processing_complete(result)
                 
             return result
-                
+        
+        except OperationCancelledError:
+            self._update_status("İşlem iptal edildi")
+            raise
+        
         except Exception as e:
             self._update_status(f"Hata: {str(e)}")
             if self._on_error:
@@ -262,6 +229,90 @@ class MainViewModel:
             if self._on_progress_stop:
                 self._on_progress_stop()
 
+    def submit_job(self, coro: Awaitable) -> concurrent.futures.Future:
+        """Run a job on the shared background event loop"""
+        return self.background_loop.submit(coro)
+    
+    def _check_file_size(self, file_path: str):
+        """Reject files larger than max_file_size before they are read"""
+        check_file_size(file_path, self.max_file_size)
+    
+    def get_split_size(self, file_path: str, text: str, prompt_template: str) -> Optional[int]:
+        """Chunk size in tokens if the text has to be split before analysis, None if it goes in one request.
+        
+        Text that does not fit the provider's context window is always split; with auto_split on,
+        files of at least min_split_size MB are split once they exceed one chunk.
+        """
+        tokens = self.ai_service_manager.get_tokenizer(self.current_provider).count(text)
+        chunk_budget = self.ai_service_manager.get_chunk_token_budget(self.current_provider, prompt_template)
+        if tokens > self.ai_service_manager.get_input_token_budget(self.current_provider, prompt_template):
+            print(f"Metin bağlam penceresini aşıyor ({tokens} token), {chunk_budget} tokenlık parçalara bölünüyor")
+            return chunk_budget
+        
+        if self.processing_settings.get('auto_split', False) and tokens > chunk_budget:
+            file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
+            if file_size_mb >= self.processing_settings.get('min_split_size', 0.5):
+                print(f"Otomatik bölme: {file_size_mb:.2f} MB, {tokens} token")
+                return chunk_budget
+        return None
+    
+    def get_split_chunk_size(self, size: int, method: str, analysis_type: str) -> int:
+        """Chunk size for split_file from the splitting window: pages as they are, token units
+        converted to tokens and capped by the provider's chunk budget"""
+        if method != "token":
+            return size
+        prompt_template = self._get_prompt_for_analysis_type(analysis_type)
+        chunk_budget = self.ai_service_manager.get_chunk_token_budget(self.current_provider, prompt_template)
+        return min(size * self.SPLIT_UNIT_TOKENS, chunk_budget)
+    
+    async def _analyze_in_chunks(self, processor, text: str, analysis_type: str, chunk_size: int,
+                                 progress_callback=None,
+                                 cancel_token: Optional[CancellationToken] = None) -> Tuple[str, int]:
+        """Split text, analyze the chunks and combine them with the configured method"""
+        processor.set_tokenizer(self.get_tokenizer())
+        loop = asyncio.get_running_loop()
+        chunks = await run_cancellable(
+            loop.run_in_executor(None, processor.split_text, text, chunk_size), cancel_token
+        )
+        
+        results = await self.analyze_chunks(chunks, analysis_type, progress_callback, cancel_token=cancel_token)
+        combined = await self.combine_results(
+            results,
+            self.processing_settings.get('combine_method', 'sequential'),
+            cancel_token=cancel_token
+        )
+        return combined.analyzed_text, len(chunks)
+    
+    def _get_extraction_key(self, processor, file_path: str, **options) -> Optional[str]:
+        """Build extraction cache key, or None when the cache is off"""
+        return get_extraction_key(self.extraction_cache, processor, file_path, **options)
+    
+    def _extract_file(self, processor, file_path: str) -> Tuple[str, dict]:
+        """Extract text and metadata; runs in a worker thread, unchanged files come from the extraction cache"""
+        return extract_file(processor, file_path, self.extraction_cache)
+    
+    def split_file(self, processor, file_path: str, chunk_size: int, method: str = "page") -> List[str]:
+        """Split a file with its processor; runs in a worker thread, unchanged files come from the extraction cache"""
+        # Token sayıları tokenizer'a bağlı olduğundan anahtara tokenizer da girer
+        tokenizer = processor.get_tokenizer()
+        cache_key = self._get_extraction_key(
+            processor, file_path,
+            split_method=method,
+            chunk_size=chunk_size,
+            tokenizer=getattr(tokenizer, "name", type(tokenizer).__name__)
+        )
+        if cache_key:
+            cached = self.extraction_cache.get(cache_key)
+            if cached is not None:
+                print(f"Parçalar önbellekten alındı: {os.path.basename(file_path)}")
+                return cached
+        
+        chunks = processor.split_file(file_path, chunk_size=chunk_size, method=method)
+        
+        if cache_key and all(processor.is_cacheable(chunk) for chunk in chunks):
+            self.extraction_cache.set(cache_key, type(processor).__name__, chunks)
+        return chunks
+
     def _update_status(self, status: str):
         """Update processing status"""
         self.processing_status = status
@@ -272,6 +323,10 @@ class MainViewModel:
         """Set current AI provider"""
         self.current_provider = provider
     
+    def get_tokenizer(self):
+        """Tokenizer of the current provider, used to size chunks"""
+        return self.ai_service_manager.get_tokenizer(self.current_provider)
+    
     def _get_prompt_for_analysis_type(self, analysis_type: str) -> str:
         """Analiz tipine göre uygun prompt'u döndür"""
         return AnalysisPrompts.get_prompt(
@@ -346,7 +401,10 @@ class MainViewModel:
             analyzed_text = await self.ai_service_manager.analyze_text(
                 text,
                 self.current_provider,
-                prompt_template
+                prompt_template,
+                use_cache=self.processing_settings.get('enable_cache', True),
+                analysis_type=analysis_type,
+                stage="single"
             )
             print(f"AI servisi yanıt verdi, uzunluk: {len(analyzed_text)}")
             
@@ -371,4 +429,156 @@ class MainViewModel:
                 self._on_error(str(e))
             raise
 
-    
\ No newline at end of file
+    async def analyze_chunks(self, chunks: List[str], analysis_type: str, progress_callback=None,
+                             cancel_token: Optional[CancellationToken] = None) -> List[ProcessingResult]:
+        """Analyze file chunks concurrently, results are returned in chunk order;
+        on cancellation OperationCancelledError carries the results of the finished chunks"""
+        prompt_template = self._get_prompt_for_analysis_type(analysis_type)
+        parallel = self.processing_settings.get('parallel_processing', False)
+        
+        def to_results(analyzed_texts: List[Optional[str]]) -> List[ProcessingResult]:
+            return [
+                ProcessingResult(
+                    original_text=chunk,
+                    analyzed_text=analyzed_text,
+                    metadata={},
+                    timestamp=datetime.now(),
+                    file_name=f"Parça {i + 1}/{len(chunks)}",
+                    analysis_type=analysis_type
+                )
+                for i, (chunk, analyzed_text) in enumerate(zip(chunks, analyzed_texts))
+                if analyzed_text is not None
+            ]
+        
+        try:
+            analyzed_texts = await self.chunk_analyzer.analyze_chunks(
+                chunks,
+                self.current_provider,
+                prompt_template,
+                parallel=parallel,
+                use_cache=self.processing_settings.get('enable_cache', True),
+                pack=self.ai_service_manager.is_packing_enabled(),
+                progress_callback=progress_callback,
+                cancel_token=cancel_token,
+                analysis_type=analysis_type
+            )
+        except OperationCancelledError as e:
+            raise OperationCancelledError(partial_results=to_results(e.partial_results or []))
+        
+        return to_results(analyzed_texts)
+
+    async def process_files(self, file_paths: List[str], analysis_type: str, progress_callback=None,
+                            cancel_token: Optional[CancellationToken] = None) -> List[ProcessingResult]:
+        """Analyze several files; small files are packed into shared requests.
+        Files that fail are skipped and listed in last_failures.
+        On cancellation OperationCancelledError carries the results of the finished files"""
+        prompt_template = self._get_prompt_for_analysis_type(analysis_type)
+        self.last_failures = []
+        texts = []
+        extracted = []
+        # Bağlama sığmayan dosyalar: extracted içindeki sıra -> (işlemci, parça boyutu)
+        oversized = {}
+        loop = asyncio.get_running_loop()
+        for file_path in file_paths:
+            try:
+                self._check_file_size(file_path)
+                processor = self.file_processor_factory.get_processor(file_path)
+                processor.set_cancel_token(cancel_token)
+                text, metadata = await run_cancellable(
+                    loop.run_in_executor(None, self._extract_file, processor, file_path), cancel_token
+                )
+                split_size = self.get_split_size(file_path, text, prompt_template)
+                if split_size:
+                    oversized[len(extracted)] = (processor, split_size)
+                else:
+                    texts.append(text)
+                extracted.append((file_path, text, metadata))
+            except OperationCancelledError:
+                raise
+            except Exception as e:
+                print(f"Dosya okunamadı, atlanıyor ({os.path.basename(file_path)}): {str(e)}")
+                self.last_failures.append((file_path, str(e)))
+        
+        small_indices = [i for i in range(len(extracted)) if i not in oversized]
+        try:
+            packed_texts = await self.chunk_analyzer.analyze_chunks(
+                texts,
+                self.current_provider,
+                prompt_template,
+                parallel=self.processing_settings.get('parallel_processing', False),
+                use_cache=self.processing_settings.get('enable_cache', True),
+                pack=self.ai_service_manager.is_packing_enabled(),
+                progress_callback=progress_callback,
+                cancel_token=cancel_token,
+                analysis_type=analysis_type
+            )
+        except OperationCancelledError as e:
+            raise OperationCancelledError(
+                partial_results=self._build_file_results(
+                    [extracted[i] for i in small_indices], e.partial_results or [], analysis_type
+                )
+            )
+        
+        analyzed_by_index = dict(zip(small_indices, packed_texts))
+        try:
+            # Büyük dosyalar tek tek parçalanıp analiz edilir; biri başarısız olursa diğerleri devam eder
+            for index, (processor, split_size) in oversized.items():
+                file_path, text, metadata = extracted[index]
+                try:
+                    analyzed_by_index[index], metadata['chunk_count'] = await self._analyze_in_chunks(
+                        processor, text, analysis_type, split_size, cancel_token=cancel_token
+                    )
+                except OperationCancelledError:
+                    raise
+                except Exception as e:
+                    print(f"Dosya analiz edilemedi, atlanıyor ({os.path.basename(file_path)}): {str(e)}")
+                    self.last_failures.append((file_path, str(e)))
+        except OperationCancelledError:
+            raise OperationCancelledError(
+                partial_results=self._build_file_results(
+                    extracted, [analyzed_by_index.get(i) for i in range(len(extracted))], analysis_type
+                )
+            )
+        
+        return self._build_file_results(
+            extracted, [analyzed_by_index.get(i) for i in range(len(extracted))], analysis_type
+        )
+    
+    def _build_file_results(self, extracted: List[Tuple[str, str, dict]], analyzed_texts: List[Optional[str]],
+                            analysis_type: str) -> List[ProcessingResult]:
+        """Results of the analyzed files, saved to history; files without a result are skipped"""
+        results = []
+        for (file_path, text, metadata), analyzed_text in zip(extracted, analyzed_texts):
+            if analyzed_text is None:
+                continue
+            result = ProcessingResult(
+                original_text=text,
+                analyzed_text=analyzed_text,
+                metadata=metadata,
+                timestamp=datetime.now(),
+                file_name=os.path.basename(file_path),
+                analysis_type=analysis_type
+            )
+            if self.history_repo:
+                try:
+                    self.history_repo.save_analysis(result, self.current_provider)
+                except Exception as e:
+                    print(f"Geçmiş kaydedilirken hata: {str(e)}")
+            results.append(result)
+        
+        return results
+
+    async def combine_results(self, results: List[ProcessingResult], combination_type: str,
+                              progress_callback=None,
+                              cancel_token: Optional[CancellationToken] = None) -> ProcessingResult:
+        """Combine results; the hierarchical mode reduces them with the current provider"""
+        if combination_type == "hierarchical":
+            return await self.result_manager.combine_hierarchical(
+                results,
+                self.summarizer,
+                self.current_provider,
+                use_cache=self.processing_settings.get('enable_cache', True),
+                progress_callback=progress_callback,
+                cancel_token=cancel_token
+            )
+        return self.result_manager.combine_results(results, combination_type)
@@ -5,6 +5,7 @@ from src.repositories.prompt_repository import PromptRepository
 from src.core.security import Security
 import customtkinter as ctk
 import os
+from src.utils.settings_file import update_settings_file
 
 class SettingsViewModel:
     def __init__(self, 
@@ -161,9 +162,8 @@ class SettingsViewModel:
                 'file_processing': self.file_processing_settings
             }
             
-            os.makedirs('data', exist_ok=True)
-            with open('data/settings.json', 'w') as f:
-                json.dump(settings, f, indent=2)
+            # Dosyadaki diğer bölümler korunur
+            update_settings_file('data/settings.json', settings)
                 
         except Exception as e:
             if self._on_error:
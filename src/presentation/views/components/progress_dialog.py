@@ -4,13 +4,15 @@ import os
 from typing import Optional, Callable
 
 class ProcessProgressDialog(ctk.CTkToplevel):
-    def __init__(self, parent):
+    def __init__(self, parent, on_cancel: Optional[Callable[[], None]] = None):
         super().__init__(parent)
         
         self.title("İşlem Durumu")
         self.geometry("600x400")
         self.resizable(False, False)
         self.is_cancelled = False
+        # İptal onaylandığında çağrılır; süren işi durdurur
+        self.on_cancel = on_cancel
 
          # Pencereyi önde tut
         self.transient(parent)
@@ -98,6 +100,8 @@ class ProcessProgressDialog(ctk.CTkToplevel):
             self.is_cancelled = True
             self.status_label.configure(text="İşlem iptal ediliyor...")
             self.cancel_button.configure(state="disabled")
+            if self.on_cancel:
+                self.on_cancel()
     
     def center_window(self):
         """Pencereyi ekranın ortasına konumlandır"""
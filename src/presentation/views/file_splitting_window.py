@@ -1,5 +1,6 @@
 import customtkinter as ctk
 import os
+from src.presentation.viewmodels.main_viewmodel import MainViewModel
 
 class FileSplittingWindow(ctk.CTkToplevel):
     def __init__(self, parent, file_path: str, on_split_selected=None):
@@ -74,7 +75,7 @@ class FileSplittingWindow(ctk.CTkToplevel):
         
         methods = [
             ("Sayfa Bazlı", "page", "Belgeyi sayfa sayısına göre böler"),
-            ("Token Bazlı", "token", "Belgeyi kelime sayısına göre böler (AI modeli için optimize)")
+            ("Token Bazlı", "token", "Belgeyi token sayısına göre böler (AI modeli için optimize)")
         ]
         
         for name, value, desc in methods:
@@ -212,12 +213,15 @@ class FileSplittingWindow(ctk.CTkToplevel):
         self._update_preview()
         
         # Bind method change
-        self.method_var.trace_add("write", lambda *args: self._update_preview())
+        self.method_var.trace_add("write", lambda *args: self._update_size_label(self.size_slider.get()))
     
     def _update_size_label(self, value):
         """Update size label and estimated parts"""
         page_count = int(value)
-        self.size_label.configure(text=f"{page_count} sayfa")
+        if self.method_var.get() == "token":
+            self.size_label.configure(text=f"{page_count * MainViewModel.SPLIT_UNIT_TOKENS} token")
+        else:
+            self.size_label.configure(text=f"{page_count} sayfa")
         
         try:
             total_pages = self._get_total_pages()
@@ -245,7 +249,8 @@ class FileSplittingWindow(ctk.CTkToplevel):
             preview += f"• Her parça maksimum {size} sayfa içerecek\n"
         else:
             preview += f"• Dosya token bazlı bölünecek\n"
-            preview += f"• Her parça yaklaşık {size * 500} kelime içerecek\n"
+            preview += f"• Her parça en fazla {size * MainViewModel.SPLIT_UNIT_TOKENS} token içerecek\n"
+            preview += f"• Seçili modelin bağlam penceresi daha küçükse parçalar ona göre küçültülür\n"
         
         if self.combine_var.get():
             preview += "\nTüm parçaların analiz sonuçları otomatik olarak birleştirilecek"
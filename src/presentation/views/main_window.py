@@ -2,16 +2,18 @@ import os
 import customtkinter as ctk
 from tkinter import messagebox
 import asyncio
-import threading
 import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from src.services.file_processing.file_processor_factory import FileProcessorFactory
 from src.services.file_processing.result_manager import ProcessingResult, ResultManager
 from src.presentation.viewmodels.main_viewmodel import MainViewModel
+from src.core.cancellation import CancellationToken, run_cancellable
+from src.core.exceptions import OperationCancelledError
 from .components.file_drop_area import FileDropArea
 from .components.sidebar import Sidebar
 from .components.status_bar import StatusBar
+from .components.progress_dialog import ProcessProgressDialog
 from .result_window import ResultWindow
 from .analysis_options_window import AnalysisOptionsWindow
 from .file_splitting_window import FileSplittingWindow
@@ -361,11 +363,11 @@ class MainWindow(ctk.CTk):
             self.text_display.insert("1.0", f"İşlem başlatılıyor: {os.path.basename(file_path)}\n")
             self.text_display.configure(state="disabled")
             
-            # Start processing in background
-            threading.Thread(
-                target=self._process_file_async,
-                args=(file_path,)
-            ).start()
+            # Start processing on the shared background loop
+            cancel_token, dialog = self._create_progress_dialog()
+            self.viewmodel.submit_job(
+                self._process_file_async(file_path, self.sidebar.get_analysis_type(), cancel_token, dialog)
+            )
             
         except Exception as e:
             self.status_bar.stop_progress()
@@ -380,13 +382,18 @@ class MainWindow(ctk.CTk):
         self.update()  # UI'yi güncelle
 
 
-    def _process_file_async(self, file_path: str):
+    async def _process_file_async(self, file_path: str, analysis_type: str,
+                                  cancel_token: CancellationToken, dialog: ProcessProgressDialog):
         """Process file asynchronously"""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        # Her iş kendi akış penceresini tutar; eşzamanlı işler birbirinin penceresine yazmaz
+        streaming = {}
+        
+        def on_progress(progress: float, message: str):
+            self._update_processing_progress(progress, message)
+            self._update_progress_dialog(dialog, progress, message)
         
         try:
-            analysis_type = self.sidebar.get_analysis_type()
+            self._update_progress_dialog(dialog, 0, f"Dosya işleniyor: {os.path.basename(file_path)}")
             
             # Dosya uzantısını al
             ext = os.path.splitext(file_path)[1].lower()
@@ -403,7 +410,7 @@ class MainWindow(ctk.CTk):
             self.after(500, lambda: self.update_progress_text("Dosyadan metin çıkarılıyor..."))
             
             # İlerlemeyi güncelle - AI sağlayıcı
-            provider = self.sidebar.get_ai_provider()
+            provider = self.viewmodel.current_provider
             self.after(700, lambda: self.update_progress_text(f"Yapay zeka sağlayıcı: {provider.upper()}"))
             
             # İlerlemeyi güncelle - Analiz türü
@@ -412,26 +419,41 @@ class MainWindow(ctk.CTk):
             # İlerlemeyi güncelle - Yapay zekaya gönderiliyor
             self.after(1000, lambda: self.update_progress_text("Yapay zeka hizmetine gönderiliyor..."))
             
+            # Sonuç penceresi ilk metin parçası geldiğinde açılır ve akış sürdükçe dolar
+            stream_started = False
+            
+            def on_stream_delta(delta: str):
+                nonlocal stream_started
+                if not stream_started:
+                    stream_started = True
+                    self.after(0, lambda: streaming.update(
+                        window=self._open_streaming_result(file_path, analysis_type)
+                    ))
+                self.after(0, lambda d=delta: self._append_streaming_text(streaming.get('window'), d))
+            
             # Dosyayı işle
-            result = loop.run_until_complete(
-                self.viewmodel.process_file(
-                    file_path, 
-                    analysis_type,
-                    progress_callback=self._update_processing_progress,
-                    skip_result_callback=True
-                )
+            result = await self.viewmodel.process_file(
+                file_path, 
+                analysis_type,
+                progress_callback=on_progress,
+                skip_result_callback=True,
+                stream_callback=on_stream_delta,
+                cancel_token=cancel_token
             )
             
             if result:
                 # İlerlemeyi güncelle - Tamamlandı
                 self.after(0, lambda: self.update_progress_text("Analiz tamamlandı! Sonuçlar gösteriliyor..."))
-                self.after(100, lambda: self._show_results(result))
+                self.after(100, lambda: self._finish_streaming_result(streaming.get('window'), result))
+        except OperationCancelledError:
+            self.after(0, lambda: self.update_progress_text("İşlem iptal edildi"))
+            self.after(0, lambda: self.status_bar.set_status("İşlem iptal edildi"))
         except Exception as e:
             error_msg = str(e)
             self.after(0, lambda: self.update_progress_text(f"HATA: {error_msg}"))
             self.after(100, lambda: self._show_error(f"Dosya işleme hatası: {error_msg}"))
         finally:
-            loop.close()
+            self._close_progress_dialog(dialog)
             self.after(0, self.status_bar.stop_progress)
 
     def _update_processing_progress(self, progress: float, message: str):
@@ -459,23 +481,37 @@ class MainWindow(ctk.CTk):
     def _start_analysis_with_option(self, file_paths: List[str], combine_results: bool):
         """Start analysis with selected option"""
         analysis_type = self.sidebar.get_analysis_type()
+        cancel_token, dialog = self._create_progress_dialog()
         
         if combine_results:
-            threading.Thread(
-                target=self._process_files_combined_async,
-                args=(file_paths, analysis_type)
-            ).start()
+            self.viewmodel.submit_job(self._process_files_combined_async(file_paths, analysis_type, cancel_token, dialog))
         else:
-            self._process_files_separate(file_paths, analysis_type)
-
-    def _process_files_combined_async(self, file_paths: List[str], analysis_type: str):
+            self.viewmodel.submit_job(self._process_files_async(file_paths, analysis_type, cancel_token, dialog))
+
+    def _create_progress_dialog(self) -> Tuple[CancellationToken, ProcessProgressDialog]:
+        """Progress dialog whose cancel button stops the job it belongs to"""
+        cancel_token = CancellationToken()
+        dialog = ProcessProgressDialog(self, on_cancel=cancel_token.cancel)
+        return cancel_token, dialog
+
+    def _update_progress_dialog(self, dialog: ProcessProgressDialog, progress: float,
+                                operation: Optional[str] = None, details: Optional[str] = None):
+        """Update a progress dialog from the background loop"""
+        def update():
+            if dialog.winfo_exists():
+                dialog.update_progress(progress, operation, details=details)
+        self.after(0, update)
+
+    def _close_progress_dialog(self, dialog: ProcessProgressDialog):
+        """Close a progress dialog from the background loop"""
+        self.after(0, lambda: dialog.destroy() if dialog.winfo_exists() else None)
+
+    async def _process_files_combined_async(self, file_paths: List[str], analysis_type: str,
+                                            cancel_token: CancellationToken, dialog: ProcessProgressDialog):
         """Process multiple files and combine results"""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
+        results = []
         try:
             self.after(0, self.status_bar.start_progress)
-            results = []
             
             # İlerleme bildirimi
             self.after(0, lambda: self.update_progress_text(f"Toplam {len(file_paths)} dosya işlenecek ve birleştirilecek"))
@@ -485,14 +521,14 @@ class MainWindow(ctk.CTk):
                 status_msg = f"Dosya işleniyor ({i+1}/{len(file_paths)}): {os.path.basename(file_path)}"
                 self.after(0, lambda msg=status_msg: self.update_progress_text(msg))
                 self.after(0, lambda msg=status_msg: self.status_bar.set_status(msg))
+                self._update_progress_dialog(dialog, i / len(file_paths), status_msg)
                 
                 # Dosyayı işle - ama sonuçları gösterme (skip_result_callback=True)
-                result = loop.run_until_complete(
-                    self.viewmodel.process_file(
-                        file_path, 
-                        analysis_type,
-                        skip_result_callback=True  # Sonuçları gösterme
-                    )
+                result = await self.viewmodel.process_file(
+                    file_path,
+                    analysis_type,
+                    skip_result_callback=True,  # Sonuçları gösterme
+                    cancel_token=cancel_token
                 )
                 
                 if result:
@@ -502,124 +538,134 @@ class MainWindow(ctk.CTk):
             if results:
                 self.after(0, lambda: self.update_progress_text(f"Tüm dosyalar işlendi ({len(results)}/{len(file_paths)}). Birleştirme seçenekleri gösteriliyor..."))
                 self.after(0, lambda: self._show_combine_options(results))
-                
+        
+        except OperationCancelledError:
+            # Tamamlanan dosyaların sonuçları yine birleştirilebilir
+            self.after(0, lambda: self.update_progress_text(f"İşlem iptal edildi ({len(results)}/{len(file_paths)} dosya tamamlandı)"))
+            if results:
+                self.after(0, lambda: self._show_combine_options(results))
         except Exception as e:
             self.after(0, lambda: self.update_progress_text(f"HATA: {str(e)}"))
             self.after(0, lambda: self._show_error(f"Dosyalar işlenirken hata: {str(e)}"))
         finally:
-            loop.close()
+            self._close_progress_dialog(dialog)
             self.after(0, self.status_bar.stop_progress)
 
-    def _process_files_async(self, file_paths: List[str], analysis_type: str):
+    async def _process_files_async(self, file_paths: List[str], analysis_type: str,
+                                   cancel_token: CancellationToken, dialog: ProcessProgressDialog):
         """Process files separately asynchronously"""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
         try:
             self.after(0, self.status_bar.start_progress)
             
-            # İlerleme bildirimi
-            self.after(0, lambda: self.update_progress_text(f"Toplam {len(file_paths)} dosya ayrı ayrı işlenecek"))
+            self.after(0, lambda: self.status_bar.set_status(f"{len(file_paths)} dosya analiz ediliyor..."))
+            self._update_progress_dialog(dialog, 0, f"{len(file_paths)} dosya analiz ediliyor...")
             
-            for i, file_path in enumerate(file_paths):
-                # İlerleme bildirimi
-                status_msg = f"Dosya işleniyor ({i+1}/{len(file_paths)}): {os.path.basename(file_path)}"
-                self.after(0, lambda msg=status_msg: self.update_progress_text(msg))
-                self.after(0, lambda msg=status_msg: self.status_bar.set_status(msg))
-                
-                # Dosyayı işle ve hemen sonuçları göster
-                result = loop.run_until_complete(
-                    self.viewmodel.process_file(
-                        file_path, 
-                        analysis_type,
-                        skip_result_callback=False  # Sonuçları hemen göster
-                    )
-                )
-                
-                self.after(0, lambda: self.update_progress_text(f"Dosya analizi tamamlandı: {os.path.basename(file_path)}"))
+            def on_file_done(completed: int, total: int):
+                msg = f"Dosya tamamlandı ({completed}/{total})"
+                self.after(0, lambda: self.status_bar.set_status(msg))
+                self._update_progress_dialog(dialog, completed / total, msg)
             
-            self.after(0, lambda: self.update_progress_text(f"Tüm dosyaların işlenmesi tamamlandı."))
-                
-        except Exception as e:
-            self.after(0, lambda: self.update_progress_text(f"HATA: {str(e)}"))
-            self.after(0, lambda: self._show_error(f"Dosyalar işlenirken hata: {str(e)}"))
-        finally:
-            loop.close()
-            self.after(0, self.status_bar.stop_progress)
-
-    def _process_files_async(self, file_paths: List[str], analysis_type: str):
-        """Process files separately asynchronously"""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            self.after(0, self.status_bar.start_progress)
+            # Küçük dosyalar tek istekte birleştirilebilir, sonuçlar dosya bazında döner
+            results = await self.viewmodel.process_files(
+                file_paths,
+                analysis_type,
+                progress_callback=on_file_done,
+                cancel_token=cancel_token
+            )
             
-            for i, file_path in enumerate(file_paths):
-                self.after(0, lambda msg=f"Dosya işleniyor ({i+1}/{len(file_paths)}): {os.path.basename(file_path)}":
-                          self.status_bar.set_status(msg))
-                
-                result = loop.run_until_complete(
-                    self.viewmodel.process_file(file_path, analysis_type)
-                )
-                
-                if result:
-                    self.after(0, lambda r=result: self._show_results(r))
+            for result in results:
+                self.after(0, lambda r=result: self._show_results(r))
             
+            failures = list(self.viewmodel.last_failures)
+            if failures:
+                message = "Bazı dosyalar işlenemedi:\n" + "\n".join(
+                    f"{os.path.basename(path)}: {error}" for path, error in failures
+                )
+                self.after(0, lambda: self._show_error(message))
+        
+        except OperationCancelledError as e:
+            # İptalden önce tamamlanan dosyaların sonuçları gösterilir
+            results = e.partial_results or []
+            self.after(0, lambda: self.status_bar.set_status(f"İşlem iptal edildi ({len(results)}/{len(file_paths)} dosya tamamlandı)"))
+            for result in results:
+                self.after(0, lambda r=result: self._show_results(r))
         except Exception as e:
             self.after(0, lambda: self._show_error(f"Dosyalar işlenirken hata: {str(e)}"))
         finally:
-            loop.close()
+            self._close_progress_dialog(dialog)
             self.after(0, self.status_bar.stop_progress)
 
     def _start_split_analysis(self, file_path: str, options: dict):
         """Start analysis with file splitting"""
-        threading.Thread(
-            target=self._process_split_file_async,
-            args=(file_path, options)
-        ).start()
+        cancel_token, dialog = self._create_progress_dialog()
+        self.viewmodel.submit_job(
+            self._process_split_file_async(file_path, options, self.sidebar.get_analysis_type(), cancel_token, dialog)
+        )
 
-    def _process_split_file_async(self, file_path: str, options: dict):
+    async def _process_split_file_async(self, file_path: str, options: dict, analysis_type: str,
+                                        cancel_token: CancellationToken, dialog: ProcessProgressDialog):
         """Process split file asynchronously"""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
         try:
             self.after(0, self.status_bar.start_progress)
-            analysis_type = self.sidebar.get_analysis_type()
+            self._update_progress_dialog(dialog, 0, f"Dosya bölünüyor: {os.path.basename(file_path)}")
             
-            # Split file
+            # Split file - bölme senkron olduğu için thread'de çalışır
             processor = self.file_processor_factory.get_processor(file_path)
-            chunks = processor.split_file(
-                file_path,
-                chunk_size=options['chunk_size'],
-                method="page"
+            processor.set_tokenizer(self.viewmodel.get_tokenizer())
+            processor.set_cancel_token(cancel_token)
+            # Pencere boyutu sayfa ya da 500 tokenlık birim cinsindendir
+            method = options.get('method', "page")
+            chunk_size = self.viewmodel.get_split_chunk_size(options['chunk_size'], method, analysis_type)
+            chunks = await run_cancellable(
+                asyncio.get_running_loop().run_in_executor(
+                    None,
+                    lambda: self.viewmodel.split_file(
+                        processor,
+                        file_path,
+                        chunk_size=chunk_size,
+                        method=method
+                    )
+                ),
+                cancel_token
             )
             
-            results = []
-            for i, chunk in enumerate(chunks):
-                self.after(0, lambda msg=f"Parça işleniyor ({i+1}/{len(chunks)})":
-                          self.status_bar.set_status(msg))
-                
-                result = loop.run_until_complete(
-                    self.viewmodel.analyze_text(chunk, analysis_type)
-                )
-                if result:
-                    results.append(result)
+            self.after(0, lambda: self.status_bar.set_status(f"{len(chunks)} parça analiz ediliyor..."))
+            self._update_progress_dialog(dialog, 0.1, f"{len(chunks)} parça analiz ediliyor...")
             
-            if options['combine_results'] and results:
-                combined = self.result_manager.combine_results(results, "sequential")
-                self.after(0, lambda: self._show_results(combined))
-            else:
-                for result in results:
-                    self.after(0, lambda r=result: self._show_results(r))
-                    
+            def on_chunk_done(completed: int, total: int):
+                msg = f"Parça tamamlandı ({completed}/{total})"
+                self.after(0, lambda: self.status_bar.set_status(msg))
+                self._update_progress_dialog(dialog, 0.1 + 0.9 * completed / total, msg)
+            
+            # Parçalar eşzamanlı analiz edilir, sonuçlar parça sırasıyla döner
+            results = await self.viewmodel.analyze_chunks(
+                chunks,
+                analysis_type,
+                progress_callback=on_chunk_done,
+                cancel_token=cancel_token
+            )
+            self._show_split_results(results, options)
+        
+        except OperationCancelledError as e:
+            # Tamamlanan parçaların sonuçları korunur
+            results = e.partial_results or []
+            self.after(0, lambda: self.status_bar.set_status(f"İşlem iptal edildi ({len(results)} parça tamamlandı)"))
+            self._show_split_results(results, options)
         except Exception as e:
             self.after(0, lambda: self._show_error(f"Dosya bölme işlemi başarısız: {str(e)}"))
         finally:
-            loop.close()
+            self._close_progress_dialog(dialog)
             self.after(0, self.status_bar.stop_progress)
 
+    def _show_split_results(self, results: List[ProcessingResult], options: dict):
+        """Show chunk results, combined into one window if requested"""
+        if options['combine_results'] and results:
+            combined = self.result_manager.combine_results(results, "sequential")
+            self.after(0, lambda: self._show_results(combined))
+        else:
+            for result in results:
+                self.after(0, lambda r=result: self._show_results(r))
+
     def _show_combine_options(self, results: List[ProcessingResult]):
         """Show combine options window"""
         options_window = CombineOptionsWindow(
@@ -631,11 +677,36 @@ class MainWindow(ctk.CTk):
 
     def _combine_and_show_results(self, results: List[ProcessingResult], combination_type: str):
         """Combine results and show"""
+        cancel_token, dialog = self._create_progress_dialog()
+        self.viewmodel.submit_job(self._combine_results_async(results, combination_type, cancel_token, dialog))
+
+    async def _combine_results_async(self, results: List[ProcessingResult], combination_type: str,
+                                     cancel_token: CancellationToken, dialog: ProcessProgressDialog):
+        """Combine results on the background loop; hierarchical mode calls the AI"""
         try:
-            combined = self.result_manager.combine_results(results, combination_type)
-            self._show_results(combined)
+            self.after(0, self.status_bar.start_progress)
+            self._update_progress_dialog(dialog, 0, f"{len(results)} sonuç birleştiriliyor...")
+            
+            def on_reduce_done(level: int, completed: int, total: int):
+                msg = f"Birleştirme seviyesi {level}: {completed}/{total}"
+                self.after(0, lambda: self.status_bar.set_status(msg))
+                self._update_progress_dialog(dialog, completed / total, msg)
+            
+            combined = await self.viewmodel.combine_results(
+                results,
+                combination_type,
+                progress_callback=on_reduce_done,
+                cancel_token=cancel_token
+            )
+            self.after(0, lambda: self._show_results(combined))
+        except OperationCancelledError:
+            self.after(0, lambda: self.status_bar.set_status("Birleştirme iptal edildi"))
         except Exception as e:
-            self._show_error(f"Sonuçlar birleştirilirken hata oluştu: {str(e)}")
+            error_msg = str(e)
+            self.after(0, lambda: self._show_error(f"Sonuçlar birleştirilirken hata oluştu: {error_msg}"))
+        finally:
+            self._close_progress_dialog(dialog)
+            self.after(0, self.status_bar.stop_progress)
 
     def _show_results(self, result: ProcessingResult):
         """Show results window"""
@@ -653,6 +724,34 @@ class MainWindow(ctk.CTk):
         # Sonuç penceresini göster
         ResultWindow(self, result)
 
+    def _open_streaming_result(self, file_path: str, analysis_type: str) -> ResultWindow:
+        """Open result window that renders the analysis while it is generated"""
+        placeholder = ProcessingResult(
+            original_text="",
+            analyzed_text="",
+            metadata={},
+            timestamp=datetime.datetime.now(),
+            file_name=os.path.basename(file_path),
+            analysis_type=analysis_type
+        )
+        return ResultWindow(self, placeholder, streaming=True)
+
+    def _append_streaming_text(self, window: Optional[ResultWindow], delta: str):
+        """Append streamed text to a job's result window"""
+        if window is not None and window.winfo_exists():
+            window.append_analysis_text(delta)
+
+    def _finish_streaming_result(self, window: Optional[ResultWindow], result: ProcessingResult):
+        """Show the final result in the job's streaming window, or open a new one"""
+        if window is None:
+            self._show_results(result)
+            return
+        
+        self._last_shown_result = f"{result.file_name}_{result.timestamp.strftime('%Y%m%d%H%M%S')}"
+        # Kullanıcı pencereyi akış sırasında kapattıysa tekrar açma
+        if window.winfo_exists():
+            window.finish_streaming(result)
+
     def _show_error(self, error: str):
         """Show error dialog"""
         messagebox.showerror("Hata", error)
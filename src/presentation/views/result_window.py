@@ -4,10 +4,11 @@ import os
 from src.services.file_processing.result_manager import ProcessingResult, ResultManager
 
 class ResultWindow(ctk.CTkToplevel):
-    def __init__(self, parent, result: ProcessingResult):
+    def __init__(self, parent, result: ProcessingResult, streaming: bool = False):
         super().__init__(parent)
         
         self.result = result
+        self.streaming = streaming
         self.result_manager = ResultManager()
         # Pencereyi öne getir
         self.lift()
@@ -99,6 +100,10 @@ class ResultWindow(ctk.CTkToplevel):
         self.analysis_text.pack(fill="both", expand=True)
         self.analysis_text.insert("1.0", self.result.analyzed_text)
         self.analysis_text.configure(state="disabled")
+        
+        # Akış sırasında analiz sekmesi açık gelsin
+        if self.streaming:
+            self.notebook.set("Analiz")
     
     def _create_export_frame(self):
         """Create frame for export options"""
@@ -123,11 +128,34 @@ class ResultWindow(ctk.CTkToplevel):
             ).pack(side="left", padx=10)
         
         # Export button
-        ctk.CTkButton(
+        self.export_button = ctk.CTkButton(
             export_frame,
             text="Dışa Aktar",
-            command=self._export_result
-        ).pack(side="right", padx=10)
+            command=self._export_result,
+            state="disabled" if self.streaming else "normal"
+        )
+        self.export_button.pack(side="right", padx=10)
+    
+    def append_analysis_text(self, delta: str):
+        """Append streamed text to the analysis tab"""
+        self.analysis_text.configure(state="normal")
+        self.analysis_text.insert("end", delta)
+        self.analysis_text.see("end")
+        self.analysis_text.configure(state="disabled")
+    
+    def finish_streaming(self, result: ProcessingResult):
+        """Replace streamed content with the final result and enable export"""
+        self.result = result
+        self.streaming = False
+        
+        for textbox, content in ((self.original_text, result.original_text),
+                                 (self.analysis_text, result.analyzed_text)):
+            textbox.configure(state="normal")
+            textbox.delete("1.0", "end")
+            textbox.insert("1.0", content)
+            textbox.configure(state="disabled")
+        
+        self.export_button.configure(state="normal")
     
     def _export_result(self):
         """Export result in selected format"""
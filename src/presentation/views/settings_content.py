@@ -3,6 +3,7 @@ import customtkinter as ctk
 from tkinter import messagebox
 import os
 import json
+from src.utils.settings_file import update_settings_file
 
 class SimplifiedSettingsContent(ctk.CTkFrame):
     def __init__(self, parent, main_window):
@@ -310,9 +311,9 @@ class SimplifiedSettingsContent(ctk.CTkFrame):
                 "default_ai": default_ai
             }
             
+            # Sadece bu ekrandaki anahtarlar güncellenir; diğer bölümler (limitler, önbellek vb.) korunur
             settings_file = os.path.join(settings_dir, "settings.json")
-            with open(settings_file, 'w', encoding='utf-8') as f:
-                json.dump(settings, f, indent=4, ensure_ascii=False)
+            update_settings_file(settings_file, settings)
             
             messagebox.showinfo("Başarılı", "Ayarlar başarıyla kaydedildi")
             
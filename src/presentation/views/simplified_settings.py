@@ -4,6 +4,7 @@ import customtkinter as ctk
 from tkinter import messagebox
 import os
 import json
+from src.utils.settings_file import update_settings_file
 
 class SimplifiedSettingsWindow(ctk.CTkToplevel):
     def __init__(self, parent):
@@ -318,9 +319,9 @@ class SimplifiedSettingsWindow(ctk.CTkToplevel):
                 "default_ai": default_ai
             }
             
+            # Sadece bu ekrandaki anahtarlar güncellenir; diğer bölümler (limitler, önbellek vb.) korunur
             settings_file = os.path.join(settings_dir, "settings.json")
-            with open(settings_file, 'w', encoding='utf-8') as f:
-                json.dump(settings, f, indent=4, ensure_ascii=False)
+            update_settings_file(settings_file, settings)
             
             messagebox.showinfo("Başarılı", "Ayarlar başarıyla kaydedildi")
             
@@ -1,9 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, AsyncIterator
+import httpx
+from .http_transport import HTTPTransport
+from src.core.exceptions import RateLimitError, TransientAIError
 
 class BaseAIService(ABC):
     """Base class for AI services"""
     
+    transport: Optional[HTTPTransport] = None
+    
     @abstractmethod
     async def analyze_text(self, text: str, prompt_template: str) -> str:
         """
@@ -18,6 +23,21 @@ class BaseAIService(ABC):
         """
         pass
     
+    async def stream_text(self, text: str, prompt_template: str) -> AsyncIterator[str]:
+        """
+        Stream the analysis as text deltas while the model generates it.
+        
+        Services without native streaming yield the complete result once.
+        
+        Args:
+            text (str): The text to analyze
+            prompt_template (str): The template to structure the prompt
+            
+        Yields:
+            str: Next piece of generated text
+        """
+        yield await self.analyze_text(text, prompt_template)
+    
     @abstractmethod
     async def generate_questions(self, text: str, count: int = 5) -> List[str]:
         """
@@ -32,6 +52,66 @@ class BaseAIService(ABC):
         """
         pass
     
+    def set_transport(self, transport: HTTPTransport):
+        """
+        Set the shared HTTP transport owned by the service manager.
+        
+        Args:
+            transport (HTTPTransport): Pooled transport shared by all services
+        """
+        self.transport = transport
+    
+    def get_http_client(self) -> httpx.AsyncClient:
+        """
+        Get the pooled HTTP client for this service.
+        
+        Returns:
+            httpx.AsyncClient: Keep-alive client from the shared transport
+        """
+        if self.transport is None:
+            self.transport = HTTPTransport()
+        return self.transport.get_client(self.get_service_name())
+    
+    # 429 rate limit, 503 unavailable, 529 overloaded (Anthropic)
+    OVERLOAD_STATUS_CODES = (429, 503, 529)
+    # Bağlantı ve zaman aşımı hataları (httpx, OpenAI ve Anthropic SDK'ları)
+    TRANSIENT_ERROR_NAMES = (
+        'TimeoutException', 'ConnectError', 'ReadError', 'WriteError', 'RemoteProtocolError',
+        'ReadTimeout', 'ConnectTimeout', 'PoolTimeout', 'APIConnectionError', 'APITimeoutError',
+        'TimeoutError'
+    )
+    
+    def _classify_error(self, error: Exception) -> Exception:
+        """
+        Convert a provider error into the exception raised to callers.
+        
+        Args:
+            error (Exception): Error raised by the SDK or HTTP client
+            
+        Returns:
+            Exception: RateLimitError for overload responses, TransientAIError for
+                network errors and other 5xx responses, ValueError otherwise
+        """
+        response = getattr(error, 'response', None)
+        status_code = getattr(error, 'status_code', None) or getattr(response, 'status_code', None)
+        name = self.get_service_name().capitalize()
+        
+        if status_code in self.OVERLOAD_STATUS_CODES:
+            retry_after = None
+            headers = getattr(response, 'headers', None)
+            if headers is not None:
+                try:
+                    retry_after = float(headers.get('retry-after'))
+                except (TypeError, ValueError):
+                    retry_after = None
+            return RateLimitError(f"{name} API rate limit ({status_code}): {str(error)}", retry_after)
+        
+        if (status_code is not None and status_code >= 500) or \
+                type(error).__name__ in self.TRANSIENT_ERROR_NAMES:
+            return TransientAIError(f"{name} API temporary error: {str(error)}")
+        
+        return ValueError(f"{name} API error: {str(error)}")
+    
     def get_model_name(self) -> str:
         """
         Get the name of the AI model being used.
@@ -39,6 +119,8 @@ class BaseAIService(ABC):
         Returns:
             str: The model name
         """
+        if hasattr(self, 'model_name'):
+            return str(self.model_name)
         if hasattr(self, 'model'):
             return str(self.model)
         return "unknown"
@@ -65,6 +147,7 @@ class BaseAIService(ABC):
         return {
             "text_analysis": True,
             "question_generation": True,
+            "streaming": type(self).stream_text is not BaseAIService.stream_text,
             "model": self.get_model_name(),
             "service": self.get_service_name()
         }
\ No newline at end of file
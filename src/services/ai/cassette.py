@@ -0,0 +1,211 @@
+import asyncio
+import gzip
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Dict, List, Optional
+from .base_ai_service import BaseAIService
+from .http_transport import HTTPTransport
+from .response_cache import ResponseCache
+from src.core.exceptions import RateLimitError, TransientAIError
+
+
+class Cassette:
+    """Gzip-compressed JSON lines file of recorded provider calls"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+        # İstek anahtarı -> kayıt sırasına göre yanıtlar
+        self._records: Dict[str, deque] = {}
+        self.recorded = 0
+        self.replayed = 0
+
+    def load(self):
+        """Read every record of an existing cassette"""
+        self._records.clear()
+        if not os.path.exists(self.path):
+            raise ValueError(f"Kayıt dosyası bulunamadı: {self.path}")
+        with gzip.open(self.path, "rt", encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    record = json.loads(line)
+                    self._records.setdefault(record["key"], deque()).append(record)
+        print(f"Kayıt yüklendi: {sum(len(r) for r in self._records.values())} yanıt ({self.path})")
+
+    def get_models(self) -> Dict[str, str]:
+        """Provider -> last recorded model"""
+        models = {}
+        for records in self._records.values():
+            for record in records:
+                models[record["provider"]] = record["model"]
+        return models
+
+    def record(self, record: Dict[str, Any]):
+        """Append a record to the cassette file"""
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                # Her oturum dosyaya yeni bir gzip üyesi olarak eklenir
+                self._file = gzip.open(self.path, "at", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+            self.recorded += 1
+
+    def next_record(self, key: str) -> Dict[str, Any]:
+        """Next recorded response for a request; the last one repeats when exhausted"""
+        with self._lock:
+            records = self._records.get(key)
+            if not records:
+                raise ValueError("Kayıtta bu istek için yanıt yok")
+            record = records.popleft() if len(records) > 1 else records[0]
+            self.replayed += 1
+            return record
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def get_stats(self) -> dict:
+        return {
+            "path": self.path,
+            "recorded": self.recorded,
+            "replayed": self.replayed
+        }
+
+
+def _describe_error(error: Exception) -> Dict[str, Any]:
+    if isinstance(error, RateLimitError):
+        return {"type": "rate_limit", "message": str(error), "retry_after": error.retry_after}
+    if isinstance(error, TransientAIError):
+        return {"type": "transient", "message": str(error)}
+    return {"type": "error", "message": str(error)}
+
+
+def _raise_recorded_error(error: Dict[str, Any]):
+    if error["type"] == "rate_limit":
+        raise RateLimitError(error["message"], error.get("retry_after"))
+    if error["type"] == "transient":
+        raise TransientAIError(error["message"])
+    raise ValueError(error["message"])
+
+
+class RecordingService(BaseAIService):
+    """Wraps a real service and writes every call with its timings to a cassette"""
+
+    def __init__(self, service: BaseAIService, cassette: Cassette, provider: str):
+        self.service = service
+        self.cassette = cassette
+        self.provider = provider
+        self.model_name = service.get_model_name()
+
+    def get_service_name(self) -> str:
+        return self.service.get_service_name()
+
+    def get_capabilities(self) -> Dict[str, Any]:
+        return self.service.get_capabilities()
+
+    def set_transport(self, transport: HTTPTransport):
+        self.service.set_transport(transport)
+
+    def _record(self, prompt_template: str, text: str, started_at: float, stream: bool,
+                response: Optional[str] = None, first_delta: Optional[float] = None,
+                deltas: Optional[List] = None, error: Optional[Exception] = None):
+        self.cassette.record({
+            "key": ResponseCache.make_key(self.provider, self.model_name, prompt_template, text),
+            "provider": self.provider,
+            "model": self.model_name,
+            "stream": stream,
+            "input_chars": len(prompt_template) + len(text),
+            "duration": round(time.monotonic() - started_at, 4),
+            "first_delta": first_delta,
+            "response": response,
+            "deltas": deltas,
+            "error": _describe_error(error) if error else None,
+            "recorded_at": time.time()
+        })
+
+    async def analyze_text(self, text: str, prompt_template: str) -> str:
+        started_at = time.monotonic()
+        try:
+            result = await self.service.analyze_text(text, prompt_template)
+        except Exception as e:
+            self._record(prompt_template, text, started_at, False, error=e)
+            raise
+        self._record(prompt_template, text, started_at, False, response=result)
+        return result
+
+    async def stream_text(self, text: str, prompt_template: str) -> AsyncIterator[str]:
+        started_at = time.monotonic()
+        deltas = []
+        try:
+            async for delta in self.service.stream_text(text, prompt_template):
+                # Her parça, isteğin başından itibaren geçen süreyle saklanır
+                deltas.append([round(time.monotonic() - started_at, 4), delta])
+                yield delta
+        except Exception as e:
+            self._record(prompt_template, text, started_at, True,
+                         first_delta=deltas[0][0] if deltas else None, deltas=deltas, error=e)
+            raise
+        self._record(prompt_template, text, started_at, True, response="".join(d for _, d in deltas),
+                     first_delta=deltas[0][0] if deltas else None, deltas=deltas)
+
+    async def generate_questions(self, text: str, count: int = 5) -> list[str]:
+        return await self.service.generate_questions(text, count)
+
+
+class ReplayService(BaseAIService):
+    """Serves recorded responses at recorded or accelerated speed, without network"""
+
+    def __init__(self, cassette: Cassette, provider: str, model: str, speed: float = 1.0):
+        self.cassette = cassette
+        self.provider = provider
+        self.model_name = model
+        # 2.0 kaydın iki katı hızında oynatır; 0 beklemeden yanıt verir
+        self.speed = speed
+
+    def get_service_name(self) -> str:
+        return self.provider
+
+    async def _wait(self, seconds: Optional[float]):
+        if seconds and self.speed > 0:
+            await asyncio.sleep(seconds / self.speed)
+
+    def _next_record(self, text: str, prompt_template: str) -> Dict[str, Any]:
+        key = ResponseCache.make_key(self.provider, self.model_name, prompt_template, text)
+        return self.cassette.next_record(key)
+
+    async def analyze_text(self, text: str, prompt_template: str) -> str:
+        record = self._next_record(text, prompt_template)
+        await self._wait(record["duration"])
+        if record["error"] and not record["response"]:
+            _raise_recorded_error(record["error"])
+        return record["response"]
+
+    async def stream_text(self, text: str, prompt_template: str) -> AsyncIterator[str]:
+        record = self._next_record(text, prompt_template)
+        if not record.get("deltas"):
+            await self._wait(record["duration"])
+            if record["error"]:
+                _raise_recorded_error(record["error"])
+            yield record["response"]
+            return
+
+        elapsed = 0.0
+        for offset, delta in record["deltas"]:
+            await self._wait(offset - elapsed)
+            elapsed = offset
+            yield delta
+        if record["error"]:
+            await self._wait(record["duration"] - elapsed)
+            _raise_recorded_error(record["error"])
+
+    async def generate_questions(self, text: str, count: int = 5) -> list[str]:
+        response = await self.analyze_text(text, f"Generate {count} relevant questions based on the following text:\n\n{text}")
+        return response.split('\n')[:count]
@@ -1,37 +1,68 @@
+from typing import AsyncIterator
 import anthropic
 from .base_ai_service import BaseAIService
-import asyncio
 
 class ClaudeService(BaseAIService):
     """Anthropic Claude service implementation"""
     
     def __init__(self, api_key: str, model: str = "claude-3-opus-20240229"):
-        self.client = anthropic.Anthropic(api_key=api_key)
+        self.api_key = api_key
         self.model = model
+        self._client = None
+        self._http_client = None
+    
+    def _get_client(self) -> anthropic.AsyncAnthropic:
+        """Get async Anthropic client on top of the shared HTTP pool"""
+        http_client = self.get_http_client()
+        if self._client is None or self._http_client is not http_client:
+            self._client = anthropic.AsyncAnthropic(api_key=self.api_key, http_client=http_client)
+            self._http_client = http_client
+        return self._client
+    
+    @staticmethod
+    def _system_blocks(prompt_template: str) -> list:
+        """System prompt marked for prompt caching, reused by every chunk with the same template"""
+        # Önbellek için minimum uzunluğun altındaki prompt'larda işaret yok sayılır
+        return [{"type": "text", "text": prompt_template, "cache_control": {"type": "ephemeral"}}]
     
     async def analyze_text(self, text: str, prompt_template: str) -> str:
         try:
             print(f"Claude API çağrısı başlatılıyor: {self.model}")
-            loop = asyncio.get_event_loop()
-            
-            # Senkron çağrıyı asenkron bir şekilde çalıştır
-            message = await loop.run_in_executor(
-                None,
-                lambda: self.client.messages.create(
-                    model=self.model,
-                    max_tokens=4000,
-                    temperature=0.7,
-                    system=prompt_template,
-                    messages=[
-                        {"role": "user", "content": text}
-                    ]
-                )
+            message = await self._get_client().messages.create(
+                model=self.model,
+                max_tokens=4000,
+                temperature=0.7,
+                system=self._system_blocks(prompt_template),
+                messages=[
+                    {"role": "user", "content": text}
+                ]
             )
             print("Claude API yanıt verdi")
+            cached_tokens = getattr(message.usage, "cache_read_input_tokens", 0) or 0
+            if cached_tokens:
+                print(f"Claude prompt önbelleği kullanıldı: {cached_tokens} token")
             return message.content[0].text
         except Exception as e:
             print(f"Claude API hatası: {str(e)}")
-            raise ValueError(f"Claude API error: {str(e)}")
+            raise self._classify_error(e)
+    
+    async def stream_text(self, text: str, prompt_template: str) -> AsyncIterator[str]:
+        try:
+            print(f"Claude akış çağrısı başlatılıyor: {self.model}")
+            async with self._get_client().messages.stream(
+                model=self.model,
+                max_tokens=4000,
+                temperature=0.7,
+                system=self._system_blocks(prompt_template),
+                messages=[
+                    {"role": "user", "content": text}
+                ]
+            ) as stream:
+                async for delta in stream.text_stream:
+                    yield delta
+        except Exception as e:
+            print(f"Claude API hatası: {str(e)}")
+            raise self._classify_error(e)
     
     async def generate_questions(self, text: str, count: int = 5) -> list[str]:
         prompt = f"Generate {count} relevant questions based on the following text."
@@ -39,4 +70,4 @@ class ClaudeService(BaseAIService):
         # Claude'un yanıtını satır bazında bölerek soruları alıyoruz
         lines = response.split('\n')
         questions = [line for line in lines if line.strip() and ('?' in line)]
-        return questions[:count]
\ No newline at end of file
+        return questions[:count]
@@ -1,5 +1,5 @@
-import aiohttp
 import json
+from typing import AsyncIterator
 from .base_ai_service import BaseAIService
 
 class DeepSeekService(BaseAIService):
@@ -10,38 +10,71 @@ class DeepSeekService(BaseAIService):
         self.api_url = "https://api.deepseek.com/v1/chat/completions"
         self.model = model
     
+    def _build_request(self, text: str, prompt_template: str, stream: bool = False) -> dict:
+        """Build chat completion request body"""
+        data = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": prompt_template},
+                {"role": "user", "content": text}
+            ],
+            "temperature": 0.7,
+            "max_tokens": 4000
+        }
+        if stream:
+            data["stream"] = True
+        return data
+    
+    def _headers(self) -> dict:
+        return {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}"
+        }
+    
     async def analyze_text(self, text: str, prompt_template: str) -> str:
         try:
             print(f"DeepSeek API çağrısı başlatılıyor: {self.model}")
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.api_key}"
-            }
-            
-            data = {
-                "model": self.model,
-                "messages": [
-                    {"role": "system", "content": prompt_template},
-                    {"role": "user", "content": text}
-                ],
-                "temperature": 0.7,
-                "max_tokens": 4000
-            }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.api_url, 
-                    headers=headers, 
-                    json=data,
-                    timeout=60  # 60 saniye zaman aşımı
-                ) as response:
-                    response.raise_for_status()
-                    result = await response.json()
-                    print("DeepSeek API yanıt verdi")
-                    return result["choices"][0]["message"]["content"]
+            # Paylaşılan havuzdaki bağlantı yeniden kullanılır
+            client = self.get_http_client()
+            response = await client.post(
+                self.api_url,
+                headers=self._headers(),
+                json=self._build_request(text, prompt_template),
+                timeout=60  # 60 saniye zaman aşımı
+            )
+            response.raise_for_status()
+            result = response.json()
+            print("DeepSeek API yanıt verdi")
+            return result["choices"][0]["message"]["content"]
+        except Exception as e:
+            print(f"DeepSeek API hatası: {str(e)}")
+            raise self._classify_error(e)
+    
+    async def stream_text(self, text: str, prompt_template: str) -> AsyncIterator[str]:
+        try:
+            print(f"DeepSeek akış çağrısı başlatılıyor: {self.model}")
+            client = self.get_http_client()
+            async with client.stream(
+                "POST",
+                self.api_url,
+                headers=self._headers(),
+                json=self._build_request(text, prompt_template, stream=True),
+                timeout=60
+            ) as response:
+                response.raise_for_status()
+                # Server-sent events: her satır "data: {...}" biçiminde gelir
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    payload = line[5:].strip()
+                    if payload == "[DONE]":
+                        break
+                    choices = json.loads(payload).get("choices") or []
+                    if choices and choices[0].get("delta", {}).get("content"):
+                        yield choices[0]["delta"]["content"]
         except Exception as e:
             print(f"DeepSeek API hatası: {str(e)}")
-            raise ValueError(f"DeepSeek API error: {str(e)}")
+            raise self._classify_error(e)
     
     async def generate_questions(self, text: str, count: int = 5) -> list[str]:
         prompt = f"Generate {count} relevant questions based on the following text."
@@ -0,0 +1,96 @@
+import asyncio
+import hashlib
+import random
+from typing import Any, AsyncIterator, Dict, Optional
+from .base_ai_service import BaseAIService
+from src.core.exceptions import RateLimitError, TransientAIError
+
+class FakeAIService(BaseAIService):
+    """Deterministic offline service for benchmarks and tests"""
+
+    DEFAULT_LATENCY = {"distribution": "lognormal", "median": 0.8, "sigma": 0.5}
+
+    def __init__(self, model: str = "fake-1", latency: Optional[Dict[str, Any]] = None,
+                 tokens_per_second: float = 50.0, output_tokens: int = 200,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0,
+                 retry_after: Optional[float] = 1.0, seed: int = 0):
+        self.model = model
+        # İlk token gecikmesi: constant / uniform / exponential / lognormal
+        self.latency = dict(latency or self.DEFAULT_LATENCY)
+        self.tokens_per_second = tokens_per_second
+        self.output_tokens = output_tokens
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.seed = seed
+        # Aynı isteğin tekrarları farklı sonuç üretebilsin diye deneme sayısı tutulur
+        self._attempts: Dict[str, int] = {}
+
+        self.calls = 0
+        self.injected_errors = 0
+
+    def _request_rng(self, text: str, prompt_template: str) -> random.Random:
+        """Random source that depends only on seed, request content and attempt number"""
+        key = hashlib.sha256(f"{prompt_template}\x00{text}".encode("utf-8")).hexdigest()
+        attempt = self._attempts.get(key, 0) + 1
+        self._attempts[key] = attempt
+        return random.Random(f"{self.seed}:{key}:{attempt}")
+
+    def _sample_latency(self, rng: random.Random) -> float:
+        distribution = self.latency.get("distribution", "constant")
+        if distribution == "uniform":
+            return rng.uniform(self.latency.get("min", 0.0), self.latency.get("max", 1.0))
+        if distribution == "exponential":
+            return rng.expovariate(1.0 / max(self.latency.get("mean", 1.0), 1e-6))
+        if distribution == "lognormal":
+            median = max(self.latency.get("median", 1.0), 1e-6)
+            return median * rng.lognormvariate(0.0, self.latency.get("sigma", 0.5))
+        return float(self.latency.get("value", 0.0))
+
+    def _maybe_fail(self, rng: random.Random):
+        """Inject a 429 or transient 503 error"""
+        roll = rng.random()
+        if roll < self.rate_limit_rate:
+            self.injected_errors += 1
+            raise RateLimitError("Fake API rate limit (429): injected", self.retry_after)
+        if roll < self.rate_limit_rate + self.error_rate:
+            self.injected_errors += 1
+            raise TransientAIError("Fake API temporary error (503): injected")
+
+    def _completion_words(self, text: str, prompt_template: str) -> list:
+        """Deterministic completion derived from the request content"""
+        digest = hashlib.sha256(f"{self.model}\x00{prompt_template}\x00{text}".encode("utf-8")).hexdigest()
+        words = text.split() or ["boş"]
+        completion = [f"[{self.model}:{digest[:8]}]"]
+        for i in range(max(0, self.output_tokens - 1)):
+            completion.append(words[i % len(words)])
+        return completion
+
+    async def analyze_text(self, text: str, prompt_template: str) -> str:
+        self.calls += 1
+        rng = self._request_rng(text, prompt_template)
+        await asyncio.sleep(self._sample_latency(rng))
+        self._maybe_fail(rng)
+
+        words = self._completion_words(text, prompt_template)
+        if self.tokens_per_second:
+            await asyncio.sleep(len(words) / self.tokens_per_second)
+        return " ".join(words)
+
+    async def stream_text(self, text: str, prompt_template: str) -> AsyncIterator[str]:
+        self.calls += 1
+        rng = self._request_rng(text, prompt_template)
+        await asyncio.sleep(self._sample_latency(rng))
+        self._maybe_fail(rng)
+
+        words = self._completion_words(text, prompt_template)
+        # Kelimeler 10'arlı gruplar halinde token hızına göre gönderilir
+        for start in range(0, len(words), 10):
+            group = words[start:start + 10]
+            if start and self.tokens_per_second:
+                await asyncio.sleep(len(group) / self.tokens_per_second)
+            yield (" " if start else "") + " ".join(group)
+
+    async def generate_questions(self, text: str, count: int = 5) -> list[str]:
+        words = text.split() or ["metin"]
+        return [f"{words[i % len(words)]} nedir?" for i in range(count)]
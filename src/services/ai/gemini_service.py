@@ -1,32 +1,143 @@
-import google.generativeai as genai
-from .base_ai_service import BaseAIService
 import asyncio
+import hashlib
+import json
+import time
+from typing import AsyncIterator, Dict, Optional, Tuple
+from .base_ai_service import BaseAIService
+from src.utils.tokenizer import get_tokenizer
 
 class GeminiService(BaseAIService):
     """Google Gemini service implementation"""
     
+    API_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+    # Açık önbellek (cachedContents) sadece uzun prompt'lar için oluşturulabilir
+    CACHE_MIN_TOKENS = 4096
+    CACHE_TTL_SECONDS = 600
+    
     def __init__(self, api_key: str, model: str = "gemini-2.0-flash"):
-        genai.configure(api_key=api_key)
+        self.api_key = api_key
         self.model_name = model
-        self.model = genai.GenerativeModel(model)
+        self.model = model if model.startswith("models/") else f"models/{model}"
+        # Prompt özeti -> (cachedContents adı veya None, geçerlilik sonu)
+        self._cached_contents: Dict[str, Tuple[Optional[str], float]] = {}
+        self._pending_caches: Dict[str, asyncio.Future] = {}
+    
+    def _build_request(self, text: str, prompt_template: str, cached_content: Optional[str] = None) -> dict:
+        """Build generateContent request body; the template is a system instruction or cached content"""
+        data = {
+            "contents": [
+                {"role": "user", "parts": [{"text": text}]}
+            ]
+        }
+        if cached_content:
+            data["cachedContent"] = cached_content
+        else:
+            # Sabit önek: aynı şablonu kullanan parçalarda örtük önbellekleme devreye girer
+            data["systemInstruction"] = {"parts": [{"text": prompt_template}]}
+        return data
+    
+    async def _get_cached_content(self, prompt_template: str) -> Optional[str]:
+        """Name of a cachedContents entry holding the template, created on first use"""
+        if get_tokenizer("gemini", self.model_name).count(prompt_template) < self.CACHE_MIN_TOKENS:
+            return None
+        
+        key = hashlib.sha256(prompt_template.encode("utf-8")).hexdigest()
+        entry = self._cached_contents.get(key)
+        # Süresi dolmak üzere olan önbellek yerine yenisi oluşturulur
+        if entry and entry[1] > time.time() + 30:
+            return entry[0]
+        
+        # Eşzamanlı parçalar aynı önbelleği tek seferde oluşturur
+        pending = self._pending_caches.get(key)
+        if pending is None or pending.get_loop() is not asyncio.get_running_loop():
+            pending = asyncio.ensure_future(self._create_cached_content(prompt_template))
+            self._pending_caches[key] = pending
+        try:
+            name = await asyncio.shield(pending)
+        finally:
+            if pending.done() and self._pending_caches.get(key) is pending:
+                del self._pending_caches[key]
+        
+        # Oluşturulamadıysa TTL boyunca tekrar denenmez, systemInstruction kullanılır
+        self._cached_contents[key] = (name, time.time() + self.CACHE_TTL_SECONDS)
+        return name
+    
+    async def _create_cached_content(self, prompt_template: str) -> Optional[str]:
+        try:
+            response = await self.get_http_client().post(
+                f"{self.API_BASE_URL}/cachedContents",
+                headers={"x-goog-api-key": self.api_key},
+                json={
+                    "model": self.model,
+                    "systemInstruction": {"parts": [{"text": prompt_template}]},
+                    "ttl": f"{self.CACHE_TTL_SECONDS}s"
+                },
+                timeout=60
+            )
+            response.raise_for_status()
+            name = response.json().get("name")
+            print(f"Gemini prompt önbelleği oluşturuldu: {name}")
+            return name
+        except Exception as e:
+            print(f"Gemini prompt önbelleği oluşturulamadı: {str(e)}")
+            return None
     
     async def analyze_text(self, text: str, prompt_template: str) -> str:
         try:
             print(f"Gemini API çağrısı başlatılıyor: {self.model_name}")
-            loop = asyncio.get_event_loop()
-            
-            # Senkron çağrıyı asenkron bir şekilde çalıştır
-            response = await loop.run_in_executor(
-                None, 
-                lambda: self.model.generate_content(f"{prompt_template}\n\nText to analyze: {text}")
+            # REST API paylaşılan HTTP havuzu üzerinden doğrudan async çağrılır
+            cached_content = await self._get_cached_content(prompt_template)
+            client = self.get_http_client()
+            response = await client.post(
+                f"{self.API_BASE_URL}/{self.model}:generateContent",
+                headers={"x-goog-api-key": self.api_key},
+                json=self._build_request(text, prompt_template, cached_content),
+                timeout=60
             )
+            response.raise_for_status()
             print("Gemini API yanıt verdi")
-            return response.text
+            return self._extract_text(response.json())
         except Exception as e:
             print(f"Gemini API hatası: {str(e)}")
-            raise ValueError(f"Gemini API error: {str(e)}")
+            raise self._classify_error(e)
+    
+    async def stream_text(self, text: str, prompt_template: str) -> AsyncIterator[str]:
+        try:
+            print(f"Gemini akış çağrısı başlatılıyor: {self.model_name}")
+            cached_content = await self._get_cached_content(prompt_template)
+            client = self.get_http_client()
+            async with client.stream(
+                "POST",
+                f"{self.API_BASE_URL}/{self.model}:streamGenerateContent",
+                params={"alt": "sse"},
+                headers={"x-goog-api-key": self.api_key},
+                json=self._build_request(text, prompt_template, cached_content),
+                timeout=60
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    chunk = json.loads(line[5:].strip())
+                    if not chunk.get("candidates"):
+                        continue
+                    delta = self._extract_text(chunk)
+                    if delta:
+                        yield delta
+        except Exception as e:
+            print(f"Gemini API hatası: {str(e)}")
+            raise self._classify_error(e)
+    
+    @staticmethod
+    def _extract_text(result: dict) -> str:
+        """Join text parts of the first candidate"""
+        candidates = result.get("candidates") or []
+        if not candidates:
+            raise ValueError(f"Gemini yanıtı boş: {result.get('promptFeedback', {})}")
+        parts = candidates[0].get("content", {}).get("parts", [])
+        return "".join(part.get("text", "") for part in parts)
     
     async def generate_questions(self, text: str, count: int = 5) -> list[str]:
         prompt = f"Generate {count} relevant questions based on the following text:\n\n{text}"
         response = await self.analyze_text(text, prompt)
-        return response.split('\n')[:count]
\ No newline at end of file
+        return response.split('\n')[:count]
@@ -0,0 +1,101 @@
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable, Dict, Optional
+
+
+class LatencyTracker:
+    """Recent successful call latencies per provider"""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: Dict[str, deque] = {}
+
+    def record(self, provider: str, duration: float):
+        self._samples.setdefault(provider, deque(maxlen=self.window)).append(duration)
+
+    def percentile(self, provider: str, percentile: float, min_samples: int = 1) -> Optional[float]:
+        """Latency percentile (0-100) or None if there are too few samples"""
+        samples = self._samples.get(provider)
+        if not samples or len(samples) < min_samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class RequestHedger:
+    """Send a duplicate request when the first one runs longer than usual"""
+
+    def __init__(self, latency_tracker: LatencyTracker, enabled: bool = False, percentile: float = 95,
+                 min_samples: int = 20, max_extra_ratio: float = 0.1):
+        self.latency_tracker = latency_tracker
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_samples = min_samples
+        # Ek istek bütçesi: hedge sayısı / toplam istek oranı bu değeri aşamaz
+        self.max_extra_ratio = max_extra_ratio
+
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def get_hedge_delay(self, provider: str) -> Optional[float]:
+        """Seconds to wait before hedging, or None when hedging is not possible yet"""
+        if not self.enabled:
+            return None
+        return self.latency_tracker.percentile(provider, self.percentile, self.min_samples)
+
+    def _try_spend(self) -> bool:
+        if self.hedges + 1 > self.max_extra_ratio * self.requests:
+            return False
+        self.hedges += 1
+        return True
+
+    async def run(self, provider: str, primary: Callable[[], Awaitable[str]],
+                  hedge: Callable[[], Awaitable[str]]) -> str:
+        """
+        Run ``primary`` and start ``hedge`` if it exceeds the latency percentile.
+
+        The first successful result wins and the other request is cancelled.
+        """
+        self.requests += 1
+        delay = self.get_hedge_delay(provider)
+        primary_task = asyncio.ensure_future(primary())
+        hedge_task = None
+
+        try:
+            if delay is None:
+                return await primary_task
+
+            done, _ = await asyncio.wait({primary_task}, timeout=delay)
+            if done or not self._try_spend():
+                return await primary_task
+
+            print(f"İstek {delay:.2f} sn'yi aştı ({provider}), yedek istek gönderiliyor")
+            hedge_task = asyncio.ensure_future(hedge())
+            pending = {primary_task, hedge_task}
+            last_error = None
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge_task:
+                            self.hedge_wins += 1
+                        return task.result()
+                    last_error = task.exception()
+
+            raise last_error
+        finally:
+            # Kaybeden istek iptal edilir
+            for task in (primary_task, hedge_task):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def get_stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins
+        }
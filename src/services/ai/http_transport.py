@@ -0,0 +1,61 @@
+import asyncio
+import importlib.util
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+
+class HTTPTransport:
+    """Shared pooled HTTP transport for AI services"""
+
+    def __init__(self, pool_limits: Optional[Dict[str, int]] = None, default_pool_limit: int = 10,
+                 keepalive_expiry: float = 30.0, timeout: float = 60.0, http2: bool = True):
+        self.pool_limits: Dict[str, int] = dict(pool_limits or {})
+        self.default_pool_limit = default_pool_limit
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        # HTTP/2 sadece h2 paketi kuruluysa kullanılabilir
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+
+        # Her sağlayıcı için ayrı havuz; istemciler oluşturuldukları event loop'a bağlıdır
+        self._clients: Dict[str, Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+
+    def get_client(self, provider: str) -> httpx.AsyncClient:
+        """Get pooled client for provider, bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(provider)
+
+        if entry is not None:
+            client_loop, client = entry
+            if client_loop is loop and not client.is_closed:
+                return client
+
+        limit = self.pool_limits.get(provider, self.default_pool_limit)
+        client = httpx.AsyncClient(
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=limit,
+                max_keepalive_connections=limit,
+                keepalive_expiry=self.keepalive_expiry
+            ),
+            timeout=httpx.Timeout(self.timeout)
+        )
+        self._clients[provider] = (loop, client)
+        print(f"HTTP havuzu oluşturuldu: {provider} (limit={limit}, http2={self.http2})")
+        return client
+
+    async def release_loop(self):
+        """Close clients bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        for provider, (client_loop, client) in list(self._clients.items()):
+            if client_loop is loop:
+                del self._clients[provider]
+                await client.aclose()
+
+    async def aclose(self):
+        """Close every client that can still be closed"""
+        await self.release_loop()
+        # Kapanmış loop'lara bağlı istemciler artık kullanılamaz, sadece bırakılır
+        for provider, (client_loop, _) in list(self._clients.items()):
+            if client_loop.is_closed():
+                del self._clients[provider]
@@ -0,0 +1,116 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass
+class RouteRule:
+    """Send matching requests to a provider; empty lists match everything"""
+
+    name: str
+    provider: str
+    analysis_types: List[str] = field(default_factory=list)
+    # "map": parça analizi, "reduce": birleştirme, "single": tek istekte dosya analizi
+    stages: List[str] = field(default_factory=list)
+    min_input_tokens: int = 0
+    max_input_tokens: Optional[int] = None
+
+    def matches(self, analysis_type: Optional[str], stage: Optional[str], input_tokens: int) -> bool:
+        if self.analysis_types and analysis_type not in self.analysis_types:
+            return False
+        if self.stages and stage not in self.stages:
+            return False
+        if input_tokens < self.min_input_tokens:
+            return False
+        return self.max_input_tokens is None or input_tokens <= self.max_input_tokens
+
+
+class RouteStats:
+    """Latency, token and cost counters of one route"""
+
+    def __init__(self, provider: str, window: int = 200):
+        self.provider = provider
+        self.requests = 0
+        self.errors = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cost = 0.0
+        self._latencies = deque(maxlen=window)
+
+    def record(self, duration: float, input_tokens: int, output_tokens: int, cost: float, success: bool):
+        self.requests += 1
+        self.input_tokens += input_tokens
+        self.output_tokens += output_tokens
+        self.cost += cost
+        if success:
+            self._latencies.append(duration)
+        else:
+            self.errors += 1
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))]
+
+    def get_stats(self) -> dict:
+        return {
+            "provider": self.provider,
+            "requests": self.requests,
+            "errors": self.errors,
+            "p50_latency": self.percentile(50),
+            "p95_latency": self.percentile(95),
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cost": round(self.cost, 6)
+        }
+
+
+class ModelRouter:
+    """Pick a provider per request from ordered rules; the first matching rule wins"""
+
+    DEFAULT_ROUTE = "varsayılan"
+
+    def __init__(self, rules: Optional[List[RouteRule]] = None, enabled: bool = False):
+        self.rules = list(rules or [])
+        self.enabled = enabled
+        self.stats: Dict[str, RouteStats] = {}
+
+    @classmethod
+    def from_settings(cls, settings: dict) -> "ModelRouter":
+        """Build the router from the "routing" section of settings.json"""
+        rules = []
+        for i, rule in enumerate(settings.get("rules", []), 1):
+            try:
+                rules.append(RouteRule(
+                    name=rule.get("name", f"kural-{i}"),
+                    provider=rule["provider"].lower(),
+                    analysis_types=list(rule.get("analysis_types", [])),
+                    stages=list(rule.get("stages", [])),
+                    min_input_tokens=rule.get("min_input_tokens", 0),
+                    max_input_tokens=rule.get("max_input_tokens")
+                ))
+            except (KeyError, AttributeError) as e:
+                print(f"Geçersiz yönlendirme kuralı atlanıyor ({i}): {str(e)}")
+        return cls(rules, enabled=settings.get("enabled", False))
+
+    def select(self, analysis_type: Optional[str], stage: Optional[str], input_tokens: int,
+               available: List[str]) -> Optional[RouteRule]:
+        """First rule that matches the request and whose provider is in ``available``"""
+        if not self.enabled:
+            return None
+        for rule in self.rules:
+            if rule.provider in available and rule.matches(analysis_type, stage, input_tokens):
+                return rule
+        return None
+
+    def record(self, route: str, provider: str, duration: float, input_tokens: int, output_tokens: int,
+               cost: float, success: bool = True):
+        """Add one finished request to the route's counters"""
+        stats = self.stats.get(route)
+        if stats is None:
+            stats = self.stats[route] = RouteStats(provider)
+        stats.record(duration, input_tokens, output_tokens, cost, success)
+
+    def get_stats(self) -> Dict[str, dict]:
+        return {route: stats.get_stats() for route, stats in self.stats.items()}
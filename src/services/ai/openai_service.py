@@ -1,3 +1,4 @@
+from typing import AsyncIterator
 import openai
 from .base_ai_service import BaseAIService
 
@@ -5,28 +6,56 @@ class OpenAIService(BaseAIService):
     """OpenAI service implementation"""
     
     def __init__(self, api_key: str, model: str = "gpt-3.5-turbo"):
-        self.client = openai.Client(api_key=api_key)
+        self.api_key = api_key
         self.model = model
+        self._client = None
+        self._http_client = None
+    
+    def _get_client(self) -> openai.AsyncOpenAI:
+        """Get async OpenAI client on top of the shared HTTP pool"""
+        http_client = self.get_http_client()
+        if self._client is None or self._http_client is not http_client:
+            self._client = openai.AsyncOpenAI(api_key=self.api_key, http_client=http_client)
+            self._http_client = http_client
+        return self._client
     
     async def analyze_text(self, text: str, prompt_template: str) -> str:
         try:
             print(f"OpenAI API çağrısı başlatılıyor: {self.model}")
-            # OpenAI kütüphanesi zaten async/await desteği sağlıyor
-            response = await self.client.chat.completions.create(
+            response = await self._get_client().chat.completions.create(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": prompt_template},
                     {"role": "user", "content": text}
                 ],
-                timeout=60  # 60 saniye zaman aşımı (eğer bu parametre destekleniyorsa)
+                timeout=60  # 60 saniye zaman aşımı
             )
             print("OpenAI API yanıt verdi")
             return response.choices[0].message.content
         except Exception as e:
             print(f"OpenAI API hatası: {str(e)}")
-            raise ValueError(f"OpenAI API error: {str(e)}")
+            raise self._classify_error(e)
+    
+    async def stream_text(self, text: str, prompt_template: str) -> AsyncIterator[str]:
+        try:
+            print(f"OpenAI akış çağrısı başlatılıyor: {self.model}")
+            stream = await self._get_client().chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": prompt_template},
+                    {"role": "user", "content": text}
+                ],
+                stream=True,
+                timeout=60
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            print(f"OpenAI API hatası: {str(e)}")
+            raise self._classify_error(e)
     
     async def generate_questions(self, text: str, count: int = 5) -> list[str]:
         prompt = f"Generate {count} relevant questions based on the following text:\n\n{text}"
         response = await self.analyze_text(text, prompt)
-        return response.split('\n')[:count]
\ No newline at end of file
+        return response.split('\n')[:count]
@@ -0,0 +1,150 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Optional
+
+
+class TokenBucket:
+    """Token bucket that refills continuously at a fixed rate"""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self, amount: float) -> float:
+        """Take tokens now and return how long the caller must wait for them"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            # Borç mantığı: jetonlar şimdiden ayrılır, eksik kısım bekleme süresine çevrilir
+            self.tokens -= amount
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+
+    async def acquire(self, amount: float = 1):
+        """Wait until ``amount`` tokens are available"""
+        wait = self._reserve(amount)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Block the bucket, e.g. after a Retry-After response"""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limit: grows slowly on success, halves on overload"""
+
+    def __init__(self, initial_limit: int, min_limit: int = 1, max_limit: Optional[int] = None,
+                 increase: float = 1.0, decrease_factor: float = 0.5):
+        self.min_limit = min_limit
+        self.max_limit = max_limit if max_limit is not None else initial_limit
+        self.limit = float(max(min_limit, min(initial_limit, self.max_limit)))
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self._waiters = deque()
+        self._lock = threading.Lock()
+
+    async def acquire(self):
+        """Wait for a free concurrency slot"""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self._lock:
+                    if (loop, waiter) in self._waiters:
+                        self._waiters.remove((loop, waiter))
+                    else:
+                        # Uyandırılmıştı; boşalan yeri sıradakine devret
+                        self._wake_waiters()
+                raise
+
+    def release(self):
+        """Free a slot and wake waiters that now fit under the limit"""
+        with self._lock:
+            self.in_flight -= 1
+            self._wake_waiters()
+
+    def _wake_waiters(self):
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._waiters:
+            loop, waiter = self._waiters.popleft()
+            if loop.is_closed():
+                continue
+            # Bekleyen istek başka bir event loop'ta olabilir
+            loop.call_soon_threadsafe(self._set_waiter_result, waiter)
+            free -= 1
+
+    @staticmethod
+    def _set_waiter_result(waiter: asyncio.Future):
+        if not waiter.done():
+            waiter.set_result(None)
+
+    def on_success(self):
+        """Additive increase: about one extra slot per full window of successes"""
+        with self._lock:
+            self.limit = min(self.max_limit, self.limit + self.increase / max(self.limit, 1.0))
+            self._wake_waiters()
+
+    def on_overload(self):
+        """Multiplicative decrease after a 429/overload response"""
+        with self._lock:
+            self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+
+
+class ProviderRateLimiter:
+    """Request/token rate limits plus adaptive concurrency for one provider model"""
+
+    def __init__(self, name: str, max_concurrency: int = 4,
+                 requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None):
+        self.name = name
+        self.concurrency = AdaptiveConcurrencyLimiter(max_concurrency)
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int = 0):
+        """Hold a concurrency slot and rate budget for one request"""
+        await self.concurrency.acquire()
+        try:
+            if self.request_bucket:
+                await self.request_bucket.acquire(1)
+            if self.token_bucket and estimated_tokens:
+                await self.token_bucket.acquire(estimated_tokens)
+            yield
+        finally:
+            self.concurrency.release()
+
+    def on_success(self):
+        self.concurrency.on_success()
+
+    def on_overload(self, retry_after: Optional[float] = None):
+        self.concurrency.on_overload()
+        print(f"Aşırı yük bildirildi ({self.name}), eşzamanlılık limiti: {int(self.concurrency.limit)}")
+        if retry_after:
+            for bucket in (self.request_bucket, self.token_bucket):
+                if bucket:
+                    bucket.pause(retry_after)
+
+    def get_stats(self) -> dict:
+        return {
+            "concurrency_limit": int(self.concurrency.limit),
+            "in_flight": self.concurrency.in_flight
+        }
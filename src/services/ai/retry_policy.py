@@ -0,0 +1,37 @@
+import random
+from dataclasses import dataclass
+from typing import Optional
+
+from src.core.exceptions import RateLimitError, TransientAIError
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter for transient AI errors"""
+
+    max_attempts: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+
+    def is_retryable(self, error: Exception) -> bool:
+        """Only rate limits, timeouts, connection errors and 5xx responses are retried"""
+        return isinstance(error, TransientAIError)
+
+    def get_delay(self, attempt: int, error: Optional[Exception] = None) -> float:
+        """Delay before the next attempt; a provider Retry-After value wins"""
+        if isinstance(error, RateLimitError) and error.retry_after:
+            return min(self.max_delay, error.retry_after)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+@dataclass
+class AttemptRecord:
+    """Timing and outcome of a single provider call"""
+
+    provider: str
+    model: str
+    attempt: int
+    started_at: float
+    duration: float
+    success: bool
+    error: Optional[str] = None
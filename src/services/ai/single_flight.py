@@ -0,0 +1,76 @@
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Awaitable, Callable, Dict
+
+
+class _Call:
+    """One in-flight call and the number of callers waiting for it"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, task: asyncio.Task, future: concurrent.futures.Future):
+        self.loop = loop
+        self.task = task
+        self.future = future
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Concurrent calls with the same key share one execution and its result"""
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    async def run(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``func`` unless a call with the same key is already in flight.
+
+        The shared call is only cancelled when every caller waiting for it is cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None or call.loop.is_closed():
+                task = loop.create_task(func())
+                call = _Call(loop, task, concurrent.futures.Future())
+                task.add_done_callback(lambda t, key=key, call=call: self._finish(key, call, t))
+                self._calls[key] = call
+                self.executed += 1
+            else:
+                self.coalesced += 1
+                print("Aynı istek zaten işleniyor, sonucu paylaşılacak")
+            call.waiters += 1
+
+        try:
+            # Sonuç thread güvenli future üzerinden paylaşılır; bekleyen başka bir loop'ta olabilir
+            return await asyncio.shield(asyncio.wrap_future(call.future))
+        finally:
+            with self._lock:
+                call.waiters -= 1
+                abandoned = call.waiters == 0 and not call.future.done()
+                if abandoned and self._calls.get(key) is call:
+                    del self._calls[key]
+            if abandoned:
+                call.loop.call_soon_threadsafe(call.task.cancel)
+
+    def _finish(self, key: str, call: _Call, task: asyncio.Task):
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        if call.future.done():
+            return
+        if task.cancelled():
+            call.future.cancel()
+        elif task.exception() is not None:
+            call.future.set_exception(task.exception())
+        else:
+            call.future.set_result(task.result())
+
+    def get_stats(self) -> dict:
+        return {
+            "in_flight": len(self._calls),
+            "executed": self.executed,
+            "coalesced": self.coalesced
+        }
@@ -1,26 +1,56 @@
 import os
 import json
-from typing import Dict, Any
+import time
+import asyncio
+from collections import deque
+from typing import Dict, Any, Optional, AsyncIterator, List, Tuple
 from .ai.base_ai_service import BaseAIService
 from .ai.openai_service import OpenAIService
 from .ai.gemini_service import GeminiService
 from .ai.claude_service import ClaudeService
 from .ai.deepseek_service import DeepSeekService
+from .ai.fake_service import FakeAIService
+from .ai.response_cache import ResponseCache
+from .ai.cassette import Cassette, RecordingService, ReplayService
+from .ai.http_transport import HTTPTransport
+from .ai.rate_limiter import ProviderRateLimiter
+from .ai.retry_policy import RetryPolicy, AttemptRecord
+from .ai.hedging import LatencyTracker, RequestHedger
+from .ai.single_flight import SingleFlight
+from .ai.model_router import ModelRouter
+from .chunk_packer import ChunkPacker
 from src.repositories.ai_config_repository import AIConfigRepository
 from src.core.security import Security
+from src.core.exceptions import RateLimitError
+from src.utils.tokenizer import Tokenizer, get_tokenizer
 
 class AIServiceManager:
     def __init__(self, ai_config_repo: AIConfigRepository, security: Security):
         self.ai_config_repo = ai_config_repo
         self.security = security
         self.services: Dict[str, BaseAIService] = {}
+        self.settings: Dict[str, Any] = {}
+        self.response_cache: Optional[ResponseCache] = None
+        self.transport: Optional[HTTPTransport] = None
+        self.rate_limiters: Dict[str, ProviderRateLimiter] = {}
+        self.attempt_log = deque(maxlen=1000)
+        self.single_flight = SingleFlight()
+        self.latency_tracker = LatencyTracker()
+        self.cassette: Optional[Cassette] = None
         
         self._initialize_services()
+        self._initialize_cassette()
+        self._initialize_transport()
+        self._initialize_cache()
+        self._initialize_retry_policy()
+        self._initialize_hedging()
+        self._initialize_routing()
     
     def _initialize_services(self):
         """Initialize AI services from configuration"""
         try:
             settings = self._load_settings()
+            self.settings = settings
             
             # OpenAI
             openai_api_key = os.getenv('OPENAI_API_KEY')
@@ -50,6 +80,21 @@ class AIServiceManager:
                 print(f"DeepSeek servisini başlatma: {deepseek_model}")
                 self.services['deepseek'] = DeepSeekService(deepseek_api_key, deepseek_model)
             
+            # Sahte servis: anahtar gerektirmez, ölçüm ve testler için
+            fake_settings = settings.get("fake", {})
+            if fake_settings.get("enabled") or os.getenv('FAKE_AI_ENABLED'):
+                print(f"Sahte AI servisini başlatma: {fake_settings.get('model', 'fake-1')}")
+                self.services['fake'] = FakeAIService(
+                    model=fake_settings.get("model", "fake-1"),
+                    latency=fake_settings.get("latency"),
+                    tokens_per_second=fake_settings.get("tokens_per_second", 50.0),
+                    output_tokens=fake_settings.get("output_tokens", 200),
+                    error_rate=fake_settings.get("error_rate", 0.0),
+                    rate_limit_rate=fake_settings.get("rate_limit_rate", 0.0),
+                    retry_after=fake_settings.get("retry_after", 1.0),
+                    seed=fake_settings.get("seed", 0)
+                )
+            
             # Default AI provider
             self.default_provider = settings.get("default_ai", "OpenAI").lower()
             if self.default_provider not in self.services and self.services:
@@ -61,6 +106,92 @@ class AIServiceManager:
         except Exception as e:
             print(f"AI servisleri başlatılırken hata oluştu: {str(e)}")
     
+    def _initialize_cassette(self):
+        """Wrap services for recording, or replace them with recorded responses"""
+        cassette_settings = self.settings.get("cassette", {})
+        mode = os.getenv('AI_CASSETTE_MODE', cassette_settings.get("mode", "off")).lower()
+        if mode not in ("record", "replay"):
+            return
+        
+        path = os.getenv('AI_CASSETTE_PATH', cassette_settings.get("path", "data/cassettes/session.jsonl.gz"))
+        if not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(__file__), "../..", path)
+        
+        try:
+            self.cassette = Cassette(os.path.normpath(path))
+            if mode == "record":
+                print(f"İstekler kaydediliyor: {self.cassette.path}")
+                self.services = {
+                    provider: RecordingService(service, self.cassette, provider)
+                    for provider, service in self.services.items()
+                }
+            else:
+                speed = float(os.getenv('AI_CASSETTE_SPEED', cassette_settings.get("speed", 1.0)))
+                self.cassette.load()
+                # Ağ kullanılmaz; sadece kayıttaki sağlayıcılar kullanılabilir
+                self.services = {
+                    provider: ReplayService(self.cassette, provider, model, speed)
+                    for provider, model in self.cassette.get_models().items()
+                }
+                print(f"Kayıttan oynatılıyor (hız x{speed}): {', '.join(self.services.keys())}")
+                if self.default_provider not in self.services and self.services:
+                    self.default_provider = list(self.services.keys())[0]
+        except Exception as e:
+            print(f"Kayıt modu başlatılamadı ({mode}): {str(e)}")
+            self.cassette = None
+    
+    def get_cassette_stats(self) -> Dict[str, Any]:
+        """Get recorded/replayed call counters"""
+        return self.cassette.get_stats() if self.cassette else {}
+    
+    def _initialize_transport(self):
+        """Create the pooled HTTP transport shared by all services"""
+        http_settings = self.settings.get("http", {})
+        pool_limits = {
+            provider: provider_settings["max_connections"]
+            for provider, provider_settings in self.settings.items()
+            if isinstance(provider_settings, dict) and "max_connections" in provider_settings
+        }
+        self.transport = HTTPTransport(
+            pool_limits=pool_limits,
+            default_pool_limit=http_settings.get("max_connections", 10),
+            keepalive_expiry=http_settings.get("keepalive_expiry", 30.0),
+            timeout=http_settings.get("timeout", 60.0),
+            http2=http_settings.get("http2", True)
+        )
+        for service in self.services.values():
+            service.set_transport(self.transport)
+    
+    async def close(self):
+        """Shut down pooled connections and the response cache"""
+        if self.transport:
+            await self.transport.aclose()
+        if self.response_cache:
+            self.response_cache.close()
+        if self.cassette:
+            self.cassette.close()
+    
+    def _initialize_cache(self):
+        """Initialize disk-backed response cache from settings"""
+        try:
+            cache_settings = self.settings.get("cache", {})
+            cache_path = os.path.join(os.path.dirname(__file__), "../../data/cache/ai_responses.sqlite")
+            self.response_cache = ResponseCache(
+                cache_path,
+                max_size_mb=cache_settings.get("max_size_mb", 200),
+                max_age_days=cache_settings.get("max_age_days", 30),
+                enabled=cache_settings.get("enabled", True)
+            )
+        except Exception as e:
+            print(f"Yanıt önbelleği başlatılırken hata: {str(e)}")
+            self.response_cache = None
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get response cache statistics"""
+        if not self.response_cache:
+            return {"enabled": False}
+        return self.response_cache.get_stats()
+    
     def _load_settings(self) -> Dict[str, Any]:
         """Load settings from file"""
         try:
@@ -74,54 +205,410 @@ class AIServiceManager:
         
         return {}
     
-    async def analyze_text(self, text: str, provider: str, prompt_template: str) -> str:
-        """Analyze text using specified AI service"""
+    def get_max_concurrency(self, provider: str, default: int = 4) -> int:
+        """Get max in-flight requests for a provider from settings"""
+        provider_settings = self.settings.get(provider, {})
+        try:
+            return max(1, int(provider_settings.get("max_concurrency", default)))
+        except (TypeError, ValueError):
+            return default
+    
+    def _get_rate_limiter(self, provider: str) -> ProviderRateLimiter:
+        """Get rate limiter for the provider's current model"""
+        key = f"{provider}:{self.services[provider].get_model_name()}"
+        if key not in self.rate_limiters:
+            provider_settings = self.settings.get(provider, {})
+            self.rate_limiters[key] = ProviderRateLimiter(
+                key,
+                max_concurrency=self.get_max_concurrency(provider),
+                requests_per_minute=provider_settings.get("requests_per_minute"),
+                tokens_per_minute=provider_settings.get("tokens_per_minute")
+            )
+        return self.rate_limiters[key]
+    
+    def get_rate_limit_stats(self) -> Dict[str, Any]:
+        """Get current adaptive concurrency state per provider model"""
+        return {key: limiter.get_stats() for key, limiter in self.rate_limiters.items()}
+    
+    def get_tokenizer(self, provider: str) -> Tokenizer:
+        """Get tokenizer matching the provider's current model"""
+        service = self.services.get(provider)
+        model = service.get_model_name() if service else self.settings.get(provider, {}).get("model")
+        return get_tokenizer(provider, model)
+    
+    def is_packing_enabled(self) -> bool:
+        """Whether small chunks may be combined into one request"""
+        return self.settings.get("packing", {}).get("enabled", False)
+    
+    def get_output_token_reserve(self, provider: str) -> int:
+        """Tokens kept free in the context window for the model's answer"""
+        default = self.settings.get("packing", {}).get("reserved_output_tokens", 4000)
+        return self.settings.get(provider, {}).get("max_output_tokens", default)
+    
+    def get_input_token_budget(self, provider: str, prompt_template: str) -> int:
+        """Tokens left for input text once the prompt and the output share are taken from the context window"""
+        context_tokens = self.settings.get(provider, {}).get("context_tokens", 8192)
+        return context_tokens - self.get_output_token_reserve(provider) - self.get_tokenizer(provider).count(prompt_template)
+    
+    def get_chunk_token_budget(self, provider: str, prompt_template: str) -> int:
+        """Input tokens of one chunk request: the configured request size, capped by the context window"""
+        max_request_tokens = self.settings.get("packing", {}).get("max_request_tokens", 12000)
+        return max(1, min(max_request_tokens, self.get_input_token_budget(provider, prompt_template)))
+    
+    def create_chunk_packer(self, provider: str, prompt_template: str) -> ChunkPacker:
+        """Create a packer sized to the provider's context window"""
+        # Bağlamdan yanıt payı, prompt ve birleştirme talimatları düşülür
+        budget = self.get_chunk_token_budget(provider, ChunkPacker.PACKED_INSTRUCTIONS + prompt_template)
+        
+        return ChunkPacker(self.get_tokenizer(provider), budget, self.settings.get("packing", {}).get("max_units", 10))
+    
+    def _estimate_request_tokens(self, provider: str, prompt_template: str, text: str) -> int:
+        """Input token estimate used for tokens-per-minute budgeting"""
+        tokenizer = self.get_tokenizer(provider)
+        return tokenizer.count(prompt_template) + tokenizer.count(text)
+    
+    def _resolve_provider(self, provider: str) -> str:
+        """Return provider if configured, otherwise fall back to an available one"""
+        # Eğer belirtilen sağlayıcı yoksa, mevcut bir servis kullan
+        if provider not in self.services:
+            print(f"Belirtilen provider '{provider}' mevcut değil")
+            if self.default_provider in self.services:
+                print(f"Varsayılan provider kullanılıyor: {self.default_provider}")
+                provider = self.default_provider
+            elif len(self.services) > 0:
+                provider = list(self.services.keys())[0]
+                print(f"İlk bulunan provider kullanılıyor: {provider}")
+            else:
+                raise ValueError("Hiçbir AI servisi yapılandırılmamış. API anahtarlarınızı kontrol edin.")
+        
+        print(f"Kullanılan provider: {provider}")
+        return provider
+    
+    def _get_cache_key(self, provider: str, prompt_template: str, text: str, use_cache: bool) -> Optional[str]:
+        """Build response cache key, or None when the cache is bypassed"""
+        if not (use_cache and self.response_cache and self.response_cache.enabled):
+            return None
+        model = self.services[provider].get_model_name()
+        return ResponseCache.make_key(provider, model, prompt_template, text)
+    
+    def _initialize_retry_policy(self):
+        """Create retry policy and failover chain from settings"""
+        retry_settings = self.settings.get("retry", {})
+        self.retry_policy = RetryPolicy(
+            max_attempts=retry_settings.get("max_attempts", 3),
+            base_delay=retry_settings.get("base_delay", 1.0),
+            max_delay=retry_settings.get("max_delay", 30.0)
+        )
+        self.failover_chain: List[str] = [
+            provider.lower() for provider in self.settings.get("failover", [])
+        ]
+    
+    def _initialize_hedging(self):
+        """Create request hedger from settings, disabled by default"""
+        hedging_settings = self.settings.get("hedging", {})
+        self.hedger = RequestHedger(
+            self.latency_tracker,
+            enabled=hedging_settings.get("enabled", False),
+            percentile=hedging_settings.get("percentile", 95),
+            min_samples=hedging_settings.get("min_samples", 20),
+            max_extra_ratio=hedging_settings.get("max_extra_ratio", 0.1)
+        )
+        # "same": aynı sağlayıcıya, "alternate": yedek zincirindeki bir sonrakine
+        self.hedge_target = hedging_settings.get("target", "same")
+    
+    def _get_hedge_provider(self, provider: str) -> str:
+        """Provider that receives the duplicate request"""
+        if self.hedge_target == "alternate":
+            chain = self._get_failover_chain(provider)
+            if len(chain) > 1:
+                return chain[1]
+        return provider
+    
+    def _initialize_routing(self):
+        """Create the rule-based model router from settings, disabled by default"""
+        self.router = ModelRouter.from_settings(self.settings.get("routing", {}))
+    
+    def _route(self, provider: str, prompt_template: str, text: str,
+               analysis_type: Optional[str], stage: Optional[str]) -> Tuple[str, str]:
+        """Provider and route name for a request; without a matching rule the requested provider is kept"""
+        default_route = f"{ModelRouter.DEFAULT_ROUTE}:{provider}"
+        if not self.router.enabled:
+            return provider, default_route
+        
+        input_tokens = self.get_tokenizer(provider).count(text)
+        # Sadece metni bağlam penceresine sığan sağlayıcılar aday olur
+        available = [
+            candidate for candidate in self.services
+            if candidate == provider
+            or self.get_tokenizer(candidate).count(text) <= self.get_input_token_budget(candidate, prompt_template)
+        ]
+        rule = self.router.select(analysis_type, stage, input_tokens, available)
+        if rule is None:
+            return provider, default_route
+        
+        if rule.provider != provider:
+            print(f"İstek yönlendirildi [{rule.name}]: {provider} -> {rule.provider}")
+        return rule.provider, rule.name
+    
+    def _estimate_cost(self, provider: str, input_tokens: int, output_tokens: int) -> float:
+        """Request cost from the per-million-token prices in the provider settings"""
+        provider_settings = self.settings.get(provider, {})
+        return (input_tokens * provider_settings.get("input_cost_per_1m", 0.0)
+                + output_tokens * provider_settings.get("output_cost_per_1m", 0.0)) / 1_000_000
+    
+    def _record_route(self, route: str, provider: str, started_at: float, prompt_template: str, text: str,
+                      result: Optional[str] = None):
+        """Add a finished request to the route's latency and cost counters; result None marks a failure"""
+        input_tokens = self._estimate_request_tokens(provider, prompt_template, text)
+        output_tokens = self.get_tokenizer(provider).count(result) if result else 0
+        self.router.record(
+            route,
+            provider,
+            time.monotonic() - started_at,
+            input_tokens,
+            output_tokens,
+            self._estimate_cost(provider, input_tokens, output_tokens),
+            success=result is not None
+        )
+    
+    def get_routing_stats(self) -> Dict[str, Any]:
+        """Get latency, token and estimated cost counters per route"""
+        return self.router.get_stats()
+    
+    def get_coalescing_stats(self) -> Dict[str, Any]:
+        """Get counters of shared in-flight requests"""
+        return self.single_flight.get_stats()
+    
+    def get_hedging_stats(self) -> Dict[str, Any]:
+        """Get hedged request counters"""
+        return self.hedger.get_stats()
+    
+    async def _call_hedged(self, provider: str, text: str, prompt_template: str) -> Tuple[str, str]:
+        """Call provider, hedging stragglers; returns (answering provider, result)"""
+        hedge_provider = self._get_hedge_provider(provider)
+        
+        async def call(target: str) -> Tuple[str, str]:
+            return target, await self._call_with_retries(target, text, prompt_template)
+        
+        # Limit doluyken yedek istek sadece kuyruğu uzatır
+        concurrency = self._get_rate_limiter(hedge_provider).concurrency
+        if concurrency.in_flight >= int(concurrency.limit):
+            return await call(provider)
+        
+        return await self.hedger.run(
+            provider,
+            lambda: call(provider),
+            lambda: call(hedge_provider)
+        )
+    
+    def _get_failover_chain(self, provider: str) -> List[str]:
+        """Requested provider first, then configured fallbacks that are available"""
+        chain = [provider]
+        for candidate in self.failover_chain:
+            if candidate in self.services and candidate not in chain:
+                chain.append(candidate)
+        return chain
+    
+    def _record_attempt(self, provider: str, attempt: int, started_at: float, error: Optional[Exception] = None):
+        """Store timing of a provider call"""
+        record = AttemptRecord(
+            provider=provider,
+            model=self.services[provider].get_model_name(),
+            attempt=attempt,
+            started_at=started_at,
+            duration=time.monotonic() - started_at,
+            success=error is None,
+            error=str(error) if error else None
+        )
+        self.attempt_log.append(record)
+        if record.success:
+            self.latency_tracker.record(provider, record.duration)
+        status = "başarılı" if record.success else f"başarısız ({record.error})"
+        print(f"Deneme {attempt} [{provider}] {record.duration:.2f} sn, {status}")
+    
+    def get_attempt_log(self) -> List[AttemptRecord]:
+        """Get recorded provider attempts, oldest first"""
+        return list(self.attempt_log)
+    
+    async def _call_with_retries(self, provider: str, text: str, prompt_template: str) -> str:
+        """Call one provider, retrying transient errors with backoff"""
+        service = self.services[provider]
+        limiter = self._get_rate_limiter(provider)
+        
+        for attempt in range(1, self.retry_policy.max_attempts + 1):
+            started_at = time.monotonic()
+            try:
+                async with limiter.slot(self._estimate_request_tokens(provider, prompt_template, text)):
+                    # Süre, sırada bekleme hariç sağlayıcı yanıt süresini ölçer
+                    started_at = time.monotonic()
+                    result = await service.analyze_text(text, prompt_template)
+            except Exception as e:
+                self._record_attempt(provider, attempt, started_at, e)
+                if isinstance(e, RateLimitError):
+                    limiter.on_overload(e.retry_after)
+                if attempt >= self.retry_policy.max_attempts or not self.retry_policy.is_retryable(e):
+                    raise
+                delay = self.retry_policy.get_delay(attempt, e)
+                print(f"{delay:.1f} sn sonra tekrar denenecek...")
+                await asyncio.sleep(delay)
+                continue
+            
+            limiter.on_success()
+            self._record_attempt(provider, attempt, started_at)
+            return result
+    
+    async def analyze_text(self, text: str, provider: str, prompt_template: str, use_cache: bool = True,
+                           analysis_type: Optional[str] = None, stage: Optional[str] = None) -> str:
+        """Analyze text using specified AI service, with retries and failover.
+        analysis_type and stage ("map", "reduce" or "single") let routing rules pick another provider"""
         print(f"analyze_text çağrıldı: provider={provider}, metin uzunluğu={len(text)}")
         
         try:
-            # Eğer belirtilen sağlayıcı yoksa, mevcut bir servis kullan
-            if provider not in self.services:
-                print(f"Belirtilen provider '{provider}' mevcut değil")
-                if self.default_provider in self.services:
-                    print(f"Varsayılan provider kullanılıyor: {self.default_provider}")
-                    provider = self.default_provider
-                elif len(self.services) > 0:
-                    provider = list(self.services.keys())[0]
-                    print(f"İlk bulunan provider kullanılıyor: {provider}")
-                else:
-                    raise ValueError("Hiçbir AI servisi yapılandırılmamış. API anahtarlarınızı kontrol edin.")
-            
-            print(f"Kullanılan provider: {provider}")
-            service = self.services[provider]
-            print(f"Servis bulundu: {type(service).__name__}")
+            provider = self._resolve_provider(provider)
+            provider, route = self._route(provider, prompt_template, text, analysis_type, stage)
+            started_at = time.monotonic()
             
-            print("AI servisi analiz başlatılıyor...")
-            result = await service.analyze_text(text, prompt_template)
-            print(f"AI servisi yanıt verdi, yanıt uzunluğu: {len(result)}")
+            # Aynı anda gelen özdeş istekler tek çağrıyı paylaşır; önbelleksiz istek önbellekli olanla birleşmez
+            flight_key = ResponseCache.make_key(
+                provider, self.services[provider].get_model_name(), prompt_template, text
+            ) + f"|use_cache={use_cache}"
+            try:
+                answered_by, result = await self.single_flight.run(
+                    flight_key,
+                    lambda: self._analyze_with_failover(text, provider, prompt_template, use_cache)
+                )
+            except Exception:
+                self._record_route(route, provider, started_at, prompt_template, text)
+                raise
+            
+            # Yedek sağlayıcı yanıtladıysa gecikme ve maliyet onun adına yazılır
+            self._record_route(route, answered_by, started_at, prompt_template, text, result)
             return result
             
         except Exception as e:
             print(f"AI servisi hatası: {str(e)}")
             raise ValueError(f"AI analiz hatası: {str(e)}")
     
+    async def _analyze_with_failover(self, text: str, provider: str, prompt_template: str,
+                                     use_cache: bool) -> Tuple[str, str]:
+        """Serve from cache or walk the failover chain; returns (answering provider, result)"""
+        # Önbellekte aynı istek varsa sağlayıcıyı çağırma
+        cache_key = self._get_cache_key(provider, prompt_template, text, use_cache)
+        if cache_key:
+            cached = await asyncio.to_thread(self.response_cache.get, cache_key)
+            if cached is not None:
+                print("Yanıt önbellekten döndürüldü")
+                return provider, cached
+        
+        last_error = None
+        for candidate in self._get_failover_chain(provider):
+            print(f"AI servisi analiz başlatılıyor: {candidate}")
+            try:
+                answered_by, result = await self._call_hedged(candidate, text, prompt_template)
+            except Exception as e:
+                last_error = e
+                print(f"'{candidate}' başarısız oldu: {str(e)}")
+                continue
+            
+            print(f"AI servisi yanıt verdi, yanıt uzunluğu: {len(result)}")
+            cache_key = self._get_cache_key(answered_by, prompt_template, text, use_cache)
+            if cache_key:
+                await asyncio.to_thread(
+                    self.response_cache.set, cache_key, answered_by, self.services[answered_by].get_model_name(), result
+                )
+            return answered_by, result
+        
+        raise last_error
+    
+    async def stream_text(self, text: str, provider: str, prompt_template: str,
+                          use_cache: bool = True, analysis_type: Optional[str] = None,
+                          stage: Optional[str] = None) -> AsyncIterator[str]:
+        """Stream analysis of text as deltas; retries and failover apply until the first delta"""
+        print(f"stream_text çağrıldı: provider={provider}, metin uzunluğu={len(text)}")
+        
+        try:
+            provider = self._resolve_provider(provider)
+            provider, route = self._route(provider, prompt_template, text, analysis_type, stage)
+            started_at = time.monotonic()
+            
+            parts = []
+            answered = {}
+            try:
+                async for delta in self._stream_with_failover(text, provider, prompt_template, use_cache, answered):
+                    parts.append(delta)
+                    yield delta
+            except Exception:
+                self._record_route(route, provider, started_at, prompt_template, text)
+                raise
+            
+            self._record_route(route, answered.get("provider", provider), started_at, prompt_template, text,
+                               "".join(parts))
+                
+        except Exception as e:
+            print(f"AI servisi hatası: {str(e)}")
+            raise ValueError(f"AI analiz hatası: {str(e)}")
+    
+    async def _stream_with_failover(self, text: str, provider: str, prompt_template: str,
+                                    use_cache: bool, answered: Dict[str, str]) -> AsyncIterator[str]:
+        """Serve from cache or stream from the failover chain; the answering provider is stored in answered"""
+        cache_key = self._get_cache_key(provider, prompt_template, text, use_cache)
+        if cache_key:
+            cached = await asyncio.to_thread(self.response_cache.get, cache_key)
+            if cached is not None:
+                print("Yanıt önbellekten döndürüldü")
+                answered["provider"] = provider
+                yield cached
+                return
+        
+        last_error = None
+        for candidate in self._get_failover_chain(provider):
+            service = self.services[candidate]
+            limiter = self._get_rate_limiter(candidate)
+            
+            for attempt in range(1, self.retry_policy.max_attempts + 1):
+                parts = []
+                started_at = time.monotonic()
+                try:
+                    async with limiter.slot(self._estimate_request_tokens(candidate, prompt_template, text)):
+                        # Süre, sırada bekleme hariç sağlayıcı yanıt süresini ölçer
+                        started_at = time.monotonic()
+                        async for delta in service.stream_text(text, prompt_template):
+                            answered["provider"] = candidate
+                            parts.append(delta)
+                            yield delta
+                except Exception as e:
+                    self._record_attempt(candidate, attempt, started_at, e)
+                    if isinstance(e, RateLimitError):
+                        limiter.on_overload(e.retry_after)
+                    # Metin akmaya başladıysa tekrar deneme yapılamaz
+                    if parts:
+                        raise
+                    last_error = e
+                    if attempt >= self.retry_policy.max_attempts or not self.retry_policy.is_retryable(e):
+                        break
+                    await asyncio.sleep(self.retry_policy.get_delay(attempt, e))
+                    continue
+                
+                limiter.on_success()
+                self._record_attempt(candidate, attempt, started_at)
+                answered["provider"] = candidate
+                result = "".join(parts)
+                print(f"AI servisi akışı tamamlandı, yanıt uzunluğu: {len(result)}")
+                cache_key = self._get_cache_key(candidate, prompt_template, text, use_cache)
+                if cache_key:
+                    await asyncio.to_thread(self.response_cache.set, cache_key, candidate, service.get_model_name(), result)
+                return
+            
+            print(f"'{candidate}' başarısız oldu: {str(last_error)}")
+        
+        raise last_error
+    
     async def generate_questions(self, text: str, provider: str, count: int = 5) -> list[str]:
         """Generate questions using specified AI service"""
         print(f"generate_questions çağrıldı: provider={provider}, metin uzunluğu={len(text)}")
         
         try:
-            # Eğer belirtilen sağlayıcı yoksa, mevcut bir servis kullan
-            if provider not in self.services:
-                print(f"Belirtilen provider '{provider}' mevcut değil")
-                if self.default_provider in self.services:
-                    print(f"Varsayılan provider kullanılıyor: {self.default_provider}")
-                    provider = self.default_provider
-                elif len(self.services) > 0:
-                    provider = list(self.services.keys())[0]
-                    print(f"İlk bulunan provider kullanılıyor: {provider}")
-                else:
-                    raise ValueError("Hiçbir AI servisi yapılandırılmamış. API anahtarlarınızı kontrol edin.")
-            
-            print(f"Kullanılan provider: {provider}")
+            provider = self._resolve_provider(provider)
             service = self.services[provider]
             print(f"Servis bulundu: {type(service).__name__}")
             
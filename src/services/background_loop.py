@@ -0,0 +1,77 @@
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Awaitable, Optional
+
+
+class BackgroundLoop:
+    """One long-lived asyncio loop on a daemon thread; jobs from any thread share it"""
+
+    def __init__(self, name: str = "ai-loop"):
+        self.name = name
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    def start(self):
+        """Start the loop thread if it is not running"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self._ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, coro: Awaitable[Any]) -> concurrent.futures.Future:
+        """Schedule a coroutine on the loop and return a thread-safe future"""
+        if not self.is_running():
+            self.start()
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        future.add_done_callback(self._log_failure)
+        return future
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the loop and block until it finishes"""
+        return self.submit(coro).result(timeout)
+
+    @staticmethod
+    def _log_failure(future: concurrent.futures.Future):
+        if not future.cancelled() and future.exception() is not None:
+            print(f"Arka plan işi hata ile bitti: {str(future.exception())}")
+
+    def stop(self, shutdown: Optional[Awaitable[Any]] = None, timeout: float = 10.0):
+        """Run an optional shutdown coroutine, cancel remaining jobs and stop the loop"""
+        if not self.is_running():
+            if asyncio.iscoroutine(shutdown):
+                shutdown.close()
+            return
+
+        async def _shutdown():
+            if shutdown is not None:
+                try:
+                    await shutdown
+                except Exception as e:
+                    print(f"Kapanış sırasında hata: {str(e)}")
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(_shutdown(), self.loop).result(timeout)
+        except Exception as e:
+            print(f"Arka plan döngüsü düzgün kapatılamadı: {str(e)}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
@@ -0,0 +1,125 @@
+import asyncio
+from typing import Callable, Dict, List, Optional
+
+from src.core.cancellation import CancellationToken, run_cancellable
+from src.core.exceptions import OperationCancelledError
+from .chunk_packer import PackedRequest
+
+
+class ChunkAnalyzer:
+    """Analyze text chunks concurrently with a per-provider in-flight limit"""
+
+    DEFAULT_MAX_CONCURRENCY = 4
+
+    def __init__(self, ai_service_manager, max_concurrency: Optional[Dict[str, int]] = None):
+        self.ai_service_manager = ai_service_manager
+        self.max_concurrency: Dict[str, int] = dict(max_concurrency or {})
+
+    def get_limit(self, provider: str) -> int:
+        """Get the in-flight request limit for a provider"""
+        if provider in self.max_concurrency:
+            return max(1, int(self.max_concurrency[provider]))
+        if self.ai_service_manager and hasattr(self.ai_service_manager, 'get_max_concurrency'):
+            return max(1, self.ai_service_manager.get_max_concurrency(provider))
+        return self.DEFAULT_MAX_CONCURRENCY
+
+    async def analyze_chunks(self, chunks: List[str], provider: str, prompt_template: str,
+                             parallel: bool = True, use_cache: bool = True, pack: bool = False,
+                             progress_callback: Optional[Callable[[int, int], None]] = None,
+                             cancel_token: Optional[CancellationToken] = None,
+                             analysis_type: Optional[str] = None, stage: str = "map") -> List[str]:
+        """
+        Analyze every chunk and return the results in chunk order.
+
+        Args:
+            chunks (List[str]): Text chunks to analyze
+            provider (str): AI provider name
+            prompt_template (str): Prompt template shared by all chunks
+            parallel (bool): Run chunks concurrently; False sends them one at a time
+            use_cache (bool): Consult the response cache
+            pack (bool): Combine small chunks into shared requests up to the model's token budget
+            progress_callback (Callable): Called with (completed, total) after each chunk
+            cancel_token (CancellationToken): Cancelling it aborts pending and in-flight requests
+            analysis_type (str): Analysis type, matched by the model routing rules
+            stage (str): Pipeline stage for the routing rules, "map" or "reduce"
+
+        Returns:
+            List[str]: Analysis results, same order as ``chunks``
+
+        Raises:
+            OperationCancelledError: On cancellation; ``partial_results`` holds the results
+                finished so far, with None for chunks that were not analyzed
+        """
+        total = len(chunks)
+        if total == 0:
+            return []
+
+        limit = self.get_limit(provider) if parallel else 1
+        semaphore = asyncio.Semaphore(limit)
+        results: List[Optional[str]] = [None] * total
+        completed = 0
+
+        if pack and total > 1:
+            packer = self.ai_service_manager.create_chunk_packer(provider, prompt_template)
+            requests = packer.pack(chunks)
+        else:
+            packer = None
+            requests = [PackedRequest([i], chunk) for i, chunk in enumerate(chunks)]
+
+        print(f"Parça analizi başlatılıyor: {total} parça, {len(requests)} istek, "
+              f"eşzamanlı limit={limit} ({provider})")
+
+        async def analyze(text: str, prompt: str) -> str:
+            async with semaphore:
+                return await self.ai_service_manager.analyze_text(
+                    text, provider, prompt, use_cache=use_cache, analysis_type=analysis_type, stage=stage
+                )
+
+        def complete(index: int, result: str):
+            nonlocal completed
+            results[index] = result
+            completed += 1
+            if progress_callback:
+                progress_callback(completed, total)
+
+        async def run_request(request: PackedRequest):
+            if not request.is_packed:
+                complete(request.indices[0], await analyze(request.text, prompt_template))
+                return
+
+            response = await analyze(request.text, packer.build_prompt(prompt_template))
+            answers = packer.unpack(response, request)
+            for index in request.indices:
+                if index in answers:
+                    complete(index, answers[index])
+
+            # Yanıtı ayrıştırılamayan parçalar tek tek gönderilir
+            missing = [index for index in request.indices if index not in answers]
+            if missing:
+                print(f"Birleşik yanıtta {len(missing)} parça eksik, ayrı ayrı analiz ediliyor")
+                missing_results = await asyncio.gather(
+                    *(analyze(chunks[index], prompt_template) for index in missing)
+                )
+                for index, result in zip(missing, missing_results):
+                    complete(index, result)
+
+        tasks = [asyncio.ensure_future(run_request(request)) for request in requests]
+        try:
+            await run_cancellable(asyncio.gather(*tasks), cancel_token)
+        except OperationCancelledError:
+            # Tamamlanan parçalar korunur, bekleyen ve süren istekler bırakılır
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            print(f"Parça analizi iptal edildi: {completed}/{total} parça tamamlandı")
+            raise OperationCancelledError(partial_results=results)
+        except Exception:
+            # Bir parça başarısız olursa bekleyen çağrıları iptal et
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        return results
@@ -0,0 +1,115 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from src.utils.tokenizer import Tokenizer
+
+
+@dataclass
+class PackedRequest:
+    """Several source units sent to the AI service as one request"""
+
+    indices: List[int] = field(default_factory=list)
+    text: str = ""
+    tokens: int = 0
+
+    @property
+    def is_packed(self) -> bool:
+        return len(self.indices) > 1
+
+
+class ChunkPacker:
+    """Combine small texts into one request and split the response back per source"""
+
+    UNIT_MARKER = "<<<PARÇA {id}>>>"
+    RESULT_MARKER = "<<<SONUÇ {id}>>>"
+    RESULT_PATTERN = re.compile(r"^[ \t#*]*<<<SONUÇ (\d+)>>>[ \t*]*$", re.MULTILINE)
+    END_MARKER = "<<<BİTTİ>>>"
+    END_PATTERN = re.compile(r"^[ \t#*]*<<<BİTTİ>>>[ \t*]*$", re.MULTILINE)
+
+    # Metin sayısından bağımsızdır; böylece her birleşik istekte prompt öneki aynı kalır
+    PACKED_INSTRUCTIONS = (
+        "Aşağıda birden fazla bağımsız metin var; her biri <<<PARÇA n>>> satırıyla başlıyor.\n"
+        "Talimatları her metne ayrı ayrı uygula ve metinleri birbirine karıştırma.\n"
+        "Her metnin yanıtını tek başına bir satırda <<<SONUÇ n>>> yazarak başlat "
+        "(n, metnin numarasıdır) ve yanıtları metin sırasıyla ver.\n"
+        "Tüm yanıtlar bittikten sonra son satıra yalnızca <<<BİTTİ>>> yaz.\n\n"
+    )
+
+    def __init__(self, tokenizer: Tokenizer, token_budget: int, max_units: int = 10):
+        self.tokenizer = tokenizer
+        # Tek istekte gönderilecek metinlerin toplam token bütçesi (prompt hariç)
+        self.token_budget = max(1, token_budget)
+        # Yanıt uzunluğu da sınırlı olduğu için bir istekteki metin sayısı sınırlanır
+        self.max_units = max(1, max_units)
+
+    def build_prompt(self, prompt_template: str) -> str:
+        """Prompt template with instructions for answering packed units"""
+        return self.PACKED_INSTRUCTIONS + prompt_template
+
+    def pack(self, units: List[str]) -> List[PackedRequest]:
+        """Greedily group consecutive units so each request stays within the budget"""
+        requests: List[PackedRequest] = []
+        current = PackedRequest()
+
+        for index, unit in enumerate(units):
+            unit_tokens = self.tokenizer.count(unit)
+
+            # Bütçenin yarısından büyük metinler birleştirmeden kazanç sağlamaz
+            if unit_tokens + self._marker_tokens(1) > self.token_budget // 2:
+                requests.append(PackedRequest([index], unit, unit_tokens))
+                continue
+
+            # İşaretçi, metnin istekte alacağı sıra numarasıyla hesaplanır
+            tokens = unit_tokens + self._marker_tokens(len(current.indices) + 1)
+            if current.indices and (current.tokens + tokens > self.token_budget
+                                    or len(current.indices) >= self.max_units):
+                requests.append(current)
+                current = PackedRequest()
+                tokens = unit_tokens + self._marker_tokens(1)
+
+            current.indices.append(index)
+            current.tokens += tokens
+
+        if current.indices:
+            requests.append(current)
+
+        for request in requests:
+            if request.is_packed:
+                request.text = "\n\n".join(
+                    f"{self.UNIT_MARKER.format(id=position + 1)}\n{units[index]}"
+                    for position, index in enumerate(request.indices)
+                )
+            elif not request.text:
+                request.text = units[request.indices[0]]
+
+        return requests
+
+    def _marker_tokens(self, position: int) -> int:
+        return self.tokenizer.count(self.UNIT_MARKER.format(id=position))
+
+    def unpack(self, response: str, request: PackedRequest) -> Dict[int, str]:
+        """Map the response back to source indices; units without an answer are left out.
+        Without the end marker the response was cut off, so its last section is left out too"""
+        if not request.is_packed:
+            return {request.indices[0]: response}
+
+        end_matches = list(self.END_PATTERN.finditer(response))
+        if end_matches:
+            response = response[:end_matches[-1].start()]
+        matches = list(self.RESULT_PATTERN.finditer(response))
+        # Çıktı token sınırında kesilen son yanıt eksik olabilir; o metin ayrıca gönderilir
+        complete_count = len(matches) if end_matches else len(matches) - 1
+        results: Dict[int, str] = {}
+
+        for i, match in enumerate(matches[:complete_count]):
+            position = int(match.group(1))
+            if not 1 <= position <= len(request.indices):
+                continue
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(response)
+            answer = response[match.end():end].strip()
+            index = request.indices[position - 1]
+            if answer and index not in results:
+                results[index] = answer
+
+        return results
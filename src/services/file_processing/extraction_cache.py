@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(__file__), "../../../data/cache/extracted_text.sqlite")
+
+
+class ExtractionCache:
+    """Disk-backed LRU cache for extracted text, keyed by file content"""
+
+    def __init__(self, db_path: str, max_size_mb: float = 500, max_age_days: float = 30,
+                 enabled: bool = True):
+        self.db_path = db_path
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.max_age_seconds = max_age_days * 24 * 60 * 60
+        self.enabled = enabled
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # (yol, boyut, mtime) -> içerik özeti; değişmemiş dosya her analizde yeniden okunmaz
+        self._hash_memo: Dict[Tuple[str, int, int], str] = {}
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS extractions (
+                key TEXT PRIMARY KEY,
+                processor TEXT NOT NULL,
+                data BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_extractions_last_access ON extractions(last_access)")
+        self._conn.commit()
+
+    @classmethod
+    def from_settings(cls, settings: dict, db_path: str = DEFAULT_DB_PATH) -> Optional["ExtractionCache"]:
+        """Cache configured by the "extraction_cache" settings section; None if it cannot be opened"""
+        try:
+            cache_settings = settings.get("extraction_cache", {})
+            return cls(
+                db_path,
+                max_size_mb=cache_settings.get("max_size_mb", 500),
+                max_age_days=cache_settings.get("max_age_days", 30),
+                enabled=cache_settings.get("enabled", True)
+            )
+        except Exception as e:
+            print(f"Çıkarma önbelleği başlatılamadı: {str(e)}")
+            return None
+
+    def hash_file(self, file_path: str, block_size: int = 1024 * 1024) -> str:
+        """SHA-256 of the file content, read in blocks"""
+        stat = os.stat(file_path)
+        memo_key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._hash_memo.get(memo_key)
+        if cached:
+            return cached
+
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            for block in iter(lambda: file.read(block_size), b""):
+                digest.update(block)
+        content_hash = digest.hexdigest()
+
+        with self._lock:
+            self._hash_memo[memo_key] = content_hash
+        return content_hash
+
+    @staticmethod
+    def make_key(content_hash: str, processor: str, version: int, options: Dict[str, Any]) -> str:
+        """Build cache key from content hash, processor name and version, and extraction options"""
+        options_json = json.dumps(options, sort_keys=True, default=str)
+        return hashlib.sha256(f"{content_hash}|{processor}|{version}|{options_json}".encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def normalize(value: Any) -> Any:
+        """Return value as it reads back from the cache: JSON types only, other objects as str"""
+        return json.loads(json.dumps(value, default=str))
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return cached extraction output or None"""
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, created_at FROM extractions WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or now - row[1] > self.max_age_seconds:
+                if row is not None:
+                    self._conn.execute("DELETE FROM extractions WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE extractions SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(zlib.decompress(row[0]).decode('utf-8'))
+
+    def set(self, key: str, processor: str, value: Any):
+        """Store JSON-serializable extraction output and evict old entries if needed"""
+        if not self.enabled:
+            return
+
+        # Çıkarılan metin iyi sıkışır; boyut sınırı sıkıştırılmış veriye uygulanır
+        data = zlib.compress(json.dumps(value, ensure_ascii=False, default=str).encode('utf-8'))
+        size = len(data)
+        if size > self.max_size_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO extractions VALUES (?, ?, ?, ?, ?, ?)",
+                (key, processor, data, size, now, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        """Drop expired entries, then least recently used ones until under size limit"""
+        self._conn.execute(
+            "DELETE FROM extractions WHERE created_at < ?", (now - self.max_age_seconds,)
+        )
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM extractions").fetchone()[0]
+        if total <= self.max_size_bytes:
+            return
+
+        rows = self._conn.execute("SELECT key, size FROM extractions ORDER BY last_access ASC").fetchall()
+        for key, size in rows:
+            if total <= self.max_size_bytes:
+                break
+            self._conn.execute("DELETE FROM extractions WHERE key = ?", (key,))
+            total -= size
+
+    def clear(self):
+        """Remove all cached extractions"""
+        with self._lock:
+            self._conn.execute("DELETE FROM extractions")
+            self._conn.commit()
+            self._hash_memo.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            count, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM extractions"
+            ).fetchone()
+
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": count,
+            "size_bytes": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+def get_extraction_key(cache: Optional[ExtractionCache], processor, file_path: str, **options) -> Optional[str]:
+    """Cache key for a file and processor, or None when the cache is off"""
+    if not (cache and cache.enabled):
+        return None
+    return ExtractionCache.make_key(
+        cache.hash_file(file_path),
+        type(processor).__name__,
+        processor.extraction_version,
+        {**processor.get_extraction_options(), **options}
+    )
+
+
+def extract_file(processor, file_path: str, cache: Optional[ExtractionCache] = None) -> Tuple[str, dict]:
+    """Extract text and metadata in one pass; unchanged files come from the cache"""
+    cache_key = get_extraction_key(cache, processor, file_path)
+    if cache_key:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            print(f"Çıkarma önbellekten alındı: {os.path.basename(file_path)}")
+            return cached["text"], cached["metadata"]
+
+    with open(file_path, 'rb') as file:
+        extracted_text, metadata = processor.extract(file)
+    # Önbellekten gelen sonuçla aynı tipler: tuple -> list, datetime -> str
+    metadata = ExtractionCache.normalize(metadata)
+
+    if cache_key and processor.is_cacheable(extracted_text):
+        cache.set(cache_key, type(processor).__name__, {"text": extracted_text, "metadata": metadata})
+    return extracted_text, metadata
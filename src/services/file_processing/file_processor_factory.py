@@ -1,5 +1,5 @@
 import os
-from typing import Dict, Type
+from typing import Dict, List, Type
 from .processors.base_processor import BaseFileProcessor
 from .processors.pdf_processor import PDFProcessor
 from .processors.docx_processor import DocxProcessor
@@ -36,6 +36,10 @@ class FileProcessorFactory:
             '.flac': AudioProcessor
         }
     
+    def get_supported_extensions(self) -> List[str]:
+        """Get file extensions that have a processor"""
+        return list(self._processors.keys())
+    
     def get_processor(self, file_path: str) -> BaseFileProcessor:
         """Get appropriate processor for file type"""
         ext = os.path.splitext(file_path)[1].lower()
@@ -1,52 +1,69 @@
-from typing import BinaryIO, Text, List
+from typing import BinaryIO, Text, List, Tuple
 from pydub import AudioSegment
 import speech_recognition as sr
 from io import BytesIO
 from .base_processor import BaseFileProcessor
+from src.core.exceptions import OperationCancelledError
 
 class AudioProcessor(BaseFileProcessor):
     def extract_text(self, file: BinaryIO) -> Text:
         try:
-            # Ses dosyasını geçici olarak kaydet
-            temp_file = BytesIO(file.read())
-            audio = AudioSegment.from_file(temp_file)
-            
-            # Ses tanıma için kullanılacak recognizer
-            recognizer = sr.Recognizer()
-            
-            # Ses dosyasını WAV formatına dönüştür
-            audio.export("temp.wav", format="wav")
-            
-            # Ses tanıma işlemi
-            with sr.AudioFile("temp.wav") as source:
-                audio_data = recognizer.record(source)
-                text = recognizer.recognize_google(audio_data)
-                
-            # Geçici dosyayı temizle
-            import os
-            if os.path.exists("temp.wav"):
-                os.remove("temp.wav")
-                
-            return text
+            return self._transcribe(self._decode(file))
+        except OperationCancelledError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to process audio: {str(e)}")
+    
+    def extract(self, file: BinaryIO) -> Tuple[Text, dict]:
+        """Transcript and audio properties from one decode"""
+        try:
+            audio = self._decode(file)
+            return self._transcribe(audio), self._describe(audio)
+        except OperationCancelledError:
+            raise
         except Exception as e:
             raise ValueError(f"Failed to process audio: {str(e)}")
     
+    def _decode(self, file: BinaryIO) -> AudioSegment:
+        # Ses dosyasını geçici olarak kaydet
+        temp_file = BytesIO(file.read())
+        return AudioSegment.from_file(temp_file)
+    
+    def _transcribe(self, audio: AudioSegment) -> Text:
+        # Ses tanıma için kullanılacak recognizer
+        recognizer = sr.Recognizer()
+        
+        # Ses dosyasını bellekte WAV formatına dönüştür; aynı anda işlenen dosyalar
+        # ortak bir geçici dosyayı paylaşmaz
+        wav_file = BytesIO()
+        audio.export(wav_file, format="wav")
+        wav_file.seek(0)
+        # Tanıma bir ağ isteği; iptal edildiyse gönderilmez
+        self.check_cancelled()
+        
+        # Ses tanıma işlemi
+        with sr.AudioFile(wav_file) as source:
+            audio_data = recognizer.record(source)
+            text = recognizer.recognize_google(audio_data)
+            
+        return text
+    
     def get_metadata(self, file: BinaryIO) -> dict:
         try:
             file.seek(0)
-            temp_file = BytesIO(file.read())
-            audio = AudioSegment.from_file(temp_file)
-            
-            return {
-                'channels': audio.channels,
-                'sample_width': audio.sample_width,
-                'frame_rate': audio.frame_rate,
-                'duration_seconds': len(audio) / 1000
-            }
+            return self._describe(self._decode(file))
         except Exception as e:
             return {
                 'error': str(e)
             }
+    
+    def _describe(self, audio: AudioSegment) -> dict:
+        return {
+            'channels': audio.channels,
+            'sample_width': audio.sample_width,
+            'frame_rate': audio.frame_rate,
+            'duration_seconds': len(audio) / 1000
+        }
         
     def split_file(self, file_path: str, chunk_size: int, method: str = "token") -> List[str]:
         """
@@ -57,5 +74,7 @@ class AudioProcessor(BaseFileProcessor):
             with open(file_path, 'rb') as file:
                 extracted_text = self.extract_text(file)
                 return [extracted_text]  # Tek bir parça olarak döndür
+        except OperationCancelledError:
+            raise
         except Exception as e:
             raise ValueError(f"Ses dosyası bölünürken hata: {str(e)}")
\ No newline at end of file
@@ -1,9 +1,36 @@
 # src/services/file_processing/processors/base_processor.py
 
+import re
 from abc import ABC, abstractmethod
-from typing import BinaryIO, Text, List
+from dataclasses import dataclass
+from typing import BinaryIO, Text, List, Optional, Iterator, Iterable, Callable, Tuple
+
+from src.core.cancellation import CancellationToken
+from src.core.exceptions import OperationCancelledError
+from src.utils.tokenizer import Tokenizer, get_tokenizer
+
+@dataclass
+class TextSegment:
+    """A piece of extracted text and its place in the source file"""
+
+    text: str
+    # "document", "page", "paragraph", "chapter", "rows", "lines" veya "element"
+    kind: str
+    index: int
+    # Kaynaktaki 1 tabanlı konum aralığı: sayfa, paragraf, satır ya da bölüm numarası
+    start: Optional[int] = None
+    end: Optional[int] = None
 
 class BaseFileProcessor(ABC):
+    # Parçalamada kullanılacak tokenizer; hedef sağlayıcıya göre set_tokenizer ile değiştirilir
+    tokenizer: Optional[Tokenizer] = None
+    # Kullanıcı iptali; çıkarma ve bölme döngüleri check_cancelled ile bu token'ı yoklar
+    cancel_token: Optional[CancellationToken] = None
+    # Çıkarma çıktısını değiştiren her düzeltmede artırılır; çıkarma önbelleğindeki eski kayıtlar kullanılmaz
+    extraction_version = 1
+    # Varsayılan split_file hata durumunda bu önekle başlayan tek parça döndürür
+    SPLIT_ERROR_PREFIX = "Error extracting text: "
+
     @abstractmethod
     def extract_text(self, file: BinaryIO) -> Text:
         """Extract text from file"""
@@ -14,18 +41,149 @@ class BaseFileProcessor(ABC):
         """Get file metadata"""
         pass
     
+    def extract(self, file: BinaryIO) -> Tuple[Text, dict]:
+        """
+        Extract text and metadata together.
+
+        Processors override this to parse the file once and read both from the same
+        parsed document. The default runs extract_text and get_metadata separately.
+        """
+        text = self.extract_text(file)
+        file.seek(0)
+        return text, self.get_metadata(file)
+    
+    def iter_text(self, file: BinaryIO) -> Iterator[TextSegment]:
+        """
+        Yield the file's text as ordered segments, each ending with its separator.
+
+        Processors yield pages, paragraphs, chapters or row batches so a document can be
+        chunked without holding all of it in memory. The default yields the whole text once.
+        """
+        yield TextSegment(self.extract_text(file), "document", 0)
+    
+    def iter_lines(self, file: BinaryIO) -> Iterator[str]:
+        """Lines of all segments in order, line endings kept"""
+        for segment in self.iter_text(file):
+            yield from segment.text.splitlines(keepends=True)
+    
     def split_file(self, file_path: str, chunk_size: int, method: str = "token") -> List[str]:
         """Split file into chunks - DEFAULT IMPLEMENTATION"""
         try:
-            # Just extract text and return it as a single chunk
+            # Token bazlı bölmede parçalar segment satırlarından akışla kurulur, sayfa bazlıda tek parça döner
+            self.check_cancelled()
             with open(file_path, 'rb') as file:
-                extracted_text = self.extract_text(file)
-                return [extracted_text]
+                if method == "token":
+                    self._validate_chunk_size(chunk_size)
+                    return self.build_chunks(self.iter_lines(file), chunk_size) or [""]
+                return [self.extract_text(file)]
+        except OperationCancelledError:
+            raise
         except Exception as e:
             print(f"File splitting error in default implementation: {str(e)}")
-            return ["Error extracting text: " + str(e)]
+            return [self.SPLIT_ERROR_PREFIX + str(e)]
+
+    def get_extraction_options(self) -> dict:
+        """Settings that change the extracted text; part of the extraction cache key"""
+        return {}
+
+    def is_cacheable(self, text: str) -> bool:
+        """Whether extracted text may be stored in the extraction cache"""
+        return not text.startswith(self.SPLIT_ERROR_PREFIX)
+
+    def _validate_chunk_size(self, chunk_size: int, max_size: Optional[int] = None):
+        """Raise ValueError for a chunk size below 1 or above max_size"""
+        if chunk_size < 1:
+            raise ValueError(f"Parça boyutu en az 1 olmalı: {chunk_size}")
+        if max_size is not None and chunk_size > max_size:
+            raise ValueError(f"Parça boyutu en fazla {max_size} olabilir: {chunk_size}")
+
+    def set_tokenizer(self, tokenizer: Tokenizer):
+        """Use the tokenizer of the target provider/model"""
+        self.tokenizer = tokenizer
+
+    def set_cancel_token(self, cancel_token: Optional[CancellationToken]):
+        """Stop extraction and splitting when this token is cancelled"""
+        self.cancel_token = cancel_token
+
+    def check_cancelled(self):
+        """Raise OperationCancelledError if the current job was cancelled"""
+        if self.cancel_token is not None:
+            self.cancel_token.raise_if_cancelled()
+
+    def get_tokenizer(self) -> Tokenizer:
+        if self.tokenizer is None:
+            self.tokenizer = get_tokenizer()
+        return self.tokenizer
 
     def estimate_tokens(self, text: str) -> int:
-        """Estimate number of tokens in text (rough estimation)"""
-        # Basit bir tahmin: ortalama 4 karaktere 1 token
-        return len(text) // 4
\ No newline at end of file
+        """Estimate number of tokens in text"""
+        return self.get_tokenizer().count(text)
+
+    def split_text(self, text: str, chunk_size: int) -> List[str]:
+        """Split already extracted text into chunks of at most chunk_size tokens"""
+        return self.build_chunks(text.splitlines(keepends=True), chunk_size)
+
+    def build_chunks(self, units: Iterable[str], limit: int,
+                     measure: Optional[Callable[[str], int]] = None) -> List[str]:
+        """Collect iter_chunks into a list"""
+        return list(self.iter_chunks(units, limit, measure))
+
+    def iter_chunks(self, units: Iterable[str], limit: int,
+                    measure: Optional[Callable[[str], int]] = None) -> Iterator[str]:
+        """
+        Pack a stream of text units into chunks in a single pass.
+
+        Every unit is measured once and the chunk is built as a list of parts, so splitting
+        is linear in the input size and only the current chunk is held in memory.
+
+        Args:
+            units (Iterable[str]): Text units in document order, separators included
+            limit (int): Maximum chunk size, in tokens or in ``measure`` units
+            measure (Callable): Size of a unit; defaults to its token count. With the
+                default, a unit larger than ``limit`` is broken into lines, words and
+                characters; with a custom measure it becomes a chunk of its own
+
+        Yields:
+            str: Chunks in document order; whitespace-only chunks are skipped
+        """
+        limit = max(1, limit)
+        parts: List[str] = []
+        total = 0
+        for unit in units:
+            self.check_cancelled()
+            size = measure(unit) if measure else self.estimate_tokens(unit)
+            if measure is None and size > limit:
+                pieces = self._split_unit(unit, limit)
+            else:
+                pieces = [(unit, size)]
+            
+            for piece, piece_size in pieces:
+                if parts and total + piece_size > limit:
+                    chunk = "".join(parts)
+                    if chunk.strip():
+                        yield chunk
+                    parts, total = [], 0
+                parts.append(piece)
+                total += piece_size
+        
+        chunk = "".join(parts)
+        if chunk.strip():
+            yield chunk
+
+    def _split_unit(self, unit: str, limit: int) -> Iterator[Tuple[str, int]]:
+        """Pieces of an oversized unit with their token counts: lines, then words, then characters"""
+        for line in unit.splitlines(keepends=True):
+            tokens = self.estimate_tokens(line)
+            if tokens <= limit:
+                yield line, tokens
+                continue
+            for word in re.findall(r"\S+\s*|\s+", line):
+                tokens = self.estimate_tokens(word)
+                if tokens <= limit:
+                    yield word, tokens
+                    continue
+                # Tek kelime sınırı aşıyorsa karakter dilimlerine bölünür
+                step = max(1, len(word) * limit // tokens)
+                for start in range(0, len(word), step):
+                    piece = word[start:start + step]
+                    yield piece, self.estimate_tokens(piece)
@@ -1,76 +1,112 @@
-from typing import BinaryIO, Text, List
+from typing import BinaryIO, Text, List, Iterator, Tuple
 import pandas as pd
 import io
-from .base_processor import BaseFileProcessor
+from .base_processor import BaseFileProcessor, TextSegment
+from src.core.exceptions import OperationCancelledError
 
 class CSVProcessor(BaseFileProcessor):
+    # iter_text her segmentte bu kadar satır döndürür
+    rows_per_segment = 500
+    # 3: extract_text yeniden özet döndürür; 2 sürümü tablonun tamamını önbelleğe yazmıştı
+    extraction_version = 3
+
     def extract_text(self, file: BinaryIO) -> Text:
+        return self._summarize(self._read(file))
+    
+    def extract(self, file: BinaryIO) -> Tuple[Text, dict]:
+        """Summary text and metadata from a single read of the table"""
+        df = self._read(file)
+        metadata = self._empty_metadata()
+        self._update_metadata(metadata, df)
+        return self._summarize(df), metadata
+    
+    def _read(self, file: BinaryIO) -> pd.DataFrame:
         try:
             content = file.read()
             file_like = io.BytesIO(content)
             df = pd.read_csv(file_like)
-            
-            # Veriyi okunabilir bir metne dönüştür
-            text = f"CSV dosyası içeriği:\n\n"
-            text += f"Sütunlar: {', '.join(df.columns)}\n\n"
-            text += f"Satır sayısı: {len(df)}\n\n"
-            text += f"Örnek veriler (ilk 5 satır):\n{df.head().to_string()}\n\n"
-            text += f"İstatistikler:\n{df.describe().to_string()}"
-            
-            return text
+            self.check_cancelled()
+            return df
+        except OperationCancelledError:
+            raise
+        except Exception as e:
+            raise ValueError(f"CSV işleme hatası: {str(e)}")
+    
+    def _summarize(self, df: pd.DataFrame) -> Text:
+        # Veriyi okunabilir bir metne dönüştür
+        text = f"CSV dosyası içeriği:\n\n"
+        text += f"Sütunlar: {', '.join(df.columns)}\n\n"
+        text += f"Satır sayısı: {len(df)}\n\n"
+        text += f"Örnek veriler (ilk 5 satır):\n{df.head().to_string()}\n\n"
+        text += f"İstatistikler:\n{df.describe().to_string()}"
+        return text
+    
+    def iter_text(self, file: BinaryIO) -> Iterator[TextSegment]:
+        """Yield the table in row batches read incrementally; start and end are 1-based row numbers.
+        Unlike extract_text, which returns a summary, this streams the full content"""
+        start = 1
+        for index, chunk_df in enumerate(self._iter_frames(file, self.rows_per_segment)):
+            end = start + len(chunk_df) - 1
+            yield TextSegment(chunk_df.to_string() + "\n\n", "rows", index, start, end)
+            start = end + 1
+    
+    def _iter_frames(self, file: BinaryIO, rows: int) -> Iterator[pd.DataFrame]:
+        """Read the table in DataFrames of at most rows rows"""
+        try:
+            for chunk_df in pd.read_csv(file, chunksize=rows):
+                self.check_cancelled()
+                yield chunk_df
+        except OperationCancelledError:
+            raise
         except Exception as e:
             raise ValueError(f"CSV işleme hatası: {str(e)}")
     
     def get_metadata(self, file: BinaryIO) -> dict:
         file.seek(0)
-        content = file.read()
-        file_like = io.BytesIO(content)
-        df = pd.read_csv(file_like)
-        
+        metadata = self._empty_metadata()
+        for chunk_df in self._iter_frames(file, self.rows_per_segment):
+            self._update_metadata(metadata, chunk_df)
+        return metadata
+    
+    def _empty_metadata(self) -> dict:
         return {
-            'columns': list(df.columns),
-            'rows': len(df),
-            'memory_usage': df.memory_usage(deep=True).sum()
+            'columns': [],
+            'rows': 0,
+            'memory_usage': 0
         }
-        
+    
+    def _update_metadata(self, metadata: dict, chunk_df: pd.DataFrame):
+        metadata['columns'] = list(chunk_df.columns)
+        metadata['rows'] += len(chunk_df)
+        metadata['memory_usage'] += int(chunk_df.memory_usage(deep=True).sum())
+    
     def split_file(self, file_path: str, chunk_size: int, method: str = "token") -> List[str]:
         """
         Split CSV file into chunks
         """
         try:
-            df = pd.read_csv(file_path)
+            self._validate_chunk_size(chunk_size)
             
-            if method == "page":
-                # "Sayfa" kavramını satır sayısı olarak düşünüyoruz
-                rows_per_chunk = chunk_size * 50  # Örnek olarak bir sayfada 50 satır kabul edelim
-                
-                chunks = []
-                for i in range(0, len(df), rows_per_chunk):
-                    end_idx = min(i + rows_per_chunk, len(df))
-                    chunk_df = df.iloc[i:end_idx]
-                    chunk_text = f"CSV kesiti (satır {i+1}-{end_idx}):\n\n"
-                    chunk_text += chunk_df.to_string()
-                    chunks.append(chunk_text)
-                
-                return chunks if chunks else [df.to_string()]
-            else:
-                # Token-based splitting - tüm içeriği bir metin olarak alıp token'lara böleriz
-                csv_text = df.to_string()
-                
-                chunks = []
-                current_chunk = ""
-                lines = csv_text.split('\n')
-                
-                for line in lines:
-                    current_chunk += line + '\n'
+            # Tablo satır grupları halinde okunur; bellekte sadece geçerli grup ve kurulan parça tutulur
+            with open(file_path, 'rb') as file:
+                if method == "page":
+                    # "Sayfa" kavramını satır sayısı olarak düşünüyoruz
+                    rows_per_chunk = chunk_size * 50  # Örnek olarak bir sayfada 50 satır kabul edelim
                     
-                    if self.estimate_tokens(current_chunk) >= chunk_size:
-                        chunks.append(current_chunk)
-                        current_chunk = ""
-                
-                if current_chunk:
-                    chunks.append(current_chunk)
-                
-                return chunks if chunks else [csv_text]
+                    chunks = []
+                    start = 1
+                    for chunk_df in self._iter_frames(file, rows_per_chunk):
+                        end = start + len(chunk_df) - 1
+                        chunk_text = f"CSV kesiti (satır {start}-{end}):\n\n"
+                        chunk_text += chunk_df.to_string()
+                        chunks.append(chunk_text)
+                        start = end + 1
+                else:
+                    # Token-based splitting - satır grupları satır satır token limitine göre paketlenir
+                    chunks = self.build_chunks(self.iter_lines(file), chunk_size)
+            
+            return chunks or [""]
+        except OperationCancelledError:
+            raise
         except Exception as e:
-            raise ValueError(f"CSV dosyası bölünürken hata: {str(e)}")
\ No newline at end of file
+            raise ValueError(f"CSV dosyası bölünürken hata: {str(e)}")
@@ -1,14 +1,41 @@
 from docx import Document
-from typing import BinaryIO, Text, List
+from typing import BinaryIO, Text, List, Iterator, Tuple
 import logging
-from .base_processor import BaseFileProcessor
+from .base_processor import BaseFileProcessor, TextSegment
+from src.core.exceptions import OperationCancelledError
 
 class DocxProcessor(BaseFileProcessor):
     def extract_text(self, file: BinaryIO) -> Text:
         """Extract text from DOCX file"""
+        return "".join(segment.text for segment in self.iter_text(file)).removesuffix("\n\n")
+
+    def extract(self, file: BinaryIO) -> Tuple[Text, dict]:
+        """Extract text and metadata from one parse of the document"""
         try:
             doc = Document(file)
-            return "\n\n".join(paragraph.text for paragraph in doc.paragraphs if paragraph.text.strip())
+        except Exception as e:
+            raise ValueError(f"Failed to extract text from DOCX: {str(e)}")
+        text = "".join(segment.text for segment in self._iter_paragraphs(doc)).removesuffix("\n\n")
+        return text, self._describe(doc)
+
+    def iter_text(self, file: BinaryIO) -> Iterator[TextSegment]:
+        """Yield each non-empty paragraph; start is the paragraph number in the document"""
+        try:
+            doc = Document(file)
+        except Exception as e:
+            raise ValueError(f"Failed to extract text from DOCX: {str(e)}")
+        yield from self._iter_paragraphs(doc)
+
+    def _iter_paragraphs(self, doc) -> Iterator[TextSegment]:
+        try:
+            index = 0
+            for para_num, paragraph in enumerate(doc.paragraphs, 1):
+                self.check_cancelled()
+                if paragraph.text.strip():
+                    yield TextSegment(paragraph.text + "\n\n", "paragraph", index, para_num, para_num)
+                    index += 1
+        except OperationCancelledError:
+            raise
         except Exception as e:
             raise ValueError(f"Failed to extract text from DOCX: {str(e)}")
 
@@ -16,6 +43,13 @@ class DocxProcessor(BaseFileProcessor):
         """Get DOCX metadata"""
         try:
             doc = Document(file)
+        except Exception as e:
+            logging.error(f"Error getting DOCX metadata: {str(e)}")
+            return {'paragraph_count': 0, 'word_count': 0}
+        return self._describe(doc)
+
+    def _describe(self, doc) -> dict:
+        try:
             core_props = doc.core_properties
             return {
                 'author': core_props.author or 'Unknown',
@@ -28,50 +62,27 @@ class DocxProcessor(BaseFileProcessor):
             logging.error(f"Error getting DOCX metadata: {str(e)}")
             return {'paragraph_count': 0, 'word_count': 0}
 
-    def _do_split_file(self, file_path: str, chunk_size: int, method: str) -> List[str]:
+    def split_file(self, file_path: str, chunk_size: int, method: str = "token") -> List[str]:
         """Split DOCX file into chunks"""
         try:
             self._validate_chunk_size(chunk_size)
-            doc = Document(file_path)
-            chunks = []
-            current_chunk = ""
             
-            if method == "page":
-                # Approximate page size (500 words per page)
-                words_per_page = 500
-                current_words = 0
+            with open(file_path, 'rb') as file:
+                paragraphs = (segment.text for segment in self.iter_text(file))
                 
-                for para in doc.paragraphs:
-                    text = para.text.strip()
-                    if not text:
-                        continue
-                    
-                    word_count = len(text.split())
-                    current_words += word_count
-                    current_chunk += text + "\n\n"
-                    
-                    if current_words >= words_per_page * chunk_size:
-                        chunks.append(current_chunk.strip())
-                        current_chunk = ""
-                        current_words = 0
-            
-            else:  # token based
-                for para in doc.paragraphs:
-                    text = para.text.strip()
-                    if not text:
-                        continue
-                    
-                    current_chunk += text + "\n\n"
-                    if self.estimate_tokens(current_chunk) >= chunk_size:
-                        chunks.append(current_chunk.strip())
-                        current_chunk = ""
-            
-            # Add remaining content if any
-            if current_chunk.strip():
-                chunks.append(current_chunk.strip())
+                if method == "page":
+                    # Approximate page size (500 words per page)
+                    words_per_page = 500
+                    chunks = self.build_chunks(
+                        paragraphs, words_per_page * chunk_size, measure=lambda text: len(text.split())
+                    )
+                else:  # token based
+                    chunks = self.build_chunks(paragraphs, chunk_size)
             
-            return chunks
+            return [chunk.strip() for chunk in chunks]
 
+        except OperationCancelledError:
+            raise
         except Exception as e:
             logging.error(f"Error splitting DOCX file {file_path}: {str(e)}")
-            raise
\ No newline at end of file
+            raise
@@ -1,66 +1,78 @@
-from typing import BinaryIO, Text, List
+from typing import BinaryIO, Text, List, Iterator, Tuple
 import ebooklib
 from ebooklib import epub
 from bs4 import BeautifulSoup
-from .base_processor import BaseFileProcessor
+from .base_processor import BaseFileProcessor, TextSegment
+from src.core.exceptions import OperationCancelledError
 
 class EPUBProcessor(BaseFileProcessor):
     def extract_text(self, file: BinaryIO) -> Text:
         try:
-            # Geçici dosya oluştur (ebooklib dosya nesnesi değil yol bekliyor)
-            import tempfile
-            import os
-            
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.epub') as temp:
-                temp.write(file.read())
-                temp_path = temp.name
-            
-            # EPUB dosyasını işle
-            book = epub.read_epub(temp_path)
-            
-            # Geçici dosyayı sil
-            os.unlink(temp_path)
-            
             # İçerik metinlerini topla
-            contents = []
-            for item in book.get_items():
-                if item.get_type() == ebooklib.ITEM_DOCUMENT:
-                    soup = BeautifulSoup(item.get_content(), 'html.parser')
-                    contents.append(soup.get_text())
-            
-            return "\n\n".join(contents)
+            return "\n\n".join(self._iter_chapter_texts(self._read_book(file)))
+        except OperationCancelledError:
+            raise
         except Exception as e:
             raise ValueError(f"EPUB işleme hatası: {str(e)}")
     
-    def get_metadata(self, file: BinaryIO) -> dict:
+    def extract(self, file: BinaryIO) -> Tuple[Text, dict]:
+        """Chapter text and book metadata from one read of the book"""
         try:
-            # Geçici dosya oluştur
-            import tempfile
-            import os
-            
-            file.seek(0)
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.epub') as temp:
-                temp.write(file.read())
-                temp_path = temp.name
-            
-            # EPUB dosyasını işle
-            book = epub.read_epub(temp_path)
-            
+            book = self._read_book(file)
+            return "\n\n".join(self._iter_chapter_texts(book)), self._describe(book)
+        except OperationCancelledError:
+            raise
+        except Exception as e:
+            raise ValueError(f"EPUB işleme hatası: {str(e)}")
+    
+    def iter_text(self, file: BinaryIO) -> Iterator[TextSegment]:
+        """Yield each chapter; start is the 1-based chapter number"""
+        try:
+            book = self._read_book(file)
+            for index, chapter_text in enumerate(self._iter_chapter_texts(book)):
+                yield TextSegment(chapter_text + "\n\n", "chapter", index, index + 1, index + 1)
+        except OperationCancelledError:
+            raise
+        except Exception as e:
+            raise ValueError(f"EPUB işleme hatası: {str(e)}")
+    
+    def _read_book(self, file: BinaryIO):
+        """Parse the book; ebooklib expects a path, so the content goes through a temporary file"""
+        import tempfile
+        import os
+        
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.epub') as temp:
+            temp.write(file.read())
+            temp_path = temp.name
+        try:
+            return epub.read_epub(temp_path)
+        finally:
             # Geçici dosyayı sil
             os.unlink(temp_path)
-            
-            # Metadata
-            metadata = {
-                'title': book.get_metadata('DC', 'title'),
-                'creator': book.get_metadata('DC', 'creator'),
-                'language': book.get_metadata('DC', 'language'),
-                'identifier': book.get_metadata('DC', 'identifier'),
-                'document_count': len([item for item in book.get_items() if item.get_type() == ebooklib.ITEM_DOCUMENT])
-            }
-            
-            return metadata
+    
+    def _iter_chapter_texts(self, book) -> Iterator[str]:
+        """Text of each document item in reading order"""
+        for item in book.get_items():
+            self.check_cancelled()
+            if item.get_type() == ebooklib.ITEM_DOCUMENT:
+                soup = BeautifulSoup(item.get_content(), 'html.parser')
+                yield soup.get_text()
+
+    def get_metadata(self, file: BinaryIO) -> dict:
+        try:
+            file.seek(0)
+            return self._describe(self._read_book(file))
         except Exception as e:
             raise ValueError(f"EPUB metadata hatası: {str(e)}")
+    
+    def _describe(self, book) -> dict:
+        return {
+            'title': book.get_metadata('DC', 'title'),
+            'creator': book.get_metadata('DC', 'creator'),
+            'language': book.get_metadata('DC', 'language'),
+            'identifier': book.get_metadata('DC', 'identifier'),
+            'document_count': len([item for item in book.get_items() if item.get_type() == ebooklib.ITEM_DOCUMENT])
+        }
             
     def split_file(self, file_path: str, chunk_size: int, method: str = "token") -> List[str]:
         """
@@ -75,6 +87,7 @@ class EPUBProcessor(BaseFileProcessor):
             chapters = []
             
             for item in book.get_items():
+                self.check_cancelled()
                 if item.get_type() == ebooklib.ITEM_DOCUMENT:
                     soup = BeautifulSoup(item.get_content(), 'html.parser')
                     chapter_text = soup.get_text()
@@ -83,30 +96,17 @@ class EPUBProcessor(BaseFileProcessor):
             
             if method == "token":
                 # Her bölümü token limitine göre parçala
-                chunks = []
-                current_chunk = ""
-                
-                for chapter in chapters:
-                    lines = chapter.split('\n')
-                    
-                    for line in lines:
-                        if not line.strip():
-                            continue
-                            
-                        if self.estimate_tokens(current_chunk + line) > chunk_size and current_chunk:
-                            chunks.append(current_chunk)
-                            current_chunk = line + "\n"
-                        else:
-                            current_chunk += line + "\n"
-                
-                # Son chunk'ı ekle
-                if current_chunk:
-                    chunks.append(current_chunk)
+                segments = (
+                    line + "\n" for chapter in chapters for line in chapter.split('\n') if line.strip()
+                )
+                chunks = self.build_chunks(segments, chunk_size)
                 
                 return chunks if chunks else ["".join(chapters)]
             else:
                 # Sayfa bazlı bölme - her bölümü ayrı bir sayfa olarak düşün
                 return chapters if chapters else ["".join(chapters)]
                 
+        except OperationCancelledError:
+            raise
         except Exception as e:
             raise ValueError(f"EPUB dosyası bölünürken hata: {str(e)}")
\ No newline at end of file
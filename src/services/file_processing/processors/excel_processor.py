@@ -1,17 +1,51 @@
-from typing import BinaryIO, Text
+from typing import BinaryIO, Text, Iterator, Tuple
 import pandas as pd
-from .base_processor import BaseFileProcessor
+from .base_processor import BaseFileProcessor, TextSegment
+from src.core.exceptions import OperationCancelledError
 
 class ExcelProcessor(BaseFileProcessor):
+    # iter_text her segmentte bu kadar satır döndürür
+    rows_per_segment = 500
+
     def extract_text(self, file: BinaryIO) -> Text:
         try:
             df = pd.read_excel(file)
+            self.check_cancelled()
             return df.to_string()
+        except OperationCancelledError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to process Excel: {str(e)}")
+    
+    def extract(self, file: BinaryIO) -> Tuple[Text, dict]:
+        """First sheet as text plus sheet metadata, from one open workbook"""
+        try:
+            xls = pd.ExcelFile(file)
+            df = xls.parse(0)
+            self.check_cancelled()
+            return df.to_string(), self._describe(xls)
+        except OperationCancelledError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to process Excel: {str(e)}")
+    
+    def iter_text(self, file: BinaryIO) -> Iterator[TextSegment]:
+        """Yield the first sheet in row batches; start and end are 1-based row numbers"""
+        try:
+            df = pd.read_excel(file)
+            for index, start in enumerate(range(0, len(df), self.rows_per_segment)):
+                self.check_cancelled()
+                end = min(start + self.rows_per_segment, len(df))
+                yield TextSegment(df.iloc[start:end].to_string() + "\n\n", "rows", index, start + 1, end)
+        except OperationCancelledError:
+            raise
         except Exception as e:
             raise ValueError(f"Failed to process Excel: {str(e)}")
     
     def get_metadata(self, file: BinaryIO) -> dict:
-        xls = pd.ExcelFile(file)
+        return self._describe(pd.ExcelFile(file))
+    
+    def _describe(self, xls: pd.ExcelFile) -> dict:
         sheet_names = xls.sheet_names
         
         metadata = {
@@ -19,4 +53,4 @@ class ExcelProcessor(BaseFileProcessor):
             'sheet_count': len(sheet_names)
         }
         
-        return metadata
\ No newline at end of file
+        return metadata
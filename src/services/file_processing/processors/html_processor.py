@@ -1,34 +1,66 @@
-from typing import BinaryIO, Text, List
+from typing import BinaryIO, Text, List, Iterator, Tuple
 from bs4 import BeautifulSoup
-from .base_processor import BaseFileProcessor
+from .base_processor import BaseFileProcessor, TextSegment
+from src.core.exceptions import OperationCancelledError
 
 class HTMLProcessor(BaseFileProcessor):
+    # iter_text her segmentte bu kadar satır döndürür
+    lines_per_segment = 200
+
     def extract_text(self, file: BinaryIO) -> Text:
         try:
-            content = file.read().decode('utf-8')
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            # Script ve style etiketlerini kaldır
-            for script in soup(["script", "style"]):
-                script.extract()
-            
-            # Metin içeriğini al
-            text = soup.get_text(separator='\n')
-            
-            # Gereksiz boşlukları temizle
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = '\n'.join(chunk for chunk in chunks if chunk)
-            
-            return text
+            soup = self._parse(file)
+            self.check_cancelled()
+            return self._clean_text(soup)
+        except OperationCancelledError:
+            raise
         except Exception as e:
             raise ValueError(f"HTML işleme hatası: {str(e)}")
     
-    def get_metadata(self, file: BinaryIO) -> dict:
-        file.seek(0)
+    def extract(self, file: BinaryIO) -> Tuple[Text, dict]:
+        """Cleaned text and page metadata from one parse"""
+        try:
+            soup = self._parse(file)
+            self.check_cancelled()
+            # Metadata, temizlik script/style etiketlerini silmeden önce toplanır
+            metadata = self._describe(soup)
+            return self._clean_text(soup), metadata
+        except OperationCancelledError:
+            raise
+        except Exception as e:
+            raise ValueError(f"HTML işleme hatası: {str(e)}")
+    
+    def _parse(self, file: BinaryIO) -> BeautifulSoup:
         content = file.read().decode('utf-8')
-        soup = BeautifulSoup(content, 'html.parser')
+        return BeautifulSoup(content, 'html.parser')
+    
+    def _clean_text(self, soup: BeautifulSoup) -> Text:
+        """Visible text with scripts, styles and redundant whitespace removed; modifies soup"""
+        # Script ve style etiketlerini kaldır
+        for script in soup(["script", "style"]):
+            script.extract()
         
+        # Metin içeriğini al
+        text = soup.get_text(separator='\n')
+        
+        # Gereksiz boşlukları temizle
+        lines = (line.strip() for line in text.splitlines())
+        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+        return '\n'.join(chunk for chunk in chunks if chunk)
+    
+    def iter_text(self, file: BinaryIO) -> Iterator[TextSegment]:
+        """Yield the cleaned text in batches of lines; the page is parsed as a whole"""
+        lines = self.extract_text(file).split('\n')
+        for index, start in enumerate(range(0, len(lines), self.lines_per_segment)):
+            self.check_cancelled()
+            end = min(start + self.lines_per_segment, len(lines))
+            yield TextSegment("\n".join(lines[start:end]) + "\n", "lines", index, start + 1, end)
+    
+    def get_metadata(self, file: BinaryIO) -> dict:
+        file.seek(0)
+        return self._describe(self._parse(file))
+    
+    def _describe(self, soup: BeautifulSoup) -> dict:
         # Metatag'leri topla
         meta_tags = {}
         for tag in soup.find_all('meta'):
@@ -58,31 +90,19 @@ class HTMLProcessor(BaseFileProcessor):
                 
                 if method == "token":
                     # HTML belgesini paragraf, başlık vb. öğelere göre böl
-                    chunks = []
-                    current_chunk = ""
-                    
                     # Anlamlı bölümler: p, div, h1-h6, article, section, ...
                     elements = soup.find_all(['p', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 
                                             'article', 'section', 'li', 'blockquote'])
                     
-                    for elem in elements:
-                        elem_text = elem.get_text(strip=True)
-                        if not elem_text:
-                            continue
-                            
-                        if self.estimate_tokens(current_chunk + elem_text) > chunk_size and current_chunk:
-                            chunks.append(current_chunk)
-                            current_chunk = elem_text + "\n\n"
-                        else:
-                            current_chunk += elem_text + "\n\n"
-                    
-                    # Son chunk'ı ekle
-                    if current_chunk:
-                        chunks.append(current_chunk)
+                    texts = (elem.get_text(strip=True) for elem in elements)
+                    segments = (text + "\n\n" for text in texts if text)
+                    chunks = self.build_chunks(segments, chunk_size)
                     
                     return chunks if chunks else [soup.get_text()]
                 else:
                     # Sayfa bazlı bölme - tek sayfa olarak düşün
                     return [soup.get_text()]
+        except OperationCancelledError:
+            raise
         except Exception as e:
             raise ValueError(f"HTML dosyası bölünürken hata: {str(e)}")
\ No newline at end of file
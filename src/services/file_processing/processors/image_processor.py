@@ -1,11 +1,15 @@
-from typing import BinaryIO, Text, List
+from typing import BinaryIO, Text, List, Tuple
 import pytesseract
 from PIL import Image
 from io import BytesIO
 import os
 from .base_processor import BaseFileProcessor
+from src.core.exceptions import OperationCancelledError
 
 class ImageProcessor(BaseFileProcessor):
+    # Tesseract dil paketleri
+    ocr_lang = 'tur+eng'
+
     def __init__(self):
         # Tesseract yolunu ayarla - Windows için gerekli
         if os.name == 'nt':  # Windows işletim sistemi kontrolü
@@ -23,26 +27,52 @@ class ImageProcessor(BaseFileProcessor):
     def extract_text(self, file: BinaryIO) -> Text:
         try:
             image = Image.open(file)
-            
-            # Tesseract'ı kontrol et
-            try:
-                result = pytesseract.image_to_string(image, lang='tur+eng')
-                if not result.strip():
-                    # Boş sonuç döndüyse basit bir uyarı mesajı
-                    return "[Görüntüden metin çıkarılamadı. Görüntü metin içermiyor olabilir veya Tesseract OCR kurulumu gerekiyor olabilir.]"
-                return result
-            except Exception as e:
-                # Tesseract hatası
-                error_msg = str(e)
-                if "tesseract is not installed" in error_msg.lower() or "tesseract not found" in error_msg.lower():
-                    return "[Tesseract OCR kurulu değil. Görüntü dosyalarını analiz etmek için Tesseract OCR'ı kurmanız gerekmektedir.]"
-                else:
-                    return f"[Görüntü işleme hatası: {error_msg}]"
+            self.check_cancelled()
+            return self._ocr(image)
+        except OperationCancelledError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to process image: {str(e)}")
+    
+    def extract(self, file: BinaryIO) -> Tuple[Text, dict]:
+        """OCR text and image properties from one decode"""
+        try:
+            image = Image.open(file)
+            metadata = self._describe(image)
+            self.check_cancelled()
+            return self._ocr(image), metadata
+        except OperationCancelledError:
+            raise
         except Exception as e:
             raise ValueError(f"Failed to process image: {str(e)}")
     
+    def _ocr(self, image) -> Text:
+        # Tesseract'ı kontrol et
+        try:
+            result = pytesseract.image_to_string(image, lang=self.ocr_lang)
+            if not result.strip():
+                # Boş sonuç döndüyse basit bir uyarı mesajı
+                return "[Görüntüden metin çıkarılamadı. Görüntü metin içermiyor olabilir veya Tesseract OCR kurulumu gerekiyor olabilir.]"
+            return result
+        except Exception as e:
+            # Tesseract hatası
+            error_msg = str(e)
+            if "tesseract is not installed" in error_msg.lower() or "tesseract not found" in error_msg.lower():
+                return "[Tesseract OCR kurulu değil. Görüntü dosyalarını analiz etmek için Tesseract OCR'ı kurmanız gerekmektedir.]"
+            else:
+                return f"[Görüntü işleme hatası: {error_msg}]"
+    
+    def get_extraction_options(self) -> dict:
+        return {'ocr_lang': self.ocr_lang}
+    
+    def is_cacheable(self, text: str) -> bool:
+        # Köşeli parantezli uyarılar (Tesseract eksik, OCR hatası) önbelleğe yazılmaz; kurulumdan sonra yeniden denenir
+        return super().is_cacheable(text) and not (text.startswith("[") and text.endswith("]"))
+    
     def get_metadata(self, file: BinaryIO) -> dict:
-        image = Image.open(file)
+        return self._describe(Image.open(file))
+    
+    def _describe(self, image) -> dict:
         return {
             'width': image.width,
             'height': image.height,
@@ -59,5 +89,7 @@ class ImageProcessor(BaseFileProcessor):
             with open(file_path, 'rb') as file:
                 extracted_text = self.extract_text(file)
                 return [extracted_text]  # Tek bir parça olarak döndür
+        except OperationCancelledError:
+            raise
         except Exception as e:
             raise ValueError(f"Görüntü dosyası bölünürken hata: {str(e)}")
\ No newline at end of file
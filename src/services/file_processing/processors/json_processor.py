@@ -1,6 +1,7 @@
-from typing import BinaryIO, Text, List
+from typing import BinaryIO, Text, List, Iterator, Tuple
 import json
-from .base_processor import BaseFileProcessor
+from .base_processor import BaseFileProcessor, TextSegment
+from src.core.exceptions import OperationCancelledError
 
 class JSONProcessor(BaseFileProcessor):
     def extract_text(self, file: BinaryIO) -> Text:
@@ -10,10 +11,38 @@ class JSONProcessor(BaseFileProcessor):
         except Exception as e:
             raise ValueError(f"Failed to process JSON: {str(e)}")
     
+    def extract(self, file: BinaryIO) -> Tuple[Text, dict]:
+        """Indented JSON and metadata from one parse"""
+        try:
+            json_data = json.load(file)
+            return json.dumps(json_data, indent=2, ensure_ascii=False), self._describe(json_data)
+        except Exception as e:
+            raise ValueError(f"Failed to process JSON: {str(e)}")
+    
+    def iter_text(self, file: BinaryIO) -> Iterator[TextSegment]:
+        """Yield each top-level key or list item as indented JSON; start is its 1-based position"""
+        try:
+            json_data = json.load(file)
+        except Exception as e:
+            raise ValueError(f"Failed to process JSON: {str(e)}")
+        
+        if isinstance(json_data, dict):
+            items = ({key: value} for key, value in json_data.items())
+        elif isinstance(json_data, list):
+            items = iter(json_data)
+        else:
+            items = iter([json_data])
+        
+        for index, item in enumerate(items):
+            self.check_cancelled()
+            text = json.dumps(item, indent=2, ensure_ascii=False)
+            yield TextSegment(text + "\n", "element", index, index + 1, index + 1)
+    
     def get_metadata(self, file: BinaryIO) -> dict:
         file.seek(0)
-        json_data = json.load(file)
-        
+        return self._describe(json.load(file))
+    
+    def _describe(self, json_data) -> dict:
         metadata = {
             'keys': list(json_data.keys()) if isinstance(json_data, dict) else [],
             'type': type(json_data).__name__
@@ -34,25 +63,14 @@ class JSONProcessor(BaseFileProcessor):
                 
                 if method == "token":
                     # Uzun JSON'ı bölme işlemi
-                    chunks = []
-                    current_chunk = ""
-                    lines = json_text.split('\n')
-                    
-                    for line in lines:
-                        current_chunk += line + '\n'
-                        
-                        if self.estimate_tokens(current_chunk) >= chunk_size:
-                            chunks.append(current_chunk)
-                            current_chunk = ""
-                    
-                    # Kalan kısmı ekle
-                    if current_chunk:
-                        chunks.append(current_chunk)
+                    chunks = self.build_chunks(json_text.splitlines(keepends=True), chunk_size)
                     
                     return chunks if chunks else [json_text]
                 else:
                     # Sayfa bazlı bölme - JSON için pek anlamlı değil, 
                     # bu yüzden bütün içeriği döndür
                     return [json_text]
+        except OperationCancelledError:
+            raise
         except Exception as e:
             raise ValueError(f"JSON dosyası bölünürken hata: {str(e)}")
\ No newline at end of file
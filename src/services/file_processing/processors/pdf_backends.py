@@ -0,0 +1,216 @@
+import io
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple, Type
+
+import PyPDF2
+
+try:
+    import pypdfium2
+except ImportError:  # İsteğe bağlı hızlı arka uç
+    pypdfium2 = None
+
+try:
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+    from pdfminer.utils import decode_text
+except ImportError:  # İsteğe bağlı arka uç
+    TextConverter = None
+    LAParams = None
+    PDFDocument = None
+    PDFPageInterpreter = None
+    PDFResourceManager = None
+    PDFPage = None
+    PDFParser = None
+    decode_text = None
+
+# (sayfa indeksi, metin, hata); başarısız sayfada metin None olur
+PageResult = Tuple[int, Optional[str], Optional[str]]
+
+
+class PDFBackend(ABC):
+    """Text extraction library behind PDFProcessor; documents are opened from a file path"""
+
+    name = "base"
+
+    @abstractmethod
+    def open(self, path: str):
+        """Open the document"""
+        pass
+
+    @abstractmethod
+    def count_pages(self, document) -> int:
+        """Number of pages in the document"""
+        pass
+
+    @abstractmethod
+    def page_text(self, document, page_num: int) -> str:
+        """Text of one 0-based page"""
+        pass
+
+    def close(self, document):
+        """Release the document"""
+        pass
+
+    def document_info(self, document) -> Dict[str, str]:
+        """Document information entries (Author, Title, Subject, Creator) without the leading slash"""
+        return {}
+
+    def metadata(self, document) -> dict:
+        """PDFProcessor metadata of an open document"""
+        info = self.document_info(document)
+        return {
+            'page_count': self.count_pages(document),
+            'author': info.get('Author') or 'Unknown',
+            'title': info.get('Title') or 'Untitled',
+            'subject': info.get('Subject') or '',
+            'creator': info.get('Creator') or ''
+        }
+
+    def extract_range(self, path: str, start: int, end: int) -> List[PageResult]:
+        """Extract pages start..end-1; a failing page is reported without stopping the range"""
+        document = self.open(path)
+        try:
+            results = []
+            for page_num in range(start, end):
+                try:
+                    results.append((page_num, self.page_text(document, page_num) or "", None))
+                except Exception as e:
+                    results.append((page_num, None, str(e)))
+            return results
+        finally:
+            self.close(document)
+
+
+class PyPDF2Backend(PDFBackend):
+    """Pure Python extraction with PyPDF2, always available"""
+
+    name = "pypdf2"
+
+    def open(self, path: str):
+        return PyPDF2.PdfReader(path)
+
+    def count_pages(self, document) -> int:
+        return len(document.pages)
+
+    def page_text(self, document, page_num: int) -> str:
+        return document.pages[page_num].extract_text()
+
+    def document_info(self, document) -> Dict[str, str]:
+        info = document.metadata or {}
+        return {key.lstrip('/'): str(value) for key, value in info.items()}
+
+
+class PdfiumBackend(PDFBackend):
+    """Native extraction with pypdfium2, several times faster than PyPDF2"""
+
+    name = "pdfium"
+
+    def open(self, path: str):
+        return pypdfium2.PdfDocument(path)
+
+    def count_pages(self, document) -> int:
+        return len(document)
+
+    def page_text(self, document, page_num: int) -> str:
+        page = document[page_num]
+        try:
+            text_page = page.get_textpage()
+            try:
+                return text_page.get_text_range()
+            finally:
+                text_page.close()
+        finally:
+            page.close()
+
+    def close(self, document):
+        document.close()
+
+    def document_info(self, document) -> Dict[str, str]:
+        return {key: str(value) for key, value in document.get_metadata_dict().items()}
+
+
+class _PdfminerDocument:
+    """A pdfminer document parsed once, with one interpreter reused for every page"""
+
+    def __init__(self, path: str):
+        self.file = open(path, 'rb')
+        try:
+            self.document = PDFDocument(PDFParser(self.file))
+            # Sayfa ağacı bir kez gezilir; içerik akışları sayfa işlenirken okunur
+            self.pages = list(PDFPage.create_pages(self.document))
+        except Exception:
+            self.file.close()
+            raise
+        self.output = io.StringIO()
+        resource_manager = PDFResourceManager(caching=True)
+        self.device = TextConverter(resource_manager, self.output, laparams=LAParams())
+        self.interpreter = PDFPageInterpreter(resource_manager, self.device)
+
+    def page_text(self, page_num: int) -> str:
+        self.output.seek(0)
+        self.output.truncate(0)
+        self.interpreter.process_page(self.pages[page_num])
+        return self.output.getvalue()
+
+    def close(self):
+        self.device.close()
+        self.file.close()
+
+
+class PdfminerBackend(PDFBackend):
+    """Layout-aware extraction with pdfminer.six, slower but better reading order"""
+
+    name = "pdfminer"
+
+    def open(self, path: str):
+        return _PdfminerDocument(path)
+
+    def count_pages(self, document) -> int:
+        return len(document.pages)
+
+    def page_text(self, document, page_num: int) -> str:
+        return document.page_text(page_num)
+
+    def close(self, document):
+        document.close()
+
+    def document_info(self, document) -> Dict[str, str]:
+        info = {}
+        for entries in document.document.info:
+            for key, value in entries.items():
+                info[key] = decode_text(value) if isinstance(value, bytes) else str(value)
+        return info
+
+
+_BACKENDS: Dict[str, Type[PDFBackend]] = {
+    PyPDF2Backend.name: PyPDF2Backend,
+    PdfiumBackend.name: PdfiumBackend,
+    PdfminerBackend.name: PdfminerBackend,
+}
+
+
+def is_backend_available(name: str) -> bool:
+    """Whether the backend is known and its library is installed"""
+    if name == PdfiumBackend.name:
+        return pypdfium2 is not None
+    if name == PdfminerBackend.name:
+        return PDFPageInterpreter is not None
+    return name in _BACKENDS
+
+
+def get_pdf_backend(name: str) -> PDFBackend:
+    """Backend by name; unknown or missing backends fall back to PyPDF2"""
+    name = (name or PyPDF2Backend.name).lower()
+    if not is_backend_available(name):
+        print(f"PDF arka ucu kullanılamıyor ({name}), PyPDF2 kullanılıyor")
+        name = PyPDF2Backend.name
+    return _BACKENDS[name]()
+
+
+def extract_page_range(backend_name: str, path: str, start: int, end: int) -> List[PageResult]:
+    """Process pool entry point: extract a page range with the named backend"""
+    return get_pdf_backend(backend_name).extract_range(path, start, end)
@@ -1,20 +1,139 @@
 import PyPDF2
-from typing import BinaryIO, Text, List
+from typing import BinaryIO, Text, List, Iterator, Tuple
+import concurrent.futures
+import contextlib
 import logging
-from .base_processor import BaseFileProcessor
+import math
+import multiprocessing
+import os
+import tempfile
+from .base_processor import BaseFileProcessor, TextSegment
+from .pdf_backends import PDFBackend, PyPDF2Backend, PageResult, get_pdf_backend, extract_page_range, is_backend_available
+from src.core.exceptions import OperationCancelledError
 
 class PDFProcessor(BaseFileProcessor):
+    def __init__(self):
+        # Arka uç: pypdf2 (varsayılan), pdfium veya pdfminer
+        self.backend_name = os.getenv('PDF_BACKEND', 'pypdf2')
+        self.max_workers = int(os.getenv('PDF_WORKERS', str(os.cpu_count() or 1)))
+        # Daha kısa belgelerde süreç başlatma maliyeti kazancı aşar
+        self.parallel_min_pages = int(os.getenv('PDF_PARALLEL_MIN_PAGES', '64'))
+
     def extract_text(self, file: BinaryIO) -> Text:
         """Extract text from PDF file"""
+        return "".join(segment.text for segment in self.iter_text(file)).strip()
+
+    def extract(self, file: BinaryIO) -> Tuple[Text, dict]:
+        """Extract text and metadata from one open document of the active backend"""
         try:
-            reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n\n"
-            return text.strip()
+            with self._as_path(file) as path:
+                backend = get_pdf_backend(self.backend_name)
+                document = backend.open(path)
+                try:
+                    metadata = backend.metadata(document)
+                except Exception as e:
+                    logging.error(f"Error getting PDF metadata: {str(e)}")
+                    metadata = {'page_count': 0}
+                text = "".join(segment.text for segment in self._iter_pages(backend, document, path))
+                return text.strip(), metadata
+        except OperationCancelledError:
+            raise
         except Exception as e:
             raise ValueError(f"Failed to extract text from PDF: {str(e)}")
 
+    def iter_text(self, file: BinaryIO) -> Iterator[TextSegment]:
+        """Yield the text of each page; long documents are extracted in parallel page ranges"""
+        try:
+            with self._as_path(file) as path:
+                backend = get_pdf_backend(self.backend_name)
+                yield from self._iter_pages(backend, backend.open(path), path)
+        except OperationCancelledError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to extract text from PDF: {str(e)}")
+
+    def _iter_pages(self, backend: PDFBackend, document, path: str) -> Iterator[TextSegment]:
+        """Page segments of an open document, which is closed when done"""
+        try:
+            total_pages = backend.count_pages(document)
+            if self.max_workers > 1 and total_pages >= self.parallel_min_pages:
+                backend.close(document)
+                document = None
+                pages = self._iter_pages_parallel(backend.name, path, total_pages)
+            else:
+                pages = self._iter_pages_serial(backend, document, total_pages)
+            
+            for page_num, text, error in pages:
+                if error is not None:
+                    # Okunamayan sayfa atlanır, belgenin geri kalanı çıkarılır
+                    logging.warning(f"Error extracting page {page_num}: {error}")
+                    continue
+                yield TextSegment(text + "\n\n", "page", page_num, page_num + 1, page_num + 1)
+        finally:
+            if document is not None:
+                backend.close(document)
+
+    def _iter_pages_serial(self, backend: PDFBackend, document, total_pages: int) -> Iterator[PageResult]:
+        for page_num in range(total_pages):
+            self.check_cancelled()
+            try:
+                yield page_num, backend.page_text(document, page_num) or "", None
+            except Exception as e:
+                yield page_num, None, str(e)
+
+    def _iter_pages_parallel(self, backend_name: str, path: str, total_pages: int) -> Iterator[PageResult]:
+        """Fan page ranges out over a process pool and yield the pages in document order"""
+        workers = min(self.max_workers, total_pages)
+        # Yük dengesi için her işçiye birkaç küçük aralık düşer
+        pages_per_task = max(1, math.ceil(total_pages / (workers * 4)))
+        print(f"PDF paralel çıkarılıyor: {total_pages} sayfa, {workers} süreç ({backend_name})")
+        
+        # Çok iş parçacıklı GUI sürecinde fork, arka plan loop'u veya Tk'nin tuttuğu kilitlerde kilitlenebilir
+        pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        try:
+            tasks = []
+            for start in range(0, total_pages, pages_per_task):
+                end = min(start + pages_per_task, total_pages)
+                tasks.append((start, end, pool.submit(extract_page_range, backend_name, path, start, end)))
+            
+            for start, end, future in tasks:
+                while True:
+                    self.check_cancelled()
+                    try:
+                        results = future.result(timeout=0.2)
+                    except concurrent.futures.TimeoutError:
+                        continue
+                    except Exception as e:
+                        # Süreç çökerse sadece bu aralıktaki sayfalar kaybedilir
+                        results = [(page_num, None, str(e)) for page_num in range(start, end)]
+                    break
+                yield from results
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    @contextlib.contextmanager
+    def _as_path(self, file: BinaryIO) -> Iterator[str]:
+        """Path of the open file; in-memory files are written to a temporary file"""
+        name = getattr(file, 'name', None)
+        if isinstance(name, str) and os.path.isfile(name):
+            yield name
+            return
+        
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp:
+            temp.write(file.read())
+            temp_path = temp.name
+        try:
+            yield temp_path
+        finally:
+            os.unlink(temp_path)
+
+    def get_extraction_options(self) -> dict:
+        """Backend in effect; unavailable backends fall back to PyPDF2"""
+        backend = self.backend_name.lower()
+        return {'backend': backend if is_backend_available(backend) else PyPDF2Backend.name}
+
     def get_metadata(self, file: BinaryIO) -> dict:
         """Get PDF metadata"""
         try:
@@ -31,55 +150,27 @@ class PDFProcessor(BaseFileProcessor):
             logging.error(f"Error getting PDF metadata: {str(e)}")
             return {'page_count': 0}
 
-    def _do_split_file(self, file_path: str, chunk_size: int, method: str) -> List[str]:
+    def split_file(self, file_path: str, chunk_size: int, method: str = "token") -> List[str]:
         """Split PDF file into chunks"""
         try:
-            self._validate_chunk_size(chunk_size, max_size=100)  # Limit max pages
-            chunks = []
+            if method == "page":
+                self._validate_chunk_size(chunk_size, max_size=100)  # Limit max pages
+            else:
+                self._validate_chunk_size(chunk_size)
             
             with open(file_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                total_pages = len(reader.pages)
+                pages = (segment.text for segment in self.iter_text(file) if segment.text.strip())
                 
                 if method == "page":
                     # Split by page count
-                    for start in range(0, total_pages, chunk_size):
-                        chunk_text = ""
-                        end = min(start + chunk_size, total_pages)
-                        
-                        for page_num in range(start, end):
-                            try:
-                                page = reader.pages[page_num]
-                                text = page.extract_text()
-                                if text:
-                                    chunk_text += text + "\n\n"
-                            except Exception as e:
-                                logging.warning(f"Error extracting page {page_num}: {str(e)}")
-                                continue
-                        
-                        if chunk_text.strip():
-                            chunks.append(chunk_text.strip())
-                
+                    chunks = self.build_chunks(pages, chunk_size, measure=lambda page: 1)
                 else:  # token based
-                    current_chunk = ""
-                    for page in reader.pages:
-                        try:
-                            text = page.extract_text()
-                            if text:
-                                current_chunk += text + "\n\n"
-                                
-                                if self.estimate_tokens(current_chunk) >= chunk_size:
-                                    chunks.append(current_chunk.strip())
-                                    current_chunk = ""
-                        except Exception as e:
-                            logging.warning(f"Error processing page: {str(e)}")
-                            continue
-                    
-                    if current_chunk.strip():
-                        chunks.append(current_chunk.strip())
+                    chunks = self.build_chunks(pages, chunk_size)
             
-            return chunks
+            return [chunk.strip() for chunk in chunks]
 
+        except OperationCancelledError:
+            raise
         except Exception as e:
             logging.error(f"Error splitting PDF file {file_path}: {str(e)}")
-            raise
\ No newline at end of file
+            raise
@@ -1,20 +1,43 @@
-from typing import BinaryIO, Text, List
+from typing import BinaryIO, Text, List, Iterator, Tuple
 import logging
-from .base_processor import BaseFileProcessor
+from .base_processor import BaseFileProcessor, TextSegment
+from src.core.exceptions import OperationCancelledError
 
 class TextProcessor(BaseFileProcessor):
+    # iter_text her segmentte bu kadar satır döndürür
+    lines_per_segment = 1000
+
     def extract_text(self, file: BinaryIO) -> Text:
         """Extract text from file"""
-        try:
-            content = file.read()
-            return content.decode('utf-8')
-        except UnicodeDecodeError:
+        return "".join(segment.text for segment in self.iter_text(file))
+
+    def extract(self, file: BinaryIO) -> Tuple[Text, dict]:
+        """Extract text and metadata; the size is the read position once the text is read"""
+        text = self.extract_text(file)
+        return text, {
+            'size_bytes': file.tell(),
+            'encoding': 'utf-8'
+        }
+
+    def iter_text(self, file: BinaryIO) -> Iterator[TextSegment]:
+        """Yield batches of lines; start and end are 1-based line numbers"""
+        lines = []
+        start = 1
+        index = 0
+        for line_num, raw_line in enumerate(file, 1):
             try:
-                # Try alternative encodings
-                file.seek(0)
-                return content.decode('latin-1')
-            except Exception as e:
-                raise ValueError(f"Failed to decode text file: {str(e)}")
+                lines.append(raw_line.decode('utf-8'))
+            except UnicodeDecodeError:
+                # UTF-8 olmayan satırlar Latin-1 ile çözülür
+                lines.append(raw_line.decode('latin-1'))
+            if len(lines) >= self.lines_per_segment:
+                self.check_cancelled()
+                yield TextSegment("".join(lines), "lines", index, start, line_num)
+                lines = []
+                start = line_num + 1
+                index += 1
+        if lines:
+            yield TextSegment("".join(lines), "lines", index, start, start + len(lines) - 1)
 
     def get_metadata(self, file: BinaryIO) -> dict:
         """Get text file metadata"""
@@ -26,41 +49,25 @@ class TextProcessor(BaseFileProcessor):
             'encoding': 'utf-8'
         }
 
-    def _do_split_file(self, file_path: str, chunk_size: int, method: str) -> List[str]:
+    def split_file(self, file_path: str, chunk_size: int, method: str = "token") -> List[str]:
         """Split text file into chunks"""
         try:
             self._validate_chunk_size(chunk_size)
-            chunks = []
-            current_chunk = ""
             
-            with open(file_path, 'r', encoding='utf-8') as file:
+            # Dosya satır satır okunur ve iter_text ile aynı şekilde çözülür (UTF-8, olmazsa Latin-1);
+            # bellekte sadece kurulan parça tutulur
+            with open(file_path, 'rb') as file:
+                lines = self.iter_lines(file)
                 if method == "page":
                     chars_per_page = 3000  # Approximate chars per page
-                    current_chars = 0
-                    
-                    for line in file:
-                        current_chunk += line
-                        current_chars += len(line)
-                        
-                        if current_chars >= chars_per_page * chunk_size:
-                            chunks.append(current_chunk.strip())
-                            current_chunk = ""
-                            current_chars = 0
-                
+                    chunks = self.build_chunks(lines, chars_per_page * chunk_size, measure=len)
                 else:  # token based
-                    for line in file:
-                        current_chunk += line
-                        
-                        if self.estimate_tokens(current_chunk) >= chunk_size:
-                            chunks.append(current_chunk.strip())
-                            current_chunk = ""
-            
-            # Add remaining content if any
-            if current_chunk.strip():
-                chunks.append(current_chunk.strip())
+                    chunks = self.build_chunks(lines, chunk_size)
             
-            return chunks
+            return [chunk.strip() for chunk in chunks]
 
+        except OperationCancelledError:
+            raise
         except Exception as e:
             logging.error(f"Error splitting text file {file_path}: {str(e)}")
-            raise
\ No newline at end of file
+            raise
@@ -1,36 +1,80 @@
-from typing import BinaryIO, Text, List
+from typing import BinaryIO, Text, List, Iterator, Tuple, Optional, Dict
 import xml.etree.ElementTree as ET
-from .base_processor import BaseFileProcessor
+from .base_processor import BaseFileProcessor, TextSegment
+from src.core.exceptions import OperationCancelledError
 
 class XMLProcessor(BaseFileProcessor):
     def extract_text(self, file: BinaryIO) -> Text:
+        return "".join(segment.text for segment in self.iter_text(file))
+    
+    def extract(self, file: BinaryIO) -> Tuple[Text, dict]:
+        """Extract text and count elements in the same streaming parse"""
+        element_counts = {}
+        text = "".join(segment.text for segment in self.iter_text(file, element_counts))
+        return text, self._describe(element_counts)
+    
+    def iter_text(self, file: BinaryIO, element_counts: Optional[Dict[str, int]] = None) -> Iterator[TextSegment]:
+        """Yield each top-level element as it is parsed; start is its 1-based position under the root.
+        If element_counts is given, it is filled with the number of elements per tag, root first"""
         try:
-            content = file.read()
-            root = ET.fromstring(content)
-            
-            # Tüm metin içeriğini almak için recursive işlev
-            def get_element_texts(element, indent=0):
-                result = ""
-                # Element adını ve niteliklerini ekle
-                if indent > 0:  # Kök elementi dahil etme
-                    result += " " * indent + f"Element: {element.tag}\n"
-                    if element.attrib:
-                        result += " " * (indent + 2) + f"Nitelikler: {element.attrib}\n"
+            root = None
+            depth = 0
+            index = 0
+            position = 0
+            for event, element in ET.iterparse(file, events=("start", "end")):
+                if event == "start":
+                    if root is None:
+                        root = element
+                    if element_counts is not None:
+                        element_counts[element.tag] = element_counts.get(element.tag, 0) + 1
+                    depth += 1
+                    continue
                 
-                # Element metnini ekle
-                if element.text and element.text.strip():
-                    result += " " * (indent + 2) + f"Metin: {element.text.strip()}\n"
-                
-                # Alt elementleri işle
-                for child in element:
-                    result += get_element_texts(child, indent + 4)
-                
-                return result
+                depth -= 1
+                if depth != 1:
+                    continue
+                self.check_cancelled()
+                # Kök metni ilk çocuk tamamlandığında okunmuş olur
+                if position == 0:
+                    root_text = self._format_element(root, 0, recursive=False)
+                    if root_text:
+                        yield TextSegment(root_text, "element", index, None, None)
+                        index += 1
+                position += 1
+                yield TextSegment(self._format_element(element, 4), "element", index, position, position)
+                index += 1
+                # İşlenen element bırakılır; bellekte sadece geçerli alt ağaç tutulur
+                root.remove(element)
             
-            return get_element_texts(root)
+            if position == 0 and root is not None:
+                root_text = self._format_element(root, 0, recursive=False)
+                if root_text:
+                    yield TextSegment(root_text, "element", 0, None, None)
+        except OperationCancelledError:
+            raise
         except Exception as e:
             raise ValueError(f"XML işleme hatası: {str(e)}")
     
+    def _format_element(self, element, indent: int, recursive: bool = True) -> str:
+        """Readable text of an element and, if recursive, its descendants"""
+        result = ""
+        # Element adını ve niteliklerini ekle
+        if indent > 0:  # Kök elementi dahil etme
+            result += " " * indent + f"Element: {element.tag}\n"
+            if element.attrib:
+                result += " " * (indent + 2) + f"Nitelikler: {element.attrib}\n"
+        
+        # Element metnini ekle
+        if element.text and element.text.strip():
+            result += " " * (indent + 2) + f"Metin: {element.text.strip()}\n"
+        
+        # Alt elementleri işle
+        if recursive:
+            for child in element:
+                result += self._format_element(child, indent + 4)
+        
+        return result
+
     def get_metadata(self, file: BinaryIO) -> dict:
         file.seek(0)
         content = file.read()
@@ -42,8 +86,12 @@ class XMLProcessor(BaseFileProcessor):
             tag = elem.tag
             element_counts[tag] = element_counts.get(tag, 0) + 1
         
+        return self._describe(element_counts)
+    
+    def _describe(self, element_counts: Dict[str, int]) -> dict:
         return {
-            'root_element': root.tag,
+            # Sayımlar belge sırasıyla eklendiğinden ilk etiket köktür
+            'root_element': next(iter(element_counts)),
             'element_counts': element_counts,
             'total_elements': sum(element_counts.values())
         }
@@ -58,24 +106,9 @@ class XMLProcessor(BaseFileProcessor):
             
             if method == "token":
                 # XML yapısını bozmadan çocuk elementleri gruplayarak bölme
-                chunks = []
-                current_chunk = ""
-                
-                # Her bir ana çocuk elementi için
-                for child in root:
-                    # Çocuğu XML string'e dönüştür
-                    child_str = ET.tostring(child, encoding='unicode')
-                    
-                    # Eğer mevcut chunk yeterince doluysa, yeni chunk başlat
-                    if self.estimate_tokens(current_chunk + child_str) > chunk_size and current_chunk:
-                        chunks.append(current_chunk)
-                        current_chunk = child_str
-                    else:
-                        current_chunk += child_str
-                
-                # Son chunk'ı ekle
-                if current_chunk:
-                    chunks.append(current_chunk)
+                chunks = self.build_chunks(
+                    (ET.tostring(child, encoding='unicode') for child in root), chunk_size
+                )
                 
                 # Eğer hiç chunk oluşturamadıysak, tüm XML'i tek parça olarak döndür
                 if not chunks:
@@ -85,5 +118,7 @@ class XMLProcessor(BaseFileProcessor):
             else:
                 # Sayfa bazlı bölme için, tüm XML'i tek parça olarak döndür
                 return [ET.tostring(root, encoding='unicode')]
+        except OperationCancelledError:
+            raise
         except Exception as e:
             raise ValueError(f"XML dosyası bölünürken hata: {str(e)}")
\ No newline at end of file
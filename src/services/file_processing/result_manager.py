@@ -176,18 +176,43 @@ class ResultManager:
             return self._combine_sequential(results)
         elif combination_type == "summarize":
             return self._combine_with_summary(results)
+        elif combination_type == "hierarchical":
+            raise ValueError("Hiyerarşik birleştirme AI gerektirir, combine_hierarchical kullanın")
         else:
             raise ValueError(f"Geçersiz birleştirme tipi: {combination_type}")
 
-    def _combine_sequential(self, results: List[ProcessingResult]) -> ProcessingResult:
-        """Sonuçları sıralı olarak birleştir"""
+    async def combine_hierarchical(self, results: List[ProcessingResult], summarizer, provider: str,
+                                   use_cache: bool = True, progress_callback=None,
+                                   cancel_token=None) -> ProcessingResult:
+        """Sonuçları AI ile seviye seviye indirgeyerek tek bir sonuçta birleştir"""
+        if not results:
+            raise ValueError("Birleştirilecek sonuç bulunamadı")
+
+        if len(results) == 1:
+            return results[0]
+
+        combined_text = await summarizer.summarize(
+            [result.analyzed_text for result in results],
+            provider,
+            results[0].analysis_type,
+            use_cache=use_cache,
+            progress_callback=progress_callback,
+            cancel_token=cancel_token
+        )
+
+        return ProcessingResult(
+            original_text="[Hiyerarşik Özet]",
+            analyzed_text=combined_text,
+            metadata=self._merge_metadata(results),
+            timestamp=datetime.now(),
+            file_name="combined_summary.txt",
+            analysis_type=results[0].analysis_type
+        )
+
+    def _merge_metadata(self, results: List[ProcessingResult]) -> dict:
+        """Sonuçların metadata'sını birleştir"""
         all_metadata = {}
-        
-        # JSON verilerini birleştirmek için
-        combined_json = {"soru-cevaplar": []}
-        
         for result in results:
-            # Metadata'yı birleştir
             for key, value in result.metadata.items():
                 if key in all_metadata:
                     if isinstance(all_metadata[key], (int, float)):
@@ -197,8 +222,18 @@ class ResultManager:
                     else:
                         all_metadata[key] = f"{all_metadata[key]}, {value}"
                 else:
-                    all_metadata[key] = value
-            
+                    # Listeler kopyalanır; kaynak sonucun metadata'sı değişmez
+                    all_metadata[key] = list(value) if isinstance(value, list) else value
+        return all_metadata
+
+    def _combine_sequential(self, results: List[ProcessingResult]) -> ProcessingResult:
+        """Sonuçları sıralı olarak birleştir"""
+        all_metadata = self._merge_metadata(results)
+        
+        # JSON verilerini birleştirmek için
+        combined_json = {"soru-cevaplar": []}
+        
+        for result in results:
             # Eğer analiz sonucu JSON formatındaysa
             try:
                 # JSON blok işaretlerini temizle
@@ -230,7 +265,7 @@ class ResultManager:
     def _combine_with_summary(self, results: List[ProcessingResult]) -> ProcessingResult:
         """Sonuçları özetle birleştir"""
         combined_text = "# Analiz Özeti\n\n"
-        all_metadata = {}
+        all_metadata = self._merge_metadata(results)
         
         # Genel bilgiler
         combined_text += f"Toplam Analiz Sayısı: {len(results)}\n"
@@ -244,18 +279,6 @@ class ResultManager:
             summary = result.analyzed_text[:200] + "..." if len(result.analyzed_text) > 200 else result.analyzed_text
             combined_text += summary + "\n"
 
-            # Metadata'yı birleştir
-            for key, value in result.metadata.items():
-                if key in all_metadata:
-                    if isinstance(all_metadata[key], (int, float)):
-                        all_metadata[key] += value
-                    elif isinstance(all_metadata[key], list):
-                        all_metadata[key].extend(value)
-                    else:
-                        all_metadata[key] = f"{all_metadata[key]}, {value}"
-                else:
-                    all_metadata[key] = value
-
         # Metadata özeti
         combined_text += "\n# Metadata Özeti\n\n"
         for key, value in all_metadata.items():
@@ -282,5 +305,10 @@ class ResultManager:
                 "id": "summarize",
                 "name": "Özetli Birleştirme",
                 "description": "Sonuçları özetleyerek birleştirir"
+            },
+            {
+                "id": "hierarchical",
+                "name": "Hiyerarşik Özet",
+                "description": "Sonuçları yapay zeka ile paralel seviyelerde tek bir tutarlı özete indirger"
             }
         ]
\ No newline at end of file
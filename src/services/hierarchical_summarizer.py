@@ -0,0 +1,156 @@
+import math
+from typing import Callable, List, Optional
+
+from src.core.cancellation import CancellationToken
+from src.core.prompts import AnalysisPrompts
+from src.services.file_processing.processors.text_processor import TextProcessor
+from .chunk_analyzer import ChunkAnalyzer
+
+
+class HierarchicalSummarizer:
+    """Map-reduce combine: reduce partial results in parallel tree levels until one remains"""
+
+    SECTION_HEADER = "### Bölüm {id}"
+
+    def __init__(self, ai_service_manager, chunk_analyzer: Optional[ChunkAnalyzer] = None):
+        self.ai_service_manager = ai_service_manager
+        self.chunk_analyzer = chunk_analyzer or ChunkAnalyzer(ai_service_manager)
+
+    def _get_settings(self) -> dict:
+        return self.ai_service_manager.settings.get("summarization", {})
+
+    def get_input_budget(self, provider: str, prompt_template: str) -> int:
+        """Input tokens one reduce call may receive"""
+        settings = self._get_settings()
+        available = self.ai_service_manager.get_input_token_budget(provider, prompt_template)
+        return max(1, min(settings.get("max_input_tokens", 24000), available))
+
+    def group_texts(self, texts: List[str], provider: str, budget: int) -> List[List[str]]:
+        """Group consecutive texts so each group fits the budget; every group but a leftover has at least two"""
+        tokenizer = self.ai_service_manager.get_tokenizer(provider)
+        max_fan_in = max(2, self._get_settings().get("max_fan_in", 8))
+        groups: List[List[str]] = []
+        current: List[str] = []
+        current_tokens = 0
+
+        for text in texts:
+            tokens = tokenizer.count(text) + tokenizer.count(self.SECTION_HEADER.format(id=len(current) + 1))
+            # Her seviyede sonuç sayısının azalması için grup en az iki sonuç alır
+            if len(current) >= 2 and (current_tokens + tokens > budget or len(current) >= max_fan_in):
+                groups.append(current)
+                current, current_tokens = [], 0
+            current.append(text)
+            current_tokens += tokens
+
+        if current:
+            groups.append(current)
+        return groups
+
+    def fit_texts(self, texts: List[str], provider: str, budget: int,
+                  cancel_token: Optional[CancellationToken] = None) -> List[str]:
+        """Split texts larger than half the budget so any two of them fit one reduce call"""
+        tokenizer = self.ai_service_manager.get_tokenizer(provider)
+        header_tokens = tokenizer.count(self.SECTION_HEADER.format(id=self._get_settings().get("max_fan_in", 8))) + 1
+        item_limit = max(1, budget // 2 - header_tokens)
+        
+        splitter = None
+        fitted: List[str] = []
+        for text in texts:
+            if tokenizer.count(text) <= item_limit:
+                fitted.append(text)
+                continue
+            if splitter is None:
+                splitter = TextProcessor()
+                splitter.set_tokenizer(tokenizer)
+                splitter.set_cancel_token(cancel_token)
+            fitted.extend(splitter.split_text(text, item_limit))
+        return fitted
+
+    def estimate_levels(self, texts: List[str], provider: str, budget: int) -> int:
+        """Reduce levels needed, assuming each reduce result is about as long as the average input"""
+        if len(texts) <= 1:
+            return 0
+        tokenizer = self.ai_service_manager.get_tokenizer(provider)
+        max_fan_in = max(2, self._get_settings().get("max_fan_in", 8))
+        average_tokens = max(1, sum(tokenizer.count(text) for text in texts) // len(texts))
+        fan_in = min(max_fan_in, max(2, budget // average_tokens))
+        
+        # İlk seviyenin grupları kesin hesaplanır, sonrakiler ortalama boyuttan tahmin edilir
+        count = len(self.group_texts(texts, provider, budget))
+        levels = 1
+        while count > 1:
+            count = math.ceil(count / fan_in)
+            levels += 1
+        return levels
+
+    def _join_group(self, group: List[str]) -> str:
+        return "\n\n".join(
+            f"{self.SECTION_HEADER.format(id=i)}\n{text.strip()}" for i, text in enumerate(group, 1)
+        )
+
+    async def summarize(self, texts: List[str], provider: str, analysis_type: str,
+                        use_cache: bool = True,
+                        progress_callback: Optional[Callable[[int, int, int], None]] = None,
+                        cancel_token: Optional[CancellationToken] = None) -> str:
+        """
+        Reduce partial results to a single result.
+
+        Args:
+            texts (List[str]): Per-chunk or per-file results, in document order
+            provider (str): AI provider name
+            analysis_type (str): Analysis type the partial results were produced with
+            use_cache (bool): Consult the response cache
+            progress_callback (Callable): Called with (level, completed, total) as reduce calls finish
+            cancel_token (CancellationToken): Cancelling it aborts the running level
+
+        Returns:
+            str: Combined result
+        """
+        texts = [text for text in texts if text and text.strip()]
+        if not texts:
+            raise ValueError("Birleştirilecek sonuç bulunamadı")
+
+        prompt_template = AnalysisPrompts.REDUCE_PROMPT.format(analysis_type=analysis_type)
+        budget = self.get_input_budget(provider, prompt_template)
+        max_levels = self._get_settings().get("max_levels", 6)
+        texts = self.fit_texts(texts, provider, budget, cancel_token)
+        
+        # Sınır aşılacaksa hiçbir AI çağrısı yapılmadan hata verilir
+        estimated_levels = self.estimate_levels(texts, provider, budget)
+        if estimated_levels > max_levels:
+            raise ValueError(
+                f"Birleştirme yaklaşık {estimated_levels} seviye gerektiriyor, en fazla {max_levels} seviyeye izin var "
+                f"({len(texts)} sonuç); summarization.max_levels ayarını artırın veya daha büyük bağlamlı bir model seçin"
+            )
+        level = 0
+
+        while len(texts) > 1:
+            level += 1
+            if level > max_levels:
+                raise ValueError(f"Birleştirme {max_levels} seviyede tamamlanamadı")
+
+            texts = self.fit_texts(texts, provider, budget, cancel_token)
+            groups = self.group_texts(texts, provider, budget)
+            print(f"Birleştirme seviyesi {level}: {len(texts)} sonuç -> {len(groups)} grup")
+
+            # Tek kalan grup elemanı AI'ya gönderilmeden bir üst seviyeye taşınır
+            reduce_indices = [i for i, group in enumerate(groups) if len(group) > 1]
+            reduced = await self.chunk_analyzer.analyze_chunks(
+                [self._join_group(groups[i]) for i in reduce_indices],
+                provider,
+                prompt_template,
+                parallel=True,
+                use_cache=use_cache,
+                progress_callback=(lambda completed, total, level=level: progress_callback(level, completed, total))
+                if progress_callback else None,
+                cancel_token=cancel_token,
+                analysis_type=analysis_type,
+                stage="reduce"
+            )
+
+            next_texts = [group[0] for group in groups]
+            for i, text in zip(reduce_indices, reduced):
+                next_texts[i] = text
+            texts = next_texts
+
+        return texts[0]
@@ -1,6 +1,7 @@
+import glob
 import os
 import shutil
-from typing import List, Set
+from typing import List, Optional, Set, Tuple
 
 def get_file_extension(file_path: str) -> str:
     """Get file extension with dot"""
@@ -15,6 +16,17 @@ def get_file_size(file_path: str) -> int:
     """Get file size in bytes"""
     return os.path.getsize(file_path)
 
+def check_file_size(file_path: str, max_size: Optional[int]):
+    """Reject files larger than max_size bytes before they are read; None means no limit"""
+    if max_size is None:
+        return
+    file_size = get_file_size(file_path)
+    if file_size > max_size:
+        raise ValueError(
+            f"Dosya çok büyük: {file_size / (1024 * 1024):.1f} MB "
+            f"(en fazla {max_size / (1024 * 1024):.1f} MB)"
+        )
+
 def create_temp_file(original_file: str, temp_dir: str) -> str:
     """Create a copy of file in temp directory"""
     if not os.path.exists(temp_dir):
@@ -40,4 +52,54 @@ def clean_temp_files(temp_dir: str, file_pattern: str = None):
         for file in os.listdir(temp_dir):
             file_path = os.path.join(temp_dir, file)
             if os.path.isfile(file_path):
-                os.remove(file_path)
\ No newline at end of file
+                os.remove(file_path)
+
+def _glob_root(pattern: str) -> str:
+    """Leading directories of a glob pattern that contain no wildcards"""
+    parts = []
+    for part in os.path.dirname(pattern).split(os.sep):
+        if glob.has_magic(part):
+            break
+        parts.append(part)
+    return os.sep.join(parts) or "."
+
+def collect_files(inputs: List[str], supported_extensions: List[str], recursive: bool = False) -> List[Tuple[str, str]]:
+    """Resolve inputs to (file path, output-relative path) pairs, skipping unsupported types"""
+    files = []
+    seen = set()
+
+    def add(path: str, relative: str):
+        path = os.path.abspath(path)
+        if path in seen or os.path.splitext(path)[1].lower() not in supported_extensions:
+            return
+        seen.add(path)
+        files.append((path, relative))
+
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, dirs, names in os.walk(item):
+                dirs.sort()
+                for name in sorted(names):
+                    path = os.path.join(root, name)
+                    add(path, os.path.relpath(path, item))
+                if not recursive:
+                    break
+        elif os.path.isfile(item):
+            add(item, os.path.basename(item))
+        else:
+            root = _glob_root(item)
+            for path in sorted(glob.glob(item, recursive=True)):
+                if os.path.isfile(path):
+                    add(path, os.path.relpath(path, root))
+
+    # Farklı girdilerden gelen aynı adlı dosyalar ortak üst klasöre göre adlandırılır
+    by_relative = {}
+    for index, (path, relative) in enumerate(files):
+        by_relative.setdefault(os.path.normcase(relative), []).append(index)
+    for indices in by_relative.values():
+        if len(indices) > 1:
+            common = os.path.commonpath([os.path.dirname(files[i][0]) for i in indices])
+            for i in indices:
+                files[i] = (files[i][0], os.path.relpath(files[i][0], common))
+
+    return files
\ No newline at end of file
@@ -0,0 +1,34 @@
+import json
+import os
+from typing import Any, Dict
+
+
+def merge_settings(base: Dict[str, Any], updates: Dict[str, Any]) -> Dict[str, Any]:
+    """Recursively merge updates into a copy of base; nested sections keep keys not in updates"""
+    merged = dict(base)
+    for key, value in updates.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_settings(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def update_settings_file(settings_file: str, updates: Dict[str, Any], indent: int = 4) -> Dict[str, Any]:
+    """Merge updates into a JSON settings file and write it back, keeping its line endings"""
+    settings: Dict[str, Any] = {}
+    newline = "\n"
+    if os.path.exists(settings_file):
+        with open(settings_file, 'r', encoding='utf-8', newline='') as f:
+            content = f.read()
+        if "\r\n" in content:
+            newline = "\r\n"
+        if content.strip():
+            settings = json.loads(content)
+
+    settings = merge_settings(settings, updates)
+
+    os.makedirs(os.path.dirname(os.path.abspath(settings_file)), exist_ok=True)
+    with open(settings_file, 'w', encoding='utf-8', newline=newline) as f:
+        json.dump(settings, f, indent=indent, ensure_ascii=False)
+    return settings
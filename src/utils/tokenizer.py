@@ -0,0 +1,162 @@
+import math
+import re
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+try:
+    import tiktoken
+except ImportError:  # Çevrimdışı / kurulu değilse sezgisel sayaç kullanılır
+    tiktoken = None
+
+
+class Tokenizer(ABC):
+    """Counts tokens for a model family"""
+
+    name = "base"
+    # Bundan uzun metinler (bütün belgeler) önbelleğe alınmaz; bellekte tutulmaları gerekmez
+    max_cached_length = 4096
+
+    def __init__(self, cache_size: int = 65536):
+        # Tekrarlanan satırlar (başlıklar, tablo satırları) yeniden sayılmaz
+        self._cached_count = lru_cache(maxsize=cache_size)(self._count)
+
+    @abstractmethod
+    def _count(self, text: str) -> int:
+        """Count tokens without memoization"""
+        pass
+
+    def count(self, text: str) -> int:
+        """Count tokens in text"""
+        if not text:
+            return 0
+        if len(text) > self.max_cached_length:
+            return self._count(text)
+        return self._cached_count(text)
+
+
+class HeuristicTokenizer(Tokenizer):
+    """Offline estimate based on words, punctuation and script"""
+
+    name = "heuristic"
+
+    _TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+    def __init__(self, ascii_chars_per_token: float = 4.0, non_ascii_chars_per_token: float = 2.7,
+                 scale: float = 1.0, cache_size: int = 65536):
+        super().__init__(cache_size)
+        self.ascii_chars_per_token = ascii_chars_per_token
+        # Türkçe gibi eklemeli dillerde kelimeler daha fazla parçaya bölünür
+        self.non_ascii_chars_per_token = non_ascii_chars_per_token
+        self.scale = scale
+
+    def _count(self, text: str) -> int:
+        tokens = 0
+        for piece in self._TOKEN_PATTERN.findall(text):
+            if len(piece) == 1:
+                tokens += 1
+            elif piece.isascii():
+                tokens += math.ceil(len(piece) / self.ascii_chars_per_token)
+            else:
+                tokens += math.ceil(len(piece) / self.non_ascii_chars_per_token)
+        return max(1, int(math.ceil(tokens * self.scale)))
+
+
+class TiktokenTokenizer(Tokenizer):
+    """Exact BPE counts using a tiktoken encoding"""
+
+    def __init__(self, encoding_name: str, cache_size: int = 65536):
+        super().__init__(cache_size)
+        self.encoding = tiktoken.get_encoding(encoding_name)
+        self.name = encoding_name
+
+    def _count(self, text: str) -> int:
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+
+class TokenCounter:
+    """Running token count that chunkers feed segment by segment"""
+
+    def __init__(self, tokenizer: Tokenizer):
+        self.tokenizer = tokenizer
+        self.total = 0
+
+    def count(self, segment: str) -> int:
+        """Tokens in a single segment"""
+        return self.tokenizer.count(segment)
+
+    def add(self, segment: str) -> int:
+        """Add segment and return the running total"""
+        self.total += self.tokenizer.count(segment)
+        return self.total
+
+    def fits(self, segment: str, limit: int) -> bool:
+        """Whether adding segment keeps the total within limit"""
+        return self.total + self.tokenizer.count(segment) <= limit
+
+    def reset(self, segment: str = ""):
+        """Start a new chunk, optionally seeded with its first segment"""
+        self.total = self.tokenizer.count(segment)
+
+
+def _openai_encoding(model: Optional[str]) -> str:
+    if model and any(model.startswith(prefix) for prefix in ("gpt-4o", "gpt-4.1", "o1", "o3", "o4")):
+        return "o200k_base"
+    return "cl100k_base"
+
+
+def _make_openai_tokenizer(model: Optional[str]) -> Tokenizer:
+    return TiktokenTokenizer(_openai_encoding(model))
+
+
+def _make_cl100k_tokenizer(model: Optional[str]) -> Tokenizer:
+    # Claude ve DeepSeek için yerel tokenizer yok; cl100k yakın bir tahmin verir
+    return TiktokenTokenizer("cl100k_base")
+
+
+_TIKTOKEN_FACTORIES: Dict[str, Callable[[Optional[str]], Tokenizer]] = {
+    "openai": _make_openai_tokenizer,
+    "claude": _make_cl100k_tokenizer,
+    "deepseek": _make_cl100k_tokenizer,
+}
+
+# Sağlayıcıya özel ölçek: aynı metin için sağlayıcılar farklı sayıda token üretir
+_HEURISTIC_SCALES: Dict[str, float] = {
+    "claude": 1.1,
+    "gemini": 0.9,
+}
+
+_custom_factories: Dict[str, Callable[[Optional[str]], Tokenizer]] = {}
+_tokenizers: Dict[str, Tokenizer] = {}
+
+
+def register_tokenizer(provider: str, factory: Callable[[Optional[str]], Tokenizer]):
+    """Register a tokenizer factory for a provider; it receives the model name"""
+    _custom_factories[provider] = factory
+    for key in [key for key in _tokenizers if key.split(":", 1)[0] == provider]:
+        del _tokenizers[key]
+
+
+def get_tokenizer(provider: Optional[str] = None, model: Optional[str] = None) -> Tokenizer:
+    """Get a shared tokenizer for provider/model, falling back to the offline estimate"""
+    key = f"{provider or ''}:{model or ''}"
+    if key in _tokenizers:
+        return _tokenizers[key]
+
+    tokenizer = None
+    factory = _custom_factories.get(provider)
+    if factory is None and tiktoken is not None:
+        factory = _TIKTOKEN_FACTORIES.get(provider)
+
+    if factory is not None:
+        try:
+            tokenizer = factory(model)
+        except Exception as e:
+            # Örn. tiktoken kodlama dosyası indirilemezse
+            print(f"Tokenizer yüklenemedi ({provider}), tahmini sayaç kullanılacak: {str(e)}")
+
+    if tokenizer is None:
+        tokenizer = HeuristicTokenizer(scale=_HEURISTIC_SCALES.get(provider, 1.0))
+
+    _tokenizers[key] = tokenizer
+    return tokenizer
@@ -0,0 +1,75 @@
+from src.services.chunk_packer import ChunkPacker, PackedRequest
+from src.utils.tokenizer import HeuristicTokenizer, Tokenizer
+
+
+def make_packer(budget: int = 200, max_units: int = 10) -> ChunkPacker:
+    return ChunkPacker(HeuristicTokenizer(), budget, max_units)
+
+
+def test_small_units_share_a_request():
+    packer = make_packer()
+    requests = packer.pack(["birinci metin", "ikinci metin", "üçüncü metin"])
+
+    assert len(requests) == 1
+    assert requests[0].indices == [0, 1, 2]
+    assert requests[0].is_packed
+    assert "<<<PARÇA 3>>>\nüçüncü metin" in requests[0].text
+
+
+def test_large_unit_is_sent_alone_and_order_is_kept():
+    packer = make_packer(budget=40)
+    large = "kelime " * 30
+    requests = packer.pack(["kısa", large, "kısa"])
+
+    assert [request.indices for request in requests] == [[1], [0, 2]]
+    assert requests[0].text == large
+    assert not requests[0].is_packed
+
+
+def test_requests_stay_within_budget_and_unit_limit():
+    packer = make_packer(budget=60, max_units=3)
+    units = [f"metin numarası {i}" for i in range(20)]
+    requests = packer.pack(units)
+
+    assert sorted(index for request in requests for index in request.indices) == list(range(20))
+    assert all(request.tokens <= 60 and len(request.indices) <= 3 for request in requests)
+
+
+def test_unpack_maps_answers_back_to_sources():
+    packer = make_packer()
+    request = PackedRequest([4, 7, 9])
+    response = "<<<SONUÇ 1>>>\nbir\n\n**<<<SONUÇ 3>>>**\nüç\n<<<SONUÇ 5>>>\nfazla\n<<<BİTTİ>>>"
+
+    assert packer.unpack(response, request) == {4: "bir", 9: "üç"}
+
+
+def test_unpack_drops_last_answer_of_a_truncated_response():
+    packer = make_packer()
+    request = PackedRequest([0, 1, 2])
+    response = "<<<SONUÇ 1>>>\nbir\n<<<SONUÇ 2>>>\niki\n<<<SONUÇ 3>>>\nyarım kal"
+
+    # Bitiş işaretçisi yoksa yanıt kesilmiştir; son metin ayrıca gönderilmek üzere eksik sayılır
+    assert packer.unpack(response, request) == {0: "bir", 1: "iki"}
+
+
+class CharTokenizer(Tokenizer):
+    def _count(self, text):
+        return len(text)
+
+
+def test_packed_tokens_match_the_written_markers():
+    packer = ChunkPacker(CharTokenizer(), 200, max_units=3)
+    units = [f"metin {i}" for i in range(30)]
+
+    for request in packer.pack(units):
+        expected = sum(
+            len(packer.UNIT_MARKER.format(id=position + 1)) + len(units[index])
+            for position, index in enumerate(request.indices)
+        )
+        assert request.tokens == expected
+
+
+def test_unpack_single_unit_returns_whole_response():
+    packer = make_packer()
+
+    assert packer.unpack("yanıt", PackedRequest([2])) == {2: "yanıt"}
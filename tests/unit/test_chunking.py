@@ -0,0 +1,72 @@
+import pytest
+
+from src.core.cancellation import CancellationToken
+from src.core.exceptions import OperationCancelledError
+from src.services.file_processing.processors.text_processor import TextProcessor
+from src.utils.tokenizer import HeuristicTokenizer
+
+
+@pytest.fixture
+def processor():
+    processor = TextProcessor()
+    processor.set_tokenizer(HeuristicTokenizer())
+    return processor
+
+
+def make_text(lines: int = 400) -> str:
+    return "".join(f"Satır {i}: kısa bir deneme cümlesi ve birkaç kelime daha.\n" for i in range(lines))
+
+
+def test_chunks_respect_limit_and_keep_all_text(processor):
+    text = make_text()
+    chunks = processor.split_text(text, 200)
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == text
+    assert all(processor.estimate_tokens(chunk) <= 200 for chunk in chunks)
+
+
+def test_chunks_are_filled_up_to_the_limit(processor):
+    chunks = processor.split_text(make_text(), 500)
+
+    # Son parça dışında hiçbir parça bütçenin yarısının altında kalmamalı
+    assert all(processor.estimate_tokens(chunk) > 250 for chunk in chunks[:-1])
+
+
+def test_oversized_unit_is_split_into_words_and_characters(processor):
+    word = "a" * 400
+    chunks = processor.build_chunks([f"{word} {word}\n"], 20)
+
+    # Sadece boşluktan oluşan parçalar atlanır; metnin kendisi kaybolmaz
+    assert "".join("".join(chunks).split()) == word * 2
+    assert all(processor.estimate_tokens(chunk) <= 20 for chunk in chunks)
+
+
+def test_custom_measure_keeps_units_whole(processor):
+    chunks = processor.build_chunks(["aaaa", "bb", "cccccc", "d"], 6, measure=len)
+
+    assert chunks == ["aaaabb", "cccccc", "d"]
+
+
+def test_whitespace_only_chunks_are_skipped(processor):
+    assert processor.build_chunks(["\n", "  \n"], 10) == []
+
+
+def test_cancelled_token_stops_chunking(processor):
+    token = CancellationToken()
+    token.cancel()
+    processor.set_cancel_token(token)
+
+    with pytest.raises(OperationCancelledError):
+        processor.split_text(make_text(10), 100)
+
+
+@pytest.mark.parametrize("method", ["token", "page"])
+def test_split_file_decodes_non_utf8_text(processor, tmp_path, method):
+    path = tmp_path / "latin1.txt"
+    path.write_bytes("Örnek özet, café crème\n".encode("latin-1") * 50)
+
+    chunks = processor.split_file(str(path), chunk_size=50 if method == "token" else 1, method=method)
+
+    assert chunks
+    assert "café" in "".join(chunks)
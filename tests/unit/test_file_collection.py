@@ -0,0 +1,56 @@
+import os
+
+from src.utils.file_utils import collect_files
+
+EXTENSIONS = ['.pdf', '.txt']
+
+
+def touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("x")
+    return str(path)
+
+
+def relative_paths(files):
+    return sorted(relative.replace(os.sep, "/") for _, relative in files)
+
+
+def test_directory_keeps_paths_relative_to_it(tmp_path):
+    touch(tmp_path / "arsiv" / "a.pdf")
+    touch(tmp_path / "arsiv" / "alt" / "a.pdf")
+    touch(tmp_path / "arsiv" / "not.docx")
+
+    files = collect_files([str(tmp_path / "arsiv")], EXTENSIONS, recursive=True)
+
+    assert relative_paths(files) == ["a.pdf", "alt/a.pdf"]
+
+
+def test_directory_without_recursive_skips_subfolders(tmp_path):
+    touch(tmp_path / "a.txt")
+    touch(tmp_path / "alt" / "b.txt")
+
+    assert relative_paths(collect_files([str(tmp_path)], EXTENSIONS)) == ["a.txt"]
+
+
+def test_glob_matches_are_relative_to_glob_root(tmp_path):
+    touch(tmp_path / "arsiv" / "2023" / "rapor.pdf")
+    touch(tmp_path / "arsiv" / "2024" / "rapor.pdf")
+
+    files = collect_files([str(tmp_path / "arsiv" / "**" / "*.pdf")], EXTENSIONS)
+
+    assert relative_paths(files) == ["2023/rapor.pdf", "2024/rapor.pdf"]
+
+
+def test_same_name_from_different_inputs_do_not_collide(tmp_path):
+    first = touch(tmp_path / "a" / "rapor.pdf")
+    second = touch(tmp_path / "b" / "rapor.pdf")
+
+    files = collect_files([first, second], EXTENSIONS)
+
+    assert relative_paths(files) == ["a/rapor.pdf", "b/rapor.pdf"]
+
+
+def test_duplicate_inputs_are_collected_once(tmp_path):
+    path = touch(tmp_path / "rapor.pdf")
+
+    assert len(collect_files([path, str(tmp_path)], EXTENSIONS)) == 1
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from src.services.hierarchical_summarizer import HierarchicalSummarizer
+from src.utils.tokenizer import HeuristicTokenizer
+
+
+class FakeManager:
+    def __init__(self, budget: int, **summarization):
+        self.settings = {"summarization": {"max_input_tokens": budget, **summarization}}
+        self.tokenizer = HeuristicTokenizer()
+
+    def get_input_token_budget(self, provider, prompt_template):
+        return 10 ** 6
+
+    def get_tokenizer(self, provider):
+        return self.tokenizer
+
+
+class FakeChunkAnalyzer:
+    """Reduces every group to a short text and records what it was sent"""
+
+    def __init__(self):
+        self.inputs = []
+
+    async def analyze_chunks(self, chunks, provider, prompt_template, **kwargs):
+        self.inputs.extend(chunks)
+        return [f"özet {len(self.inputs) - len(chunks) + i}" for i in range(len(chunks))]
+
+
+def make_summarizer(budget: int = 1000, **summarization):
+    manager = FakeManager(budget, **summarization)
+    analyzer = FakeChunkAnalyzer()
+    return HierarchicalSummarizer(manager, analyzer), analyzer
+
+
+def words(count: int) -> str:
+    return " ".join(f"kelime{i % 10}" for i in range(count))
+
+
+def test_reduces_to_one_result_within_budget():
+    summarizer, analyzer = make_summarizer(budget=300)
+    texts = [words(40) for _ in range(12)]
+
+    result = asyncio.run(summarizer.summarize(texts, "fake", "Özet"))
+
+    assert result.startswith("özet")
+    assert analyzer.inputs
+    tokenizer = summarizer.ai_service_manager.get_tokenizer("fake")
+    assert all(tokenizer.count(text) <= 300 for text in analyzer.inputs)
+
+
+def test_single_text_needs_no_reduce_call():
+    summarizer, analyzer = make_summarizer()
+
+    assert asyncio.run(summarizer.summarize(["tek sonuç", "  "], "fake", "Özet")) == "tek sonuç"
+    assert analyzer.inputs == []
+
+
+def test_fit_texts_splits_items_larger_than_half_the_budget():
+    summarizer, _ = make_summarizer()
+    tokenizer = summarizer.ai_service_manager.get_tokenizer("fake")
+
+    fitted = summarizer.fit_texts([words(2000), "kısa"], "fake", 400)
+
+    assert len(fitted) > 2
+    assert fitted[-1] == "kısa"
+    assert all(tokenizer.count(text) < 200 for text in fitted)
+
+
+def test_estimate_levels_follows_fan_in():
+    summarizer, _ = make_summarizer(max_fan_in=4)
+    texts = [words(10) for _ in range(64)]
+
+    # 64 -> 16 -> 4 -> 1
+    assert summarizer.estimate_levels(texts, "fake", 10000) == 3
+    assert summarizer.estimate_levels(texts[:1], "fake", 10000) == 0
+
+
+def test_too_many_levels_fail_before_any_call():
+    summarizer, analyzer = make_summarizer(budget=1000, max_levels=2)
+    texts = [words(300) for _ in range(65)]
+
+    with pytest.raises(ValueError, match="seviye"):
+        asyncio.run(summarizer.summarize(texts, "fake", "Özet"))
+    assert analyzer.inputs == []
@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+from src.services.ai.rate_limiter import AdaptiveConcurrencyLimiter, ProviderRateLimiter, TokenBucket
+
+
+def test_concurrency_limit_is_never_exceeded():
+    limiter = ProviderRateLimiter("test", max_concurrency=2)
+    active = 0
+    peak = 0
+
+    async def request():
+        nonlocal active, peak
+        async with limiter.slot():
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    async def main():
+        await asyncio.gather(*(request() for _ in range(8)))
+
+    asyncio.run(main())
+    assert peak == 2
+    assert limiter.concurrency.in_flight == 0
+
+
+def test_overload_halves_limit_and_success_grows_it_back():
+    limiter = AdaptiveConcurrencyLimiter(8)
+
+    limiter.on_overload()
+    assert int(limiter.limit) == 4
+    limiter.on_overload()
+    limiter.on_overload()
+    limiter.on_overload()
+    assert limiter.limit == 1
+
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.limit == 8
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    limiter = AdaptiveConcurrencyLimiter(1)
+
+    async def main():
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        limiter.release()
+        await asyncio.wait_for(limiter.acquire(), 1)
+        limiter.release()
+
+    asyncio.run(main())
+    assert limiter.in_flight == 0
+
+
+def test_token_bucket_waits_for_missing_tokens():
+    bucket = TokenBucket(rate_per_minute=600, capacity=1)
+
+    async def main():
+        started = time.monotonic()
+        await bucket.acquire(1)
+        await bucket.acquire(1)
+        return time.monotonic() - started
+
+    # Saniyede 10 jeton: ikinci istek yaklaşık 0.1 sn bekler
+    assert asyncio.run(main()) >= 0.08
+
+
+def test_retry_after_pauses_buckets():
+    limiter = ProviderRateLimiter("test", requests_per_minute=6000)
+    limiter.on_overload(retry_after=0.1)
+
+    async def main():
+        started = time.monotonic()
+        async with limiter.slot():
+            pass
+        return time.monotonic() - started
+
+    assert asyncio.run(main()) >= 0.08
+    assert limiter.get_stats()["concurrency_limit"] == 2
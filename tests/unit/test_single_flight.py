@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from src.services.ai.single_flight import SingleFlight
+
+
+def test_concurrent_calls_with_same_key_share_one_execution():
+    flight = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "sonuç"
+
+    async def main():
+        return await asyncio.gather(*(flight.run("anahtar", work) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["sonuç"] * 5
+    assert calls == 1
+    assert flight.get_stats() == {"in_flight": 0, "executed": 1, "coalesced": 4}
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+
+    async def main():
+        return await asyncio.gather(
+            flight.run("a", lambda: asyncio.sleep(0, result="a")),
+            flight.run("b", lambda: asyncio.sleep(0, result="b"))
+        )
+
+    assert asyncio.run(main()) == ["a", "b"]
+    assert flight.executed == 2
+
+
+def test_errors_are_shared_and_not_cached():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("hata")
+
+    async def main():
+        return await asyncio.gather(flight.run("k", fail), flight.run("k", fail), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight.executed == 1
+
+    # Tamamlanan çağrı saklanmaz; sonraki çağrı yeniden çalışır
+    assert asyncio.run(flight.run("k", lambda: asyncio.sleep(0, result="tamam"))) == "tamam"
+    assert flight.executed == 2
+
+
+def test_shared_call_survives_until_last_waiter_is_cancelled():
+    flight = SingleFlight()
+    cancelled = False
+
+    async def work():
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+
+    async def main():
+        first = asyncio.create_task(flight.run("k", work))
+        second = asyncio.create_task(flight.run("k", work))
+        await asyncio.sleep(0.01)
+
+        first.cancel()
+        await asyncio.sleep(0.01)
+        assert not cancelled
+
+        second.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await second
+        await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+    assert cancelled
+    assert flight.get_stats()["in_flight"] == 0